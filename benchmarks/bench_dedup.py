@@ -0,0 +1,111 @@
+"""
+Memory / startup benchmark: plain set of course tuples vs. dedup_store.KeySet.
+
+    python benchmarks/bench_dedup.py --rows 300000
+"""
+import os
+import sys
+import csv
+import gc
+import json
+import time
+import random
+import argparse
+import tempfile
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dedup_store import load_key_set
+
+COURSE_KEY = ('course_id', 'title', 'course_meta', 'course_year')
+
+
+def write_courses_csv(path, rows):
+    rnd = random.Random(42)
+    metas = ["Postgraduate | Full Time", "Undergraduate | Full Time", "Research | Part Time"]
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        w = csv.writer(f)
+        w.writerow(['course_id', 'title', 'university_name', 'course_meta', 'course_year'])
+        for i in range(rows):
+            w.writerow([
+                str(100000 + i),
+                f"MSc Applied Subject {rnd.randint(0, 10**6)} with Professional Placement",
+                f"University of Somewhere {i % 900}",
+                metas[i % len(metas)],
+                str(2025 + i % 2),
+            ])
+
+
+def load_tuple_set(path):
+    """The original loader: a set of stripped 4-tuples."""
+    s = set()
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        for row in csv.DictReader(f):
+            s.add(tuple(row[c].strip() for c in COURSE_KEY))
+    return s
+
+
+def measure(label, loader, probes):
+    # time without tracemalloc (it slows allocation-heavy code a lot), then measure memory
+    gc.collect()
+    t0 = time.perf_counter()
+    store = loader()
+    load_s = time.perf_counter() - t0
+    del store
+
+    gc.collect()
+    tracemalloc.start()
+    store = loader()
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    t0 = time.perf_counter()
+    hits = sum(1 for k in probes if k in store)
+    lookup_s = time.perf_counter() - t0
+    return {
+        'store': label,
+        'keys': len(store),
+        'load_seconds': round(load_s, 3),
+        'retained_mb': round(retained / 2**20, 2),
+        'peak_mb': round(peak / 2**20, 2),
+        'lookups_per_sec': round(len(probes) / lookup_s) if lookup_s else None,
+        'probe_hits': hits,
+    }
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument('--rows', type=int, default=200000)
+    ap.add_argument('--probes', type=int, default=50000)
+    ap.add_argument('--out', help="write results JSON here as well")
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'courses.csv')
+        write_courses_csv(path, args.rows)
+
+        with open(path, 'r', encoding='utf-8', newline='') as f:
+            rows = list(csv.DictReader(f))
+        probes = [tuple(r[c] for c in COURSE_KEY) for r in rows[:args.probes // 2]]
+        probes += [(str(i), 'missing', 'x', '1999') for i in range(args.probes // 2)]
+        del rows
+
+        results = {
+            'rows': args.rows,
+            'csv_mb': round(os.path.getsize(path) / 2**20, 2),
+            'results': [
+                measure('tuple-set', lambda: load_tuple_set(path), probes),
+                measure('keyset', lambda: load_key_set(path, COURSE_KEY), probes),
+                measure('keyset+bloom', lambda: load_key_set(path, COURSE_KEY, bloom=True), probes),
+            ],
+        }
+
+    print(json.dumps(results, indent=2))
+    if args.out:
+        with open(args.out, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,114 @@
+"""
+Speed / memory benchmark of the university page parser backends (university_page.py).
+
+    python benchmarks/bench_parsers.py --pages 200
+    python benchmarks/bench_parsers.py --corpus pages/ --backends html.parser,lxml
+
+Each backend runs in its own process, so the peak RSS of one does not hide
+another's. Reported per backend: pages/sec over the corpus, the Python heap
+peak while parsing one pass (tracemalloc; libxml2's own allocations are not
+in it) and the growth of the process' peak RSS (VmHWM) over the run.
+"""
+import os
+import sys
+import gc
+import json
+import time
+import argparse
+import subprocess
+import tracemalloc
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(HERE))
+
+from parser_diff import load_corpus
+from university_page import PARSER_BACKENDS
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process in MB (0 if unknown)."""
+    try:
+        with open('/proc/self/status', 'r') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return 0.0
+
+
+def parse_all(backend, pages):
+    for name, page in pages:
+        backend.parse(page, name, '')
+
+
+def run_backend(name, pages, min_seconds):
+    """Measure one backend in this process."""
+    backend = PARSER_BACKENDS[name]
+    parse_all(backend, pages[:3])   # imports, XPath / selector caches
+    gc.collect()
+    rss_before = peak_rss_mb()
+
+    passes, t0 = 0, time.perf_counter()
+    while True:
+        parse_all(backend, pages)
+        passes += 1
+        elapsed = time.perf_counter() - t0
+        if elapsed >= min_seconds:
+            break
+
+    gc.collect()
+    tracemalloc.start()
+    parse_all(backend, pages)
+    _, heap_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        'backend': name,
+        'pages': len(pages) * passes,
+        'pages_per_sec': round(len(pages) * passes / elapsed, 1),
+        'ms_per_page': round(elapsed * 1000 / (len(pages) * passes), 2),
+        'heap_peak_mb': round(heap_peak / 2**20, 2),
+        'rss_peak_growth_mb': round(peak_rss_mb() - rss_before, 1),
+        'corpus_kb': round(sum(len(p) for _, p in pages) / 1024),
+    }
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument('--corpus', help="directory of saved university pages (*.html, searched recursively)")
+    ap.add_argument('--pages', type=int, default=100, help="generated stand-in pages to include")
+    ap.add_argument('--backends', default=','.join(PARSER_BACKENDS))
+    ap.add_argument('--min-seconds', type=float, default=3.0, help="parse the corpus again until this long")
+    ap.add_argument('--child', help=argparse.SUPPRESS)
+    ap.add_argument('--out', help="write results JSON here as well")
+    args = ap.parse_args()
+    args.generated = args.pages
+    pages = load_corpus(args)
+
+    if args.child:
+        print(json.dumps(run_backend(args.child, pages, args.min_seconds)))
+        return
+
+    results = {'pages': len(pages), 'backends': []}
+    for name in (b for b in args.backends.split(',') if b):
+        backend = PARSER_BACKENDS[name]
+        if not backend.available():
+            print(f"[bench] {name} skipped (needs {backend.needs})", file=sys.stderr)
+            continue
+        print(f"[bench] {name} ...", file=sys.stderr)
+        cmd = [sys.executable, os.path.abspath(__file__), '--child', name, '--pages', str(args.pages),
+               '--min-seconds', str(args.min_seconds)] + (['--corpus', args.corpus] if args.corpus else [])
+        out = subprocess.run(cmd, capture_output=True, text=True, check=True).stdout
+        results['backends'].append(json.loads(out.strip().splitlines()[-1]))
+
+    base = results['backends'][0]['pages_per_sec'] if results['backends'] else None
+    for r in results['backends']:
+        r['speedup'] = round(r['pages_per_sec'] / base, 2)
+    print(json.dumps(results, indent=2))
+    if args.out:
+        with open(args.out, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,113 @@
+"""
+Memory / speed benchmark: row dicts vs. slotted records (records.py) vs. plain tuples.
+
+    python benchmarks/bench_records.py --rows 100000
+"""
+import io
+import os
+import sys
+import csv
+import gc
+import json
+import time
+import random
+import argparse
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from records import COURSE_FIELDS, UNIVERSITY_FIELDS, CourseRecord, UniversityRecord
+
+
+def course_values(rows):
+    """Column values (lists, as csv.reader yields them) like parse_course_box + the university lookup produce."""
+    rnd = random.Random(42)
+    metas = ["Postgraduate | Full Time", "Undergraduate | Full Time", "Research | Part Time"]
+    out = []
+    for i in range(rows):
+        out.append([
+            str(100000 + i), f"MSc Applied Subject {rnd.randint(0, 10**6)}", f"University of Somewhere {i % 900}",
+            "Sep 2026", "MSc", metas[i % 3], metas[i % 3].split('|')[0].strip(), "2026", "September",
+            "no", "London, United Kingdom", str(i % 900), f"https://example.org/logos/{i % 900}.png",
+        ])
+    return out
+
+
+def university_values(rows):
+    out = []
+    for i in range(rows):
+        sections = [f"<p>Section {s} of university {i}.</p>" * 3 for s in range(7)]
+        out.append([f"uni-{i}", f"University of Somewhere {i}", f"https://example.org/logos/{i}.png",
+                    str(i % 900), "1900", "Engineering", "£15,000 - £25,000", "London", "https://example.org"]
+                   + sections)
+    return out
+
+
+def build(kind, fields, values):
+    if kind == 'dict':
+        return [dict(zip(fields, v)) for v in values]
+    if kind == 'tuple':
+        return [tuple(v) for v in values]
+    cls = CourseRecord if fields is COURSE_FIELDS else UniversityRecord
+    return [cls(*v) for v in values]
+
+
+def to_csv_rows(kind, fields, items):
+    if kind == 'dict':
+        return ([d.get(c, '') for c in fields] for d in items)
+    if kind == 'tuple':
+        return iter(items)
+    return (r.row() for r in items)
+
+
+def measure(kind, fields, values):
+    # containers only: the column values are built beforehand and shared by every variant
+    gc.collect()
+    t0 = time.perf_counter()
+    items = build(kind, fields, values)
+    build_s = time.perf_counter() - t0
+    del items
+
+    gc.collect()
+    tracemalloc.start()
+    items = build(kind, fields, values)
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    buf = io.StringIO()
+    w = csv.writer(buf)
+    t0 = time.perf_counter()
+    w.writerows(to_csv_rows(kind, fields, items))
+    csv_s = time.perf_counter() - t0
+    return {
+        'container': kind,
+        'records': len(items),
+        'build_seconds': round(build_s, 3),
+        'retained_mb': round(retained / 2**20, 2),
+        'bytes_per_record': round(retained / len(items), 1),
+        'peak_mb': round(peak / 2**20, 2),
+        'csv_rows_per_sec': round(len(items) / csv_s) if csv_s else None,
+    }
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument('--rows', type=int, default=100000)
+    ap.add_argument('--out', help="write results JSON here as well")
+    args = ap.parse_args()
+
+    courses = course_values(args.rows)
+    universities = university_values(args.rows)
+    results = {'rows': args.rows, 'courses': [], 'universities': []}
+    for kind in ('dict', 'record', 'tuple'):
+        results['courses'].append(measure(kind, COURSE_FIELDS, courses))
+        results['universities'].append(measure(kind, UNIVERSITY_FIELDS, universities))
+
+    print(json.dumps(results, indent=2))
+    if args.out:
+        with open(args.out, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,163 @@
+"""
+Differential check of the university page parser backends (university_page.py).
+
+    python benchmarks/parser_diff.py                          # edge-case, tests/corpus and generated pages
+    python benchmarks/parser_diff.py --corpus pages/          # + saved pages (refresh_universities.py --save-pages)
+    python benchmarks/parser_diff.py --backends lxml --generated 100 --show 5
+
+Every page is parsed by the reference backend (--reference, html.parser by
+default) and by each other backend; every row field and sanitized section
+that differs is reported with the text around the first difference. Exits
+with 1 when any backend disagrees on any page.
+"""
+import os
+import sys
+import json
+import argparse
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(HERE))
+SAVED_CORPUS = os.path.join(os.path.dirname(HERE), 'tests', 'corpus')
+
+from standin_site import SiteConfig, render_university
+from university_page import DEFAULT_PARSER, PARSER_BACKENDS
+
+# markup the generated pages do not have: entities, quotes in attributes,
+# comments, script/style, void tags, <pre>, class whitespace, enquiry link
+# variants, and the broken nesting libxml2 would repair on its own (unclosed
+# <p> / <li>, a <div> inside a <p>, crossed and stray end tags). The
+# generated sections leave their <p>s open as well.
+EDGE_SECTIONS = {
+    'overview': """
+  <div class="et_pb_text_inner"><h3>Overview</h3></div>
+  <div class="et_pb_text_inner">
+    <p>Fees &amp; funding &lt;2026&gt; &nbsp;&copy; caf&eacute; &#8364;9,000 &#x2013; R&amp;D</p>
+    <p title='He said "hi"' data-x="it's">Quotes <span title="a &quot;b&quot; 'c'">both</span></p>
+    <p class="  lead   intro ">Multi<br>line<br/>text <!-- a comment --> end</p>
+  </div>""",
+    'services': """
+  <div class="et_pb_text_inner">
+<h3>Leading text, so this block stays</h3></div>
+  <div class="et_pb_text_inner"><!-- comment first --><h3>Also stays</h3></div>
+  <ul><li><a href="/x" rel="nofollow  noopener">Unwrapped <b>bold</b> link</a> after</li>
+      <li><a href="/contact">ENQUIRY form</a> tail text</li>
+      <li><a href="/Enquire-Now">Contact us</a></li><li><a>No href</a></li></ul>
+  <style>.x > p { color: red }</style><script>if (a < b && c > d) { go(); }</script>""",
+    'rankings': """
+  <table><tr><th headers="h1  h2">Year</th><td>2026</td></tr></table>
+  <img src="/img/one.png"><hr><input type="checkbox" checked disabled>
+  <div class="uni_course_enquire_now">gone <a href="/enquiry">x</a></div>tail kept""",
+    'fees': "   ",
+    'scholarships': "",
+    'accommodation': """
+  <pre>  keep   this
+     spacing  </pre><textarea>  and  this </textarea>
+  <div><div><p>Nested <em>inline <strong>markup</strong></em>.</p></div>  </div>
+  <p><a href="/rooms?a=1&amp;b=2" class="btn">Rooms &amp; halls</a></p>""",
+    'faqs': """
+  <dl><dt>Question?</dt><dd>Answer with <code>&lt;code&gt;</code> and <a href="mailto:x@y.ac.uk">mail</a>.</dd></dl>
+  <p>An unclosed paragraph
+  <p>and the next one, <b>bold <i>crossed</b> tags</i>
+  <p>A <div>block</div> inside a paragraph</p>
+  <ul><li>Open item<li>Next item</ul>
+  </span>
+</p>
+  <p>The last paragraph of the section.</p>""",
+}
+
+
+def edge_page(n):
+    """A stand-in page with the edge-case sections swapped in (the others as generated)."""
+    page = render_university(SiteConfig(), 'http://diff', n)
+    for section_id, inner in EDGE_SECTIONS.items():
+        start = page.index(f'<div id="{section_id}"')
+        start = page.index('>', start) + 1
+        end = page.index('\n</div>', start)
+        page = page[:start] + inner + page[end:]
+    return page
+
+
+def html_files(directory):
+    """[(path relative to directory, html)] of every *.html below directory."""
+    pages = []
+    for root, _, files in os.walk(directory):
+        for name in sorted(files):
+            if name.endswith('.html'):
+                path = os.path.join(root, name)
+                with open(path, 'r', encoding='utf-8') as f:
+                    pages.append((os.path.relpath(path, directory), f.read()))
+    return pages
+
+
+def load_corpus(args):
+    """[(name, html)]: edge pages, the saved pages of tests/corpus, generated pages, then --corpus."""
+    pages = [(f'edge/{n}', edge_page(n)) for n in range(3)]
+    pages += [(f'saved/{name}', page) for name, page in html_files(SAVED_CORPUS)]
+    pages += [(f'generated/{n}', render_university(SiteConfig(), 'http://diff', n)) for n in range(args.generated)]
+    if args.corpus:
+        pages += html_files(args.corpus)
+    return pages
+
+
+def first_difference(a, b, context=40):
+    i = next((k for k, (x, y) in enumerate(zip(a, b)) if x != y), min(len(a), len(b)))
+    lo = max(i - context, 0)
+    return i, a[lo:i + context], b[lo:i + context]
+
+
+def compare(reference, backend, pages):
+    """[(page, field, offset, reference excerpt, backend excerpt)] for every differing field."""
+    diffs = []
+    for name, page in pages:
+        uid = os.path.splitext(os.path.basename(name))[0]
+        want = reference.parse(page, uid, '')
+        got = backend.parse(page, uid, '')
+        for field in want:
+            if want[field] != got.get(field):
+                diffs.append((name, field) + first_difference(want[field], got.get(field, '')))
+    return diffs
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument('--corpus', help="directory of saved university pages (*.html, searched recursively)")
+    ap.add_argument('--generated', type=int, default=20, help="generated stand-in pages to include")
+    ap.add_argument('--reference', default=DEFAULT_PARSER)
+    ap.add_argument('--backends', default='', help="comma list (default: every other available backend)")
+    ap.add_argument('--show', type=int, default=10, help="differences printed per backend")
+    ap.add_argument('--out', help="write the summary JSON here as well")
+    args = ap.parse_args()
+
+    reference = PARSER_BACKENDS[args.reference]
+    if not reference.available():
+        ap.error(f"reference parser {args.reference} needs {reference.needs}")
+    names = [b for b in args.backends.split(',') if b] or [b for b in PARSER_BACKENDS if b != args.reference]
+    pages = load_corpus(args)
+    print(f"[diff] {len(pages)} pages, reference {args.reference}", file=sys.stderr)
+
+    summary = {'pages': len(pages), 'reference': args.reference, 'backends': {}}
+    for name in names:
+        backend = PARSER_BACKENDS[name]
+        if not backend.available():
+            print(f"[diff] {name} skipped (needs {backend.needs})", file=sys.stderr)
+            summary['backends'][name] = 'unavailable'
+            continue
+        diffs = compare(reference, backend, pages)
+        bad_pages = sorted({d[0] for d in diffs})
+        summary['backends'][name] = {'differing_pages': len(bad_pages), 'differing_fields': len(diffs),
+                                     'pages': bad_pages}
+        print(f"[diff] {name}: {len(pages) - len(bad_pages)}/{len(pages)} pages identical", file=sys.stderr)
+        for page, field, offset, want, got in diffs[:args.show]:
+            print(f"  {page} {field} @{offset}\n    {args.reference}: {want!r}\n    {name}: {got!r}",
+                  file=sys.stderr)
+
+    print(json.dumps(summary, indent=2))
+    if args.out:
+        with open(args.out, 'w', encoding='utf-8') as f:
+            json.dump(summary, f, indent=2)
+    if any(isinstance(v, dict) and v['differing_fields'] for v in summary['backends'].values()):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,297 @@
+"""
+Offline benchmark suite: micro benchmarks plus an end-to-end crawl of the local stand-in site.
+
+    python benchmarks/run_bench.py                          # micro benchmarks
+    python benchmarks/run_bench.py --e2e --pages 5          # + full crawl (needs Chrome)
+    python benchmarks/run_bench.py --compare benchmarks/results/<older>.json
+
+Results go to benchmarks/results/<time>-<commit>.json. --compare prints the
+change of every benchmark against an older result file and exits with 1 when
+one got slower than --threshold.
+"""
+import os
+import sys
+import csv
+import json
+import time
+import random
+import shutil
+import argparse
+import platform
+import tempfile
+import statistics
+import subprocess
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)
+sys.path.insert(0, ROOT)
+
+from bench_dedup import COURSE_KEY, write_courses_csv
+from standin_site import CATEGORIES, add_site_args, render_cards, render_university, serve, site_config
+
+RESULTS_DIR = os.path.join(HERE, 'results')
+
+
+def git_commit():
+    try:
+        out = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT,
+                             capture_output=True, text=True, timeout=10)
+        return out.stdout.strip() or 'unknown'
+    except (OSError, subprocess.SubprocessError):
+        return 'unknown'
+
+
+def timeit(fn, number, repeat=5):
+    """Median / best seconds per call over `repeat` rounds of `number` calls."""
+    rounds = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        for _ in range(number):
+            fn()
+        rounds.append((time.perf_counter() - t0) / number)
+    return {'per_call_us': round(statistics.median(rounds) * 1e6, 2),
+            'best_us': round(min(rounds) * 1e6, 2),
+            'number': number, 'repeat': repeat}
+
+
+class SoupElement:
+    """Just enough of selenium's WebElement over a bs4 Tag to feed parse_course_box."""
+
+    def __init__(self, tag):
+        self.tag = tag
+
+    @property
+    def text(self):
+        return self.tag.get_text(' ', strip=True)
+
+    def get_attribute(self, name):
+        v = self.tag.get(name)
+        return ' '.join(v) if isinstance(v, list) else v
+
+    def find_element(self, by, selector):
+        t = self.tag.select_one(selector)
+        if t is None:
+            raise LookupError(selector)
+        return SoupElement(t)
+
+
+# ---------------- micro benchmarks ----------------
+
+def bench_sanitize_html(pages, cfg):
+    from bs4 import BeautifulSoup
+    soup = BeautifulSoup(render_university(cfg, 'http://bench', 7), 'html.parser')
+    sections = [''.join(str(c) for c in soup.find('div', id=s).contents)
+                for s in ('overview', 'services', 'faqs')]
+    return timeit(lambda: [pages.sanitize_html(s) for s in sections], number=50)
+
+
+def bench_parse_university_page(pages, cfg):
+    page = render_university(cfg, 'http://bench', 7)
+    return timeit(lambda: pages.parse_university_page(page, 'uni-7', ''), number=20)
+
+
+def bench_parse_course_box(scraper, cfg):
+    from bs4 import BeautifulSoup
+    soup = BeautifulSoup(render_cards(cfg, 'http://bench', cfg.years[0], CATEGORIES[0], 1), 'html.parser')
+    cards = [SoupElement(t) for t in soup.select('.single-events-card')]
+    return timeit(lambda: [scraper.parse_course_box(c) for c in cards], number=20)
+
+
+def bench_load_scraped_courses(scraper, rows):
+    tmp = tempfile.mkdtemp(prefix='siuk-bench-')
+    cwd = os.getcwd()
+    try:
+        write_courses_csv(os.path.join(tmp, scraper.COURSE_CSV_FILE), rows)
+        os.chdir(tmp)
+        res = timeit(scraper.load_scraped_courses, number=1, repeat=3)
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(tmp, ignore_errors=True)
+    res['rows'] = rows
+    return res
+
+
+def bench_dedup_lookups(rows, probes, bloom):
+    from dedup_store import load_key_set
+    tmp = tempfile.mkdtemp(prefix='siuk-bench-')
+    try:
+        path = os.path.join(tmp, 'courses.csv')
+        write_courses_csv(path, rows)
+        with open(path, 'r', encoding='utf-8', newline='') as f:
+            keys = [tuple(r[c] for c in COURSE_KEY) for r, _ in zip(csv.DictReader(f), range(probes // 2))]
+        keys += [(str(i), 'missing', 'x', '1999') for i in range(probes - len(keys))]
+        random.Random(3).shuffle(keys)
+        store = load_key_set(path, COURSE_KEY, bloom=bloom)
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+    res = timeit(lambda: sum(1 for k in keys if k in store), number=1)
+    res['per_lookup_ns'] = round(res['per_call_us'] * 1000 / len(keys), 1)
+    res.update(rows=rows, probes=len(keys))
+    return res
+
+
+def run_micro(args, cfg):
+    results = {}
+    try:
+        import university_page as pages
+    except ImportError as e:
+        pages = None
+        print(f"[bench] university_page not importable ({e}); university parse benchmarks skipped", file=sys.stderr)
+    try:
+        import main as scraper
+    except ImportError as e:
+        scraper = None
+        print(f"[bench] scraper module not importable ({e}); only dedup benchmarks run", file=sys.stderr)
+
+    benches = [
+        ('dedup_lookup_keyset', lambda: bench_dedup_lookups(args.rows, args.probes, False)),
+        ('dedup_lookup_keyset_bloom', lambda: bench_dedup_lookups(args.rows, args.probes, True)),
+    ]
+    if pages is not None:
+        benches += [
+            ('sanitize_html', lambda: bench_sanitize_html(pages, cfg)),
+            ('parse_university_page', lambda: bench_parse_university_page(pages, cfg)),
+        ]
+    if scraper is not None:
+        benches += [
+            ('parse_course_box', lambda: bench_parse_course_box(scraper, cfg)),
+            ('load_scraped_courses', lambda: bench_load_scraped_courses(scraper, args.rows)),
+        ]
+    for name, fn in benches:
+        print(f"[bench] {name} ...", file=sys.stderr)
+        results[name] = fn()
+    return results
+
+
+# ---------------- end to end ----------------
+
+def count_rows(path):
+    if not os.path.exists(path):
+        return 0
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        return max(sum(1 for _ in csv.reader(f)) - 1, 0)
+
+
+def run_e2e(args, cfg):
+    server, base = serve(cfg)
+    tmp = tempfile.mkdtemp(prefix='siuk-e2e-')
+    cmd = [sys.executable, os.path.join(ROOT, args.script),
+           '--start-url', f"{base}/find-courses/", '--rate-limit-sleep', str(args.rate_limit_sleep)]
+    print(f"[bench] e2e: {' '.join(cmd)} (cwd={tmp})", file=sys.stderr)
+    t0 = time.perf_counter()
+    try:
+        proc = subprocess.run(cmd, cwd=tmp, timeout=args.e2e_timeout,
+                              stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+        status = proc.returncode
+        err = proc.stderr[-2000:]
+    except subprocess.TimeoutExpired:
+        status, err = 'timeout', ''
+    wall = time.perf_counter() - t0
+    server.shutdown()
+
+    courses = count_rows(os.path.join(tmp, 'courses.csv'))
+    stages = []
+    summary_path = os.path.join(tmp, 'metrics_summary.json')
+    if os.path.exists(summary_path):
+        with open(summary_path, 'r', encoding='utf-8') as f:
+            stages = json.load(f).get('stages', [])[:10]
+    result = {
+        'wall_s': round(wall, 2),
+        'exit': status,
+        'courses': courses,
+        'expected_courses': cfg.expected_courses,
+        'universities': count_rows(os.path.join(tmp, 'universities.csv')),
+        'courses_per_s': round(courses / wall, 2) if wall else None,
+        'top_stages': stages,
+    }
+    if status != 0:
+        result['stderr_tail'] = err
+    if args.keep_e2e_dir:
+        result['dir'] = tmp
+    else:
+        shutil.rmtree(tmp, ignore_errors=True)
+    return {'e2e_crawl': result}
+
+
+# ---------------- comparison ----------------
+
+def headline(res):
+    """(metric name, value) compared between runs: lower is better."""
+    for k in ('wall_s', 'per_call_us'):
+        if isinstance(res.get(k), (int, float)):
+            return k, res[k]
+    return None, None
+
+
+def compare(old, new, threshold):
+    regressions = 0
+    for name in sorted(set(old['results']) & set(new['results'])):
+        k, b = headline(old['results'][name])
+        k2, a = headline(new['results'][name])
+        if k is None or k != k2 or not b:
+            continue
+        change = (a - b) / b
+        flag = ''
+        if change > threshold:
+            flag = '  REGRESSION'
+            regressions += 1
+        elif change < -threshold:
+            flag = '  faster'
+        print(f"{name:30s} {k:12s} {b:12.2f} -> {a:12.2f}  {change:+7.1%}{flag}")
+    return regressions
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    add_site_args(ap)
+    ap.add_argument('--rows', type=int, default=100000, help="courses.csv rows for the load / dedup benchmarks")
+    ap.add_argument('--probes', type=int, default=50000)
+    ap.add_argument('--e2e', action='store_true', help="also crawl the stand-in site end to end")
+    ap.add_argument('--no-micro', action='store_true')
+    ap.add_argument('--script', default='main.py', help="scraper entry script for --e2e")
+    ap.add_argument('--rate-limit-sleep', type=float, default=1)
+    ap.add_argument('--e2e-timeout', type=float, default=3600)
+    ap.add_argument('--keep-e2e-dir', action='store_true')
+    ap.add_argument('--out', help="result file (default benchmarks/results/<time>-<commit>.json)")
+    ap.add_argument('--compare', help="older result file to compare against")
+    ap.add_argument('--threshold', type=float, default=0.10, help="slowdown counted as a regression")
+    args = ap.parse_args()
+    random.seed(args.seed)
+    cfg = site_config(args)
+
+    results = {}
+    if not args.no_micro:
+        results.update(run_micro(args, cfg))
+    if args.e2e:
+        results.update(run_e2e(args, cfg))
+
+    commit = git_commit()
+    doc = {
+        'meta': {
+            'commit': commit,
+            'time': time.strftime("%Y-%m-%d %H:%M:%S"),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'site': {k: v for k, v in vars(cfg).items() if k != 'recorded'},
+        },
+        'results': results,
+    }
+    out = args.out
+    if not out:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        out = os.path.join(RESULTS_DIR, f"{time.strftime('%Y%m%d-%H%M%S')}-{commit}.json")
+    with open(out, 'w', encoding='utf-8') as f:
+        json.dump(doc, f, indent=2)
+    print(json.dumps(doc, indent=2))
+    print(f"[bench] results => {out}", file=sys.stderr)
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            old = json.load(f)
+        print(f"\ncompare {old['meta']['commit']} -> {commit}")
+        if compare(old, doc, args.threshold):
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,332 @@
+"""
+Local stand-in for india.studyin-uk.com, for offline benchmarks.
+
+    python benchmarks/standin_site.py --port 8765 --pages 20 --latency-ms 150 --p404 0.02 --p429 0.01
+    python main.py --start-url http://127.0.0.1:8765/find-courses/ --rate-limit-sleep 1
+
+Serves generated pages with the markup the scraper relies on:
+  /find-courses/                 year <select>, category ids, .siuk-prelaoder,
+                                 .single-events-card list, .siuk-pagination-container
+                                 buttons and the select.siuk-pagination-dropdown;
+                                 category / page / year changes are done in JS via
+  /find-courses/cards?year=&category=&page=   (the listing fragment)
+  /university/<id>               .uni_logo, .head_desc .uni_rank, .uni_website
+                                 and the #overview ... #faqs section divs
+  /logos/<id>.png                 logo bytes with an ETag (304 on If-None-Match);
+                                 every LOGO_VARIANTS-th university shares a logo
+  /robots.txt, /sitemap_index.xml, /university-sitemap.xml
+                                 every university page, for sitemap.py discovery
+
+Everything is deterministic for a given --seed. 404s are a fixed subset of
+universities (so the dead-link cache sees the same ones every run), 429s are
+random and only ever hit the first request of a URL (the retry succeeds).
+With --recorded DIR, DIR/<url path>.html (e.g. DIR/university/abc.html) is
+served instead of the generated page when it exists.
+"""
+import os
+import sys
+import html
+import time
+import random
+import hashlib
+import argparse
+import threading
+from urllib.parse import urlsplit, parse_qs
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+CATEGORIES = ["Postgraduate", "Undergraduate", "Pre-sessional", "Foundation", "Pre-masters", "Research"]
+DEGREES = {"Postgraduate": "MSc", "Undergraduate": "BSc", "Pre-sessional": "Certificate",
+           "Foundation": "Foundation", "Pre-masters": "Diploma", "Research": "PhD"}
+SUBJECTS = ["Computer Science", "Data Science", "Business Management", "Mechanical Engineering",
+            "Public Health", "International Relations", "Finance", "Architecture", "Law", "Psychology"]
+CITIES = ["London", "Manchester", "Edinburgh", "Leeds", "Bristol", "Glasgow", "Cardiff", "Belfast"]
+MONTHS = ["Jan", "Apr", "Sep"]
+
+
+class SiteConfig:
+
+    def __init__(self, years=('2025', '2026'), pages=10, cards_per_page=12, universities=60,
+                 latency_ms=0, p404=0.0, p429=0.0, seed=1, recorded=None):
+        self.years = list(years)
+        self.pages = pages
+        self.cards_per_page = cards_per_page
+        self.universities = universities
+        self.latency_ms = latency_ms
+        self.p404 = p404
+        self.p429 = p429
+        self.seed = seed
+        self.recorded = recorded
+        self.expected_courses = len(self.years) * len(CATEGORIES) * pages * cards_per_page
+
+
+def _unit(*parts):
+    """Deterministic float in [0, 1) for the given parts."""
+    h = hashlib.blake2b('|'.join(map(str, parts)).encode('utf-8'), digest_size=8).digest()
+    return int.from_bytes(h, 'big') / 2**64
+
+
+def university_id(cfg, n):
+    return f"uni-{cfg.seed}-{n:04d}"
+
+
+LOGO_VARIANTS = 25
+
+
+def render_logo(cfg, n):
+    """Fake PNG bytes; universities n and n + LOGO_VARIANTS get the same logo."""
+    digest = hashlib.sha256(f"{cfg.seed}-logo-{n % LOGO_VARIANTS}".encode()).digest()
+    return b'\x89PNG\r\n\x1a\n' + digest * (16 + n % LOGO_VARIANTS)
+
+
+def university_name(n):
+    return f"University of {CITIES[n % len(CITIES)]} {n}"
+
+
+# ---------------- listing pages ----------------
+
+def render_card(cfg, base, year, category, page, idx):
+    n = int(_unit(cfg.seed, 'uni', year, category, page, idx) * cfg.universities)
+    course_id = f"{year}{CATEGORIES.index(category)}{page:04d}{idx:02d}"
+    subject = SUBJECTS[(page * 7 + idx) % len(SUBJECTS)]
+    degree = DEGREES[category]
+    featured = ' featured-course' if idx == 0 else ''
+    month = MONTHS[idx % len(MONTHS)]
+    return f"""
+<div class="single-events-card{featured}" data-course="{course_id}">
+  <div class="siuk-card-head">
+    <h3 class="siuk-card-title">{degree} {subject} {course_id[-4:]}</h3>
+    <h4 class="mini-university-title">{html.escape(university_name(n))}</h4>
+    <p class="mini-university-location">{CITIES[n % len(CITIES)]}, United Kingdom</p>
+  </div>
+  <div class="siuk-course-quick-info">
+    <div class="siuk-course-quick-leftinfo"><p>Intake</p><p>{month} {year}</p></div>
+    <div class="siuk-course-quick-rightinfo"><p>Degree</p><p>{degree}</p></div>
+  </div>
+  <p class="siuk-course-meta">{category} | {'Full Time' if idx % 3 else 'Part Time'}</p>
+  <a class="siuk-view-more-red" href="{base}/university/{university_id(cfg, n)}">Learn more</a>
+</div>"""
+
+
+def render_pagination(cfg, page):
+    shown = sorted({1, cfg.pages} | {p for p in range(page - 2, page + 3) if 1 <= p <= cfg.pages})
+    buttons = ''.join(
+        f'<button class="siuk-filter-pagination-button{" active" if p == page else ""}" '
+        f'data-page="{p}" onclick="go(state.category, {p})">{p}</button>'
+        for p in shown)
+    options = ''.join(f'<option value="{p}"{" selected" if p == page else ""}>{p}</option>'
+                      for p in range(1, cfg.pages + 1))
+    return (f'<div class="siuk-pagination-container">{buttons}'
+            f'<select class="siuk-pagination-dropdown" onchange="go(state.category, +this.value)">'
+            f'{options}</select></div>')
+
+
+def render_cards(cfg, base, year, category, page):
+    if year not in cfg.years or category not in CATEGORIES or not 1 <= page <= cfg.pages:
+        return '<div class="siuk-no-results">No courses found</div>'
+    cards = ''.join(render_card(cfg, base, year, category, page, i) for i in range(cfg.cards_per_page))
+    return cards + render_pagination(cfg, page)
+
+
+def render_listing(cfg, year):
+    years = ''.join(f'<option value="{y}"{" selected" if y == year else ""}>{y}</option>' for y in cfg.years)
+    cats = ''.join(f'<li id="{c}" class="siuk-category" onclick="go(\'{c}\', 1)">{c}</li>' for c in CATEGORIES)
+    return f"""<!DOCTYPE html>
+<html><head><title>Find courses</title>
+<style>.siuk-prelaoder{{position:fixed;inset:0;background:#fff8}} .hidden{{display:none}}</style>
+</head><body>
+<div class="siuk-prelaoder hidden"></div>
+<select class="siuk-filter-select year" onchange="setYear(this.value)">
+  <option value="">Year</option>{years}
+</select>
+<ul class="siuk-categories">{cats}</ul>
+<div id="siuk-results"></div>
+<script>
+var state = {{year: "{year}", category: null}};
+function go(category, page) {{
+  state.category = category;
+  var pre = document.querySelector('.siuk-prelaoder');
+  pre.classList.remove('hidden');
+  fetch('/find-courses/cards?year=' + state.year + '&category=' + encodeURIComponent(category) + '&page=' + page)
+    .then(function (r) {{ return r.text(); }})
+    .then(function (t) {{ document.getElementById('siuk-results').innerHTML = t; pre.classList.add('hidden'); }});
+}}
+function setYear(y) {{
+  if (y) {{ location.href = '/find-courses/?year=' + y; }}
+}}
+</script>
+</body></html>"""
+
+
+# ---------------- university pages ----------------
+
+def render_sitemap(locs, index=False):
+    root, item = ('sitemapindex', 'sitemap') if index else ('urlset', 'url')
+    entries = ''.join(f"<{item}><loc>{html.escape(u)}</loc></{item}>" for u in locs)
+    return (f'<?xml version="1.0" encoding="UTF-8"?>'
+            f'<{root} xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">{entries}</{root}>')
+
+
+def render_section(section_id, name, n):
+    para = f"<p>{html.escape(name)} offers {section_id} information for international students. " * 3
+    return f"""
+<div id="{section_id}" class="et_pb_column">
+  <div class="et_pb_text_inner"><h3>{section_id.title()}</h3></div>
+  <div class="et_pb_text_inner">
+    {para}</p>
+    <ul><li>Item one for {section_id}</li><li>Item two with <a href="/courses/{n}">a link</a></li></ul>
+    <img src="/img/{section_id}-{n}.png" alt="">
+    <p>Questions? <a href="/enquire-now/?uni={n}">Enquire now</a></p>
+  </div>
+  <div class="uni_course_enquire_now"><a href="/enquiry/{n}">Send enquiry</a></div>
+</div>"""
+
+
+def render_university(cfg, base, n):
+    name = university_name(n)
+    city = CITIES[n % len(CITIES)]
+    sections = ''.join(render_section(s, name, n)
+                       for s in ('overview', 'services', 'rankings', 'fees', 'scholarships', 'accommodation', 'faqs'))
+    return f"""<!DOCTYPE html>
+<html><head><title>{html.escape(name)}</title></head><body>
+<div class="s_event_section uni_section_wrapper">
+  <div class="uni_logo"><img class="single-event-image" src="{base}/logos/{university_id(cfg, n)}.png"></div>
+  <h1>{html.escape(name)}</h1>
+  <div class="head_desc">
+    <div class="uni_rank">Rank {n + 1}</div>
+    <div class="uni_rank">Established {1850 + n % 150}</div>
+    <div class="uni_rank">Famous for {SUBJECTS[n % len(SUBJECTS)]}</div>
+    <div class="uni_rank">Fees £{15000 + (n % 20) * 500}</div>
+  </div>
+  <div class="uni_website"><a href="https://www.google.com/local?q={city}"><span>{city}, United Kingdom</span></a></div>
+  <div class="uni_website s_uni_web"><a href="https://www.uni{n}.example.ac.uk/">Visit website</a></div>
+</div>
+{sections}
+</body></html>"""
+
+
+# ---------------- server ----------------
+
+class StandinHandler(BaseHTTPRequestHandler):
+    cfg = None
+    hits = None
+    lock = threading.Lock()
+
+    def _send(self, status, body, ctype='text/html; charset=utf-8', headers=None):
+        data = body if isinstance(body, bytes) else body.encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', ctype)
+        self.send_header('Content-Length', str(len(data)))
+        for k, v in (headers or {}).items():
+            self.send_header(k, v)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _first_hit(self, path):
+        with self.lock:
+            self.hits[path] = self.hits.get(path, 0) + 1
+            return self.hits[path] == 1
+
+    def _recorded(self, path):
+        if not self.cfg.recorded:
+            return None
+        f = os.path.join(self.cfg.recorded, path.strip('/') + '.html')
+        if os.path.isfile(f):
+            with open(f, 'r', encoding='utf-8') as fh:
+                return fh.read()
+        return None
+
+    def do_GET(self):
+        cfg = self.cfg
+        url = urlsplit(self.path)
+        q = {k: v[0] for k, v in parse_qs(url.query).items()}
+        base = f"http://{self.headers.get('Host', '127.0.0.1')}"
+        if cfg.latency_ms:
+            time.sleep(cfg.latency_ms / 1000 * (0.5 + random.random()))
+
+        recorded = self._recorded(url.path)
+        if recorded is not None:
+            return self._send(200, recorded)
+
+        if url.path.rstrip('/') == '/find-courses':
+            return self._send(200, render_listing(cfg, q.get('year', cfg.years[0])))
+        if url.path == '/find-courses/cards':
+            return self._send(200, render_cards(cfg, base, q.get('year', ''), q.get('category', ''),
+                                                int(q.get('page', '1') or 1)))
+        if url.path.startswith('/university/'):
+            uid = url.path.split('/university/', 1)[1].strip('/')
+            prefix = university_id(cfg, 0)[:-4]
+            if not uid.startswith(prefix) or not uid[len(prefix):].isdigit():
+                return self._send(404, 'not found')
+            n = int(uid[len(prefix):])
+            if _unit(cfg.seed, '404', n) < cfg.p404:
+                return self._send(404, 'not found')
+            if self._first_hit(url.path) and random.random() < cfg.p429:
+                return self._send(429, 'too many requests')
+            return self._send(200, render_university(cfg, base, n))
+        if url.path == '/robots.txt':
+            return self._send(200, f"User-agent: *\nSitemap: {base}/sitemap_index.xml\n", 'text/plain')
+        if url.path == '/sitemap_index.xml':
+            return self._send(200, render_sitemap([f"{base}/page-sitemap.xml", f"{base}/university-sitemap.xml"],
+                                                  index=True), 'application/xml')
+        if url.path == '/university-sitemap.xml':
+            return self._send(200, render_sitemap([f"{base}/university/{university_id(cfg, n)}"
+                                                   for n in range(cfg.universities)]), 'application/xml')
+        if url.path.startswith('/logos/'):
+            uid = os.path.splitext(url.path.rsplit('/', 1)[1])[0]
+            if not uid[-4:].isdigit():
+                return self._send(404, 'not found')
+            logo = render_logo(cfg, int(uid[-4:]))
+            etag = '"%s"' % hashlib.sha256(logo).hexdigest()[:16]
+            if self.headers.get('If-None-Match') == etag:
+                return self._send(304, b'', 'image/png', {'ETag': etag})
+            return self._send(200, logo, 'image/png', {'ETag': etag})
+        return self._send(404, 'not found')
+
+    def log_message(self, *args):
+        pass
+
+
+def serve(cfg, host='127.0.0.1', port=0):
+    """Start the stand-in in a daemon thread; returns (server, base_url)."""
+    handler = type('Handler', (StandinHandler,), {'cfg': cfg, 'hits': {}})
+    server = ThreadingHTTPServer((host, port), handler)
+    threading.Thread(target=server.serve_forever, name='standin-site', daemon=True).start()
+    return server, f"http://{host}:{server.server_address[1]}"
+
+
+def add_site_args(ap):
+    ap.add_argument('--years', default='2025,2026')
+    ap.add_argument('--pages', type=int, default=10, help="listing pages per year/category")
+    ap.add_argument('--cards-per-page', type=int, default=12)
+    ap.add_argument('--universities', type=int, default=60)
+    ap.add_argument('--latency-ms', type=float, default=0)
+    ap.add_argument('--p404', type=float, default=0.0, help="fraction of universities that 404")
+    ap.add_argument('--p429', type=float, default=0.0, help="chance that a first university hit gets 429")
+    ap.add_argument('--seed', type=int, default=1)
+    ap.add_argument('--recorded', help="directory of recorded pages served instead of generated ones")
+
+
+def site_config(args):
+    return SiteConfig(years=args.years.split(','), pages=args.pages, cards_per_page=args.cards_per_page,
+                      universities=args.universities, latency_ms=args.latency_ms, p404=args.p404,
+                      p429=args.p429, seed=args.seed, recorded=args.recorded)
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    add_site_args(ap)
+    ap.add_argument('--host', default='127.0.0.1')
+    ap.add_argument('--port', type=int, default=8765)
+    args = ap.parse_args()
+    random.seed(args.seed)
+    server, base = serve(site_config(args), args.host, args.port)
+    print(f"stand-in site on {base}/find-courses/  (Ctrl+C to stop)", file=sys.stderr)
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,160 @@
+"""
+Content-addressed store for the university section HTML.
+
+    python blobstore.py pack universities.csv universities_packed.csv        # inline HTML -> refs
+    python blobstore.py rehydrate universities.csv universities_full.csv     # refs -> inline HTML
+"""
+import os
+import csv
+import sys
+import zlib
+import hashlib
+import argparse
+
+# ----------------------------------------------------------------
+# SECTION BLOB STORE
+# ----------------------------------------------------------------
+#
+# blobs/seg-00001.bin ...  zlib-compressed blobs, appended back to back
+# blobs/index.csv          hash, segment, offset, length, size
+# A section is stored once per distinct content (blake2b-128 of the text);
+# the universities.csv cell then holds "blob:<hash>" instead of the HTML.
+# The blob bytes are written before their index row, so a crash can leave
+# unreferenced bytes in a segment but never an index row without its data.
+
+BLOB_DIR = 'blobs'
+BLOB_REF_PREFIX = 'blob:'
+SEGMENT_MAX_BYTES = 256 * 2**20
+SECTION_COLUMNS = ('overview_html', 'services_html', 'rankings_html', 'fees_html',
+                   'scholarships_html', 'accommodation_html', 'faqs_html')
+
+csv.field_size_limit(min(sys.maxsize, 2**31 - 1))
+
+
+def content_hash(text):
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=16).hexdigest()
+
+
+class BlobStore:
+
+    def __init__(self, directory=BLOB_DIR):
+        self.dir = directory
+        os.makedirs(directory, exist_ok=True)
+        self.index_path = os.path.join(directory, 'index.csv')
+        self.index = {}                 # hash -> (segment, offset, length)
+        self.segment = 1
+        self.stats = {'puts': 0, 'dedup_hits': 0, 'raw_bytes': 0, 'stored_bytes': 0}
+        self._readers = {}
+        self._writer = None
+
+        if os.path.exists(self.index_path):
+            with open(self.index_path, 'r', encoding='utf-8', newline='') as f:
+                for row in csv.DictReader(f):
+                    seg = int(row['segment'])
+                    self.index[row['hash']] = (seg, int(row['offset']), int(row['length']))
+                    self.segment = max(self.segment, seg)
+        else:
+            with open(self.index_path, 'w', encoding='utf-8', newline='') as f:
+                csv.writer(f).writerow(['hash', 'segment', 'offset', 'length', 'size'])
+
+    def _segment_path(self, seg):
+        return os.path.join(self.dir, f'seg-{seg:05d}.bin')
+
+    def _open_writer(self):
+        path = self._segment_path(self.segment)
+        if os.path.exists(path) and os.path.getsize(path) >= SEGMENT_MAX_BYTES:
+            self.segment += 1
+            path = self._segment_path(self.segment)
+        self._writer = open(path, 'ab')
+
+    def put(self, text):
+        """Store text (once per distinct content) and return its hash."""
+        h = content_hash(text)
+        self.stats['puts'] += 1
+        self.stats['raw_bytes'] += len(text)
+        if h in self.index:
+            self.stats['dedup_hits'] += 1
+            return h
+        if self._writer is None or self._writer.tell() >= SEGMENT_MAX_BYTES:
+            if self._writer is not None:
+                self._writer.close()
+            self._open_writer()
+        data = zlib.compress(text.encode('utf-8'), 6)
+        self._writer.seek(0, os.SEEK_END)
+        offset = self._writer.tell()
+        self._writer.write(data)
+        self._writer.flush()
+        self.index[h] = (self.segment, offset, len(data))
+        self.stats['stored_bytes'] += len(data)
+        with open(self.index_path, 'a', encoding='utf-8', newline='') as f:
+            csv.writer(f).writerow([h, self.segment, offset, len(data), len(text)])
+        return h
+
+    def get(self, h):
+        seg, offset, length = self.index[h]
+        if self._writer is not None:
+            self._writer.flush()
+        f = self._readers.get(seg)
+        if f is None:
+            f = self._readers[seg] = open(self._segment_path(seg), 'rb')
+        f.seek(offset)
+        return zlib.decompress(f.read(length)).decode('utf-8')
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+        for f in self._readers.values():
+            f.close()
+        self._readers = {}
+
+
+def pack_sections(store, row, columns=SECTION_COLUMNS):
+    """Replace the section HTML of a university row (dict) with blob refs, in place."""
+    for c in columns:
+        v = row.get(c, '')
+        if v and not v.startswith(BLOB_REF_PREFIX):
+            row[c] = BLOB_REF_PREFIX + store.put(v)
+    return row
+
+
+def unpack_sections(store, row, columns=SECTION_COLUMNS):
+    for c in columns:
+        v = row.get(c, '')
+        if v.startswith(BLOB_REF_PREFIX):
+            row[c] = store.get(v[len(BLOB_REF_PREFIX):])
+    return row
+
+
+def convert_csv(src, dst, store, pack):
+    """Copy a universities CSV, packing or rehydrating the section columns; returns row count."""
+    n = 0
+    with open(src, 'r', encoding='utf-8', newline='') as fi, \
+            open(dst + '.tmp', 'w', encoding='utf-8', newline='') as fo:
+        rd = csv.DictReader(fi)
+        w = csv.DictWriter(fo, fieldnames=rd.fieldnames)
+        w.writeheader()
+        for row in rd:
+            w.writerow(pack_sections(store, row) if pack else unpack_sections(store, row))
+            n += 1
+    os.replace(dst + '.tmp', dst)
+    return n
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument('command', choices=['pack', 'rehydrate'])
+    ap.add_argument('src')
+    ap.add_argument('dst')
+    ap.add_argument('--blob-dir', default=BLOB_DIR)
+    args = ap.parse_args()
+    store = BlobStore(args.blob_dir)
+    try:
+        n = convert_csv(args.src, args.dst, store, pack=args.command == 'pack')
+    finally:
+        store.close()
+    print(f"{args.command}: {n} rows => {args.dst} {store.stats if args.command == 'pack' else ''}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,232 @@
+import os
+import sys
+import time
+import signal
+import threading
+import subprocess
+from collections import Counter
+from contextlib import contextmanager
+
+# ----------------------------------------------------------------
+# BROWSER SUPERVISOR
+# ----------------------------------------------------------------
+#
+# Owns the webdriver for the whole crawl:
+#   - a watchdog thread kills chromedriver/Chrome when a watched step
+#     (page wait, navigation, card parsing) runs past its deadline, so the
+#     hung command raises in the main thread instead of blocking forever;
+#   - restart() replaces a dead/hung driver and restores the last
+#     (year, category, page) position through the caller's restore function
+#     (navigation-length work, so it gets restore_timeout); a restore that
+#     fails with a dead driver starts a fresh one, up to restart_attempts;
+#   - page_done() recycles the driver every N pages or above an RSS limit.
+
+
+def _children(pid):
+    """Direct child pids of pid (Linux /proc only)."""
+    kids = []
+    for name in os.listdir('/proc'):
+        if not name.isdigit():
+            continue
+        try:
+            with open(f'/proc/{name}/stat', 'rb') as f:
+                stat = f.read()
+        except OSError:
+            continue
+        # comm may contain spaces/parens: ppid is the 2nd field after the last ')'
+        fields = stat[stat.rfind(b')') + 2:].split()
+        if len(fields) > 1 and int(fields[1]) == pid:
+            kids.append(int(name))
+    return kids
+
+
+def process_tree(pid):
+    """pid plus all of its descendants (Linux), or just [pid] elsewhere."""
+    if not os.path.isdir('/proc'):
+        return [pid]
+    tree, todo = [], [pid]
+    while todo:
+        p = todo.pop()
+        tree.append(p)
+        todo.extend(_children(p))
+    return tree
+
+
+def process_rss_mb(pid):
+    """Resident set size of one process in MB (0 if unknown)."""
+    try:
+        with open(f'/proc/{pid}/status', 'r') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return 0.0
+
+
+def tree_rss_mb(pid):
+    return sum(process_rss_mb(p) for p in process_tree(pid))
+
+
+class BrowserSupervisor:
+
+    def __init__(self, make_driver, restore, log, watchdog_timeout=180,
+                 recycle_pages=200, recycle_rss_mb=2500, restore_timeout=900, restart_attempts=3):
+        self.make_driver = make_driver
+        self.restore = restore
+        self.log = log
+        self.watchdog_timeout = watchdog_timeout
+        self.restore_timeout = restore_timeout
+        self.restart_attempts = restart_attempts
+        self.recycle_pages = recycle_pages
+        self.recycle_rss_mb = recycle_rss_mb
+
+        self.driver = None
+        self.position = (None, None, None)
+        self.restarts = Counter()
+        self.started_at = None
+        self.pages_since_start = 0
+        self.total_uptime = 0.0
+
+        self._lock = threading.Lock()
+        self._armed = None          # (label, deadline)
+        self._fired = False
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._watchdog_loop, name='browser-watchdog', daemon=True)
+
+    # ---------------- lifecycle ----------------
+
+    def start(self):
+        self.driver = self.make_driver()
+        self.started_at = time.time()
+        self.pages_since_start = 0
+        if not self._thread.is_alive():
+            self._thread.start()
+        return self.driver
+
+    def quit(self):
+        self._stop.set()
+        self._stop_driver()
+
+    def _driver_pid(self):
+        try:
+            return self.driver.service.process.pid
+        except AttributeError:
+            return None
+
+    def _kill(self):
+        pid = self._driver_pid()
+        if not pid:
+            return
+        if sys.platform.startswith('win'):
+            subprocess.run(['taskkill', '/F', '/T', '/PID', str(pid)],
+                           stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            return
+        for p in reversed(process_tree(pid)):
+            try:
+                os.kill(p, signal.SIGKILL)
+            except OSError:
+                pass
+
+    def _stop_driver(self):
+        if self.driver is None:
+            return
+        try:
+            with self.watch('quit', timeout=30):
+                self.driver.quit()
+        except Exception:
+            self._kill()
+        if self.started_at:
+            self.total_uptime += time.time() - self.started_at
+        self.driver = None
+        self.started_at = None
+
+    def restart(self, reason):
+        """Replace the driver and bring it back to the last known position."""
+        kind = reason.split(':', 1)[0]
+        self.restarts[kind] += 1
+        self.log(f"[BROWSER] restart #{sum(self.restarts.values())} => {reason}, "
+                 f"uptime={self.uptime():.0f}s, pages={self.pages_since_start}")
+        year, category, page = self.position
+        for attempt in range(1, self.restart_attempts + 1):
+            self._stop_driver()
+            self.start()
+            try:
+                with self.watch('restore', timeout=self.restore_timeout):
+                    self.restore(self.driver, year, category, page)
+                return self.driver
+            except Exception as e:
+                self.log(f"[BROWSER] restore to {self.position} failed (attempt {attempt}) => {e}")
+            if self.healthy():
+                # alive but not positioned: the caller's own retries navigate again
+                return self.driver
+            self.restarts['restore_failed'] += 1
+        raise RuntimeError(f"browser still dead after {self.restart_attempts} restarts")
+
+    def healthy(self):
+        """Quick liveness probe of the current driver."""
+        try:
+            with self.watch('probe', timeout=30):
+                self.driver.execute_script("return 1")
+            return True
+        except Exception:
+            return False
+
+    # ---------------- position / recycling ----------------
+
+    def mark_position(self, year, category, page):
+        self.position = (year, category, page)
+
+    def page_done(self):
+        """Count a finished page and recycle the driver if it is due."""
+        self.pages_since_start += 1
+        if self.recycle_pages and self.pages_since_start >= self.recycle_pages:
+            self.restart(f"recycle_pages: {self.pages_since_start} pages")
+            return
+        if self.recycle_rss_mb:
+            rss = self.rss_mb()
+            if rss > self.recycle_rss_mb:
+                self.restart(f"recycle_rss: {rss:.0f} MB")
+
+    def rss_mb(self):
+        pid = self._driver_pid()
+        return tree_rss_mb(pid) if pid else 0.0
+
+    def uptime(self):
+        return time.time() - self.started_at if self.started_at else 0.0
+
+    def stats(self):
+        return {
+            'restarts': dict(self.restarts),
+            'current_uptime_s': round(self.uptime()),
+            'total_uptime_s': round(self.total_uptime + self.uptime()),
+            'pages_since_start': self.pages_since_start,
+        }
+
+    # ---------------- watchdog ----------------
+
+    @contextmanager
+    def watch(self, label, timeout=None):
+        """Arm the watchdog for a driver step; the browser is killed if it overruns."""
+        with self._lock:
+            prev = self._armed
+            self._armed = (label, time.time() + (timeout or self.watchdog_timeout))
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._armed = prev
+                fired, self._fired = self._fired, False
+            if fired:
+                raise TimeoutError(f"watchdog fired during '{label}'")
+
+    def _watchdog_loop(self):
+        while not self._stop.wait(1.0):
+            with self._lock:
+                armed = self._armed
+                if not armed or time.time() < armed[1]:
+                    continue
+                self._armed = None
+                self._fired = True
+            self.log(f"[BROWSER] watchdog => '{armed[0]}' hung, killing browser")
+            self._kill()
@@ -0,0 +1,126 @@
+import os
+import json
+import mmap
+import struct
+from array import array
+
+from dedup_store import KeySet
+
+# ----------------------------------------------------------------
+# BINARY CHECKPOINT OF CRAWL STATE
+# ----------------------------------------------------------------
+#
+# Layout (little-endian):
+#   8s   magic b'SIUKCKPT'
+#   I    format version
+#   I    length of the JSON header that follows
+#   ...  JSON header: CSV stats, counters, section offsets
+#   ...  8-byte aligned sections: sorted uint64 key hashes, university index JSON
+#
+# At startup the file is memory-mapped, each hash section is copied into
+# an array (one memcpy, no per-key parsing) and the map is closed again:
+# an open map would keep Windows from replacing the file at the next save.
+
+CHECKPOINT_MAGIC = b'SIUKCKPT'
+CHECKPOINT_VERSION = 1
+_PREFIX = struct.Struct('<8sII')
+
+_SET_KEYS = (
+    ('courses', 'courses_scraped_set'),
+    ('universities', 'universities_scraped_set'),
+    ('pages', 'pages_done_set'),
+)
+
+
+def csv_stats(paths):
+    """Return {path: [size, mtime_ns]} for the CSVs the checkpoint was taken against."""
+    stats = {}
+    for p in paths:
+        try:
+            st = os.stat(p)
+            stats[p] = [st.st_size, st.st_mtime_ns]
+        except FileNotFoundError:
+            stats[p] = None
+    return stats
+
+
+def _pad(n):
+    return (-n) % 8
+
+
+def save_checkpoint(path, console_state, csv_paths):
+    """Write the checkpoint atomically (temp file + os.replace)."""
+    blobs = []
+    sections = {}
+    for name, state_key in _SET_KEYS:
+        hashes = console_state[state_key].sorted_hashes()
+        blobs.append((name, hashes.tobytes(), len(hashes)))
+    uni_index = console_state['university_index']
+    idx_json = json.dumps([[h, r, l] for h, (r, l) in uni_index.items()]).encode('utf-8')
+    blobs.append(('university_index', idx_json, len(uni_index)))
+
+    header = {
+        'csv': csv_stats(csv_paths),
+        'counters': {
+            'uni_scraped_count': console_state['uni_scraped_count'],
+            'course_scraped_count': console_state['course_scraped_count'],
+        },
+        'sections': sections,
+    }
+    # Offsets depend on the header length, so redo the layout until it is stable.
+    hdr = b''
+    for _ in range(3):
+        off = _PREFIX.size + len(hdr)
+        off += _pad(off)
+        for name, raw, count in blobs:
+            sections[name] = [off, len(raw), count]
+            off += len(raw) + _pad(len(raw))
+        new_hdr = json.dumps(header).encode('utf-8')
+        if new_hdr == hdr:
+            break
+        hdr = new_hdr
+
+    tmp = path + '.tmp'
+    with open(tmp, 'wb') as f:
+        f.write(_PREFIX.pack(CHECKPOINT_MAGIC, CHECKPOINT_VERSION, len(hdr)))
+        f.write(hdr)
+        f.write(b'\0' * _pad(f.tell()))
+        for name, raw, count in blobs:
+            assert f.tell() == sections[name][0]
+            f.write(raw)
+            f.write(b'\0' * _pad(len(raw)))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def load_checkpoint(path, csv_paths, bloom=False):
+    """
+    Memory-map the checkpoint and return its state, or (None, reason) when
+    it is missing, unreadable, or stale against the current CSV sizes/mtimes.
+    """
+    if not os.path.exists(path):
+        return None, 'no checkpoint'
+    try:
+        with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            magic, version, hlen = _PREFIX.unpack_from(mm, 0)
+            if magic != CHECKPOINT_MAGIC or version != CHECKPOINT_VERSION:
+                return None, 'bad magic/version'
+            header = json.loads(mm[_PREFIX.size:_PREFIX.size + hlen])
+            if header['csv'] != csv_stats(csv_paths):
+                return None, 'stale (CSV files changed since checkpoint)'
+
+            sections = {}
+            for name, (off, length, _) in header['sections'].items():
+                sections[name] = mm[off:off + length]
+    except (OSError, ValueError, struct.error) as e:
+        return None, f'unreadable ({e})'
+
+    state = {'counters': header['counters']}
+    for name, state_key in _SET_KEYS:
+        hashes = array('Q')
+        hashes.frombytes(sections[name])
+        state[state_key] = KeySet.from_sorted(hashes, bloom=bloom and name != 'pages')
+
+    state['university_index'] = {h: (r, l) for h, r, l in json.loads(sections['university_index'])}
+    return state, 'ok'
@@ -0,0 +1,187 @@
+"""
+Typed Parquet export of courses.csv / universities.csv (needs `pip install pyarrow`).
+
+    python columnar.py courses courses.csv parquet/courses.parquet
+    python columnar.py universities universities.csv parquet/universities.parquet
+"""
+import os
+import csv
+import sys
+import time
+import argparse
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = pq = None
+
+from normalize import normalize_batch, parse_int
+
+# ----------------------------------------------------------------
+# PARQUET EXPORT
+# ----------------------------------------------------------------
+#
+# Courses and universities get explicit column types (years / ranks as
+# integers, is_featured as bool) plus the typed columns of normalize.py, and
+# the low-cardinality string columns are dictionary encoded. During a crawl
+# (--parquet) every saved row is buffered; every ROW_GROUP_ROWS rows, or
+# when the oldest buffered row is FLUSH_SECONDS old, the buffer is written
+# as a finished file parquet/<table>/part-<run time>-<NNNN>.parquet (.partial
+# until its footer is written, so readers of the directory only see
+# complete files). A crash loses at most the rows still in the buffer.
+
+PARQUET_DIR = 'parquet'
+ROW_GROUP_ROWS = 5000
+FLUSH_SECONDS = 300
+COMPRESSION = 'zstd'
+
+# (column, type); the type picks both the arrow type and the cell converter
+COURSE_COLUMNS = [
+    ('course_id', 'string'), ('title', 'string'), ('university_name', 'string'),
+    ('intake', 'string'), ('degree', 'string'), ('course_meta', 'string'),
+    ('category', 'string'), ('course_year', 'int16'), ('start_month', 'string'),
+    ('is_featured', 'bool'), ('location', 'string'), ('university_rank', 'int32'),
+    ('university_logo', 'string'),
+]
+UNIVERSITY_COLUMNS = [
+    ('university_identifier', 'string'), ('university_name', 'string'), ('university_logo', 'string'),
+    ('rank', 'int32'), ('established', 'int16'), ('famous_for', 'string'), ('fees', 'string'),
+    ('location', 'string'), ('website_url', 'string'),
+    ('overview_html', 'string'), ('services_html', 'string'), ('rankings_html', 'string'),
+    ('fees_html', 'string'), ('scholarships_html', 'string'), ('accommodation_html', 'string'),
+    ('faqs_html', 'string'),
+]
+TABLES = {'courses': COURSE_COLUMNS, 'universities': UNIVERSITY_COLUMNS}
+# typed columns from normalize.py (rank / established are already integers above)
+NORMALIZED_COLUMNS = {
+    'courses': [('study_mode', 'string'), ('intake_month', 'int8'), ('intake_year', 'int16')],
+    'universities': [('fee_min', 'float64'), ('fee_max', 'float64'), ('fee_currency', 'string')],
+}
+DICT_COLUMNS = {
+    'courses': ['category', 'degree', 'location', 'university_name', 'start_month', 'course_meta', 'intake',
+                'study_mode'],
+    'universities': ['location', 'famous_for', 'fee_currency'],
+}
+
+
+def have_pyarrow():
+    return pa is not None
+
+
+def to_bool(v):
+    return (v or '').strip().lower() in ('yes', 'true', '1')
+
+
+_CONVERT = {'string': lambda v: v or '', 'int16': parse_int, 'int32': parse_int, 'bool': to_bool}
+
+
+def _arrow_type(typ):
+    return pa.bool_() if typ == 'bool' else getattr(pa, typ)()
+
+
+def schema(table):
+    return pa.schema([(name, _arrow_type(typ)) for name, typ in TABLES[table] + NORMALIZED_COLUMNS[table]])
+
+
+def to_record_batch(table, rows):
+    """Column-wise conversion of a list of row dicts into a typed RecordBatch."""
+    arrays = []
+    for name, typ in TABLES[table]:
+        conv = _CONVERT[typ]
+        arrays.append(pa.array([conv(r.get(name, '')) for r in rows], type=_arrow_type(typ)))
+    typed = normalize_batch(table, rows)
+    for name, typ in NORMALIZED_COLUMNS[table]:
+        arrays.append(pa.array(typed[name], type=_arrow_type(typ)))
+    return pa.RecordBatch.from_arrays(arrays, schema=schema(table))
+
+
+def open_writer(table, path):
+    return pq.ParquetWriter(path, schema(table), compression=COMPRESSION,
+                            use_dictionary=DICT_COLUMNS[table])
+
+
+class ParquetSink:
+    """Buffers rows of one table and writes each full (or FLUSH_SECONDS old) buffer as its own Parquet file."""
+
+    def __init__(self, table, directory=PARQUET_DIR, row_group_rows=ROW_GROUP_ROWS, flush_seconds=FLUSH_SECONDS):
+        if pa is None:
+            raise RuntimeError("Parquet export needs pyarrow (pip install pyarrow)")
+        self.table = table
+        self.row_group_rows = row_group_rows
+        self.flush_seconds = flush_seconds
+        self.directory = os.path.join(directory, table)
+        os.makedirs(self.directory, exist_ok=True)
+        self.prefix = os.path.join(self.directory, f"part-{time.strftime('%Y%m%d-%H%M%S')}")
+        self.files = []
+        self.buffer = []
+        self.buffered_since = None
+        self.rows = 0
+
+    def append(self, row):
+        if not self.buffer:
+            self.buffered_since = time.time()
+        self.buffer.append(dict(row))
+        if len(self.buffer) >= self.row_group_rows or time.time() - self.buffered_since >= self.flush_seconds:
+            self.flush()
+
+    def flush(self):
+        """Write the buffer as the next part file (one row group)."""
+        if not self.buffer:
+            return
+        path = f"{self.prefix}-{len(self.files):04d}.parquet"
+        writer = open_writer(self.table, path + '.partial')
+        try:
+            writer.write_batch(to_record_batch(self.table, self.buffer))
+        finally:
+            writer.close()
+        os.replace(path + '.partial', path)
+        self.files.append(path)
+        self.rows += len(self.buffer)
+        self.buffer = []
+
+    def close(self):
+        self.flush()
+        return self.rows
+
+
+def export_csv(table, csv_path, out_path, row_group_rows=50000):
+    """Full export of a CSV to one Parquet file, one row group per `row_group_rows` rows."""
+    if pa is None:
+        raise RuntimeError("Parquet export needs pyarrow (pip install pyarrow)")
+    csv.field_size_limit(min(sys.maxsize, 2**31 - 1))
+    os.makedirs(os.path.dirname(os.path.abspath(out_path)), exist_ok=True)
+    n = 0
+    writer = open_writer(table, out_path + '.partial')
+    try:
+        with open(csv_path, 'r', encoding='utf-8', newline='') as f:
+            batch = []
+            for row in csv.DictReader(f):
+                batch.append(row)
+                if len(batch) >= row_group_rows:
+                    writer.write_batch(to_record_batch(table, batch))
+                    n += len(batch)
+                    batch = []
+            if batch:
+                writer.write_batch(to_record_batch(table, batch))
+                n += len(batch)
+    finally:
+        writer.close()
+    os.replace(out_path + '.partial', out_path)
+    return n
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument('table', choices=sorted(TABLES))
+    ap.add_argument('csv_path')
+    ap.add_argument('out_path')
+    ap.add_argument('--row-group-rows', type=int, default=50000)
+    args = ap.parse_args()
+    t0 = time.time()
+    n = export_csv(args.table, args.csv_path, args.out_path, args.row_group_rows)
+    print(f"{args.table}: {n} rows => {args.out_path} in {time.time() - t0:.1f}s")
+
+
+if __name__ == '__main__':
+    main()
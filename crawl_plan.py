@@ -0,0 +1,120 @@
+import os
+import json
+import time
+
+# ----------------------------------------------------------------
+# CRAWL PLAN / PROGRESS
+# ----------------------------------------------------------------
+#
+# The plan is every (year, category) with its max page, discovered up front
+# and cached in crawl_plan.json:
+#   {"created": 1760000000, "start_url": "...", "years": ["2025", ...],
+#    "max_pages": {"2025": {"Postgraduate": 412, ...}, ...}}
+# Subtracting pages_done gives the remaining work; Progress turns finished
+# pages into throughput and an ETA (EWMA of seconds per page).
+
+PLAN_FILE = 'crawl_plan.json'
+PLAN_MAX_AGE = 24 * 3600
+
+
+def new_plan(start_url, years):
+    return {'created': int(time.time()), 'start_url': start_url, 'years': list(years), 'max_pages': {}}
+
+
+def load_plan(path, start_url, max_age=PLAN_MAX_AGE):
+    """Cached plan, or None if missing, stale or made for another start URL."""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            plan = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if plan.get('start_url') != start_url or time.time() - plan.get('created', 0) > max_age:
+        return None
+    return plan
+
+
+def save_plan(path, plan):
+    tmp = path + '.tmp'
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(plan, f, indent=1)
+    os.replace(tmp, path)
+
+
+def set_max_page(plan, year, category, max_page):
+    """Record a category's max page; returns the change in total pages."""
+    cats = plan['max_pages'].setdefault(year, {})
+    old = cats.get(category, 0)
+    cats[category] = max_page
+    return max_page - old
+
+
+def plan_pages(plan, categories):
+    """Every (year, category, page) of the plan, in crawl order (page as str, like pages_db.csv)."""
+    for year in plan['years']:
+        cats = plan['max_pages'].get(year, {})
+        for cat in categories:
+            for p in range(1, cats.get(cat, 0) + 1):
+                yield year, cat, str(p)
+
+
+def remaining_pages(plan, categories, pages_done):
+    return [k for k in plan_pages(plan, categories) if k not in pages_done]
+
+
+def total_pages(plan):
+    return sum(sum(cats.values()) for cats in plan['max_pages'].values())
+
+
+def _fmt_duration(seconds):
+    seconds = int(seconds)
+    h, rem = divmod(seconds, 3600)
+    return f"{h}h{rem // 60:02d}m" if h else f"{rem // 60}m{rem % 60:02d}s"
+
+
+class Progress:
+    """Pages done vs. planned, with a rate that follows the recent pace."""
+
+    def __init__(self, total, done, alpha=0.1):
+        self.total = total
+        self.done = done
+        self.done_this_run = 0
+        self.alpha = alpha
+        self.started = time.time()
+        self.last = self.started
+        self.s_per_page = None
+
+    def add_total(self, delta):
+        self.total += delta
+
+    def page_done(self):
+        now = time.time()
+        dt, self.last = now - self.last, now
+        self.done += 1
+        self.done_this_run += 1
+        if self.s_per_page is None:
+            self.s_per_page = dt
+        else:
+            self.s_per_page = self.alpha * dt + (1 - self.alpha) * self.s_per_page
+
+    def eta_seconds(self):
+        if not self.s_per_page:
+            return None
+        return max(self.total - self.done, 0) * self.s_per_page
+
+    def snapshot(self):
+        elapsed = time.time() - self.started
+        eta = self.eta_seconds()
+        return {
+            'pages_done': self.done,
+            'pages_total': self.total,
+            'percent': round(100.0 * self.done / self.total, 1) if self.total else 0.0,
+            'pages_per_hour': round(self.done_this_run * 3600 / elapsed, 1) if elapsed else 0.0,
+            'recent_s_per_page': round(self.s_per_page, 1) if self.s_per_page else None,
+            'eta_s': round(eta) if eta is not None else None,
+        }
+
+    def format(self):
+        s = self.snapshot()
+        eta = _fmt_duration(s['eta_s']) if s['eta_s'] is not None else '?'
+        return (f"pages {s['pages_done']}/{s['pages_total']} ({s['percent']}%), "
+                f"{s['pages_per_hour']} pages/h, ETA {eta}")
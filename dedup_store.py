@@ -0,0 +1,161 @@
+import os
+import csv
+import heapq
+import hashlib
+from array import array
+from bisect import bisect_left
+
+# ----------------------------------------------------------------
+# COMPACT DEDUP STORE
+# ----------------------------------------------------------------
+#
+# Instead of keeping every (course_id, title, course_meta, course_year)
+# tuple in a Python set, we keep one 64-bit hash per key in a sorted
+# array('Q') (8 bytes/key) plus a small set of recent additions that is
+# merged in from time to time. An optional Bloom filter answers most
+# "new key" lookups without touching the sorted array.
+
+KEY_SEP = '\x1f'
+
+
+def _hash_bytes(raw):
+    return int.from_bytes(hashlib.blake2b(raw, digest_size=8).digest(), 'little')
+
+
+def key_hash(key):
+    """64-bit hash of a key tuple (parts are stripped, like the CSV loaders do)."""
+    if isinstance(key, str):
+        key = (key,)
+    return _hash_bytes(KEY_SEP.join([str(p).strip() for p in key]).encode('utf-8'))
+
+
+def _sorted_unique(hashes):
+    out = array('Q')
+    last = None
+    for h in sorted(hashes):
+        if h != last:
+            out.append(h)
+            last = h
+    return out
+
+
+class BloomFilter:
+    """Plain Bloom filter over precomputed 64-bit hashes (double hashing, k probes)."""
+
+    def __init__(self, capacity, bits_per_key=10, k=6):
+        self.nbits = max(64, capacity * bits_per_key)
+        self.k = k
+        self.bits = bytearray((self.nbits + 7) // 8)
+
+    def _probes(self, h):
+        h1 = h & 0xFFFFFFFF
+        h2 = (h >> 32) | 1
+        for i in range(self.k):
+            yield (h1 + i * h2) % self.nbits
+
+    def add(self, h):
+        for b in self._probes(h):
+            self.bits[b >> 3] |= 1 << (b & 7)
+
+    def __contains__(self, h):
+        for b in self._probes(h):
+            if not self.bits[b >> 3] & (1 << (b & 7)):
+                return False
+        return True
+
+
+class KeySet:
+    """
+    Set-like store of key hashes with the same `in` / `add` / `len` API
+    the scraper used with plain sets of tuples.
+    """
+
+    MERGE_MIN = 4096
+
+    def __init__(self, hashes=None, bloom=False):
+        self._sorted = array('Q')
+        self._pending = set()
+        self._use_bloom = bloom
+        self._bloom = None
+        if hashes is not None:
+            self._sorted = _sorted_unique(hashes)
+        self._rebuild_bloom()
+
+    @classmethod
+    def from_sorted(cls, sorted_hashes, bloom=False):
+        """Wrap an already sorted, de-duplicated sequence (array or memoryview, no copy)."""
+        ks = cls(bloom=False)
+        ks._sorted = sorted_hashes
+        ks._use_bloom = bloom
+        ks._rebuild_bloom()
+        return ks
+
+    def _rebuild_bloom(self):
+        if not self._use_bloom:
+            return
+        self._bloom = BloomFilter(max(len(self) * 2, 1024))
+        for h in self._sorted:
+            self._bloom.add(h)
+        for h in self._pending:
+            self._bloom.add(h)
+
+    def _has_hash(self, h):
+        if self._bloom is not None and h not in self._bloom:
+            return False
+        if h in self._pending:
+            return True
+        i = bisect_left(self._sorted, h)
+        return i < len(self._sorted) and self._sorted[i] == h
+
+    def __contains__(self, key):
+        return self._has_hash(key_hash(key))
+
+    def __len__(self):
+        return len(self._sorted) + len(self._pending)
+
+    def add(self, key):
+        self.add_hash(key_hash(key))
+
+    def add_hash(self, h):
+        if self._has_hash(h):
+            return
+        self._pending.add(h)
+        if self._bloom is not None:
+            self._bloom.add(h)
+        if len(self._pending) >= max(self.MERGE_MIN, len(self._sorted) // 16):
+            self.compact()
+
+    def compact(self):
+        """Merge recent additions into the sorted array."""
+        if not self._pending:
+            return
+        merged = array('Q', heapq.merge(self._sorted, sorted(self._pending)))
+        self._sorted = merged
+        self._pending = set()
+        if self._bloom is not None and len(self) > self._bloom.nbits // 20:
+            self._rebuild_bloom()
+
+    def sorted_hashes(self):
+        """Return all hashes as one sorted array('Q')."""
+        self.compact()
+        if not isinstance(self._sorted, array):
+            self._sorted = array('Q', self._sorted)
+        return self._sorted
+
+
+def load_key_set(path, columns, bloom=False):
+    """Build a KeySet from the given columns of a CSV file (missing file => empty set)."""
+    hashes = array('Q')
+    if os.path.exists(path):
+        with open(path, 'r', encoding='utf-8', newline='') as f:
+            rd = csv.reader(f)
+            header = next(rd, None)
+            if header:
+                idx = [header.index(c) for c in columns]
+                width = max(idx) + 1
+                for row in rd:
+                    if len(row) < width:
+                        continue
+                    raw = KEY_SEP.join([row[i].strip() for i in idx]).encode('utf-8')
+                    hashes.append(_hash_bytes(raw))
+    return KeySet(hashes, bloom=bloom)
@@ -0,0 +1,174 @@
+import os
+import csv
+import sys
+import json
+import time
+import heapq
+import hashlib
+import tempfile
+
+from dedup_store import key_hash
+
+# ----------------------------------------------------------------
+# RUN-TO-RUN DELTAS (streaming sorted-merge of keyed snapshots)
+# ----------------------------------------------------------------
+#
+# After a run each CSV is turned into a snapshot sorted by key hash:
+#     <key hash hex> \t <row hash hex> \t <row as JSON>
+# (external sort: sorted runs of at most CHUNK_BYTES, then a k-way merge;
+# when a key appears several times the last CSV row wins). The new snapshot
+# is merge-joined with the previous one and every difference is written to
+# deltas/<time>.jsonl:
+#     {"op": "added"|"removed"|"changed", "table": "courses", "key": {...},
+#      "row": {...}, "changed_fields": [...]}
+# Memory stays bounded by CHUNK_BYTES however large the CSVs get.
+#
+# The CSVs are cumulative (rows are never deleted), so a table may come with
+# a `keep(row)` filter: the snapshot then holds only the rows the run saw,
+# and a row of the previous snapshot that is missing shows up as "removed".
+# Without a filter the snapshot is the whole CSV and nothing is ever removed.
+# A partial run (partial=True) saw only some pages, so its snapshot is the
+# previous snapshot with the rows it saw laid over it: rows it did not see
+# keep their last known state, and rows an earlier run removed stay removed
+# instead of coming back from the CSV as "added".
+
+SNAPSHOT_DIR = 'snapshots'
+DELTA_DIR = 'deltas'
+CHUNK_BYTES = 64 * 2**20
+
+csv.field_size_limit(min(sys.maxsize, 2**31 - 1))
+
+
+def _row_hash(body):
+    return hashlib.blake2b(body.encode('utf-8'), digest_size=8).hexdigest()
+
+
+def _keyed_lines(csv_path, key_cols, keep=None):
+    """Unsorted '<key>\t<seq>\t<row hash>\t<json>' lines, seq keeps CSV order for 'last wins'."""
+    with open(csv_path, 'r', encoding='utf-8', newline='') as f:
+        for seq, row in enumerate(csv.DictReader(f)):
+            if keep is not None and not keep(row):
+                continue
+            key = tuple(row[c] for c in key_cols)
+            body = json.dumps(row, ensure_ascii=False, separators=(',', ':'))
+            yield f"{key_hash(key):016x}\t{seq + 1:012d}\t{_row_hash(body)}\t{body}\n"
+
+
+def _write_run(lines, tmp_dir):
+    lines.sort()
+    fd, path = tempfile.mkstemp(suffix='.run', dir=tmp_dir)
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        f.writelines(lines)
+    return path
+
+
+def _base_lines(snapshot_path):
+    """A snapshot as _keyed_lines() lines with seq 0, so any CSV row of the same key wins over it."""
+    for k, h, body in _read_snapshot(snapshot_path):
+        yield f"{k}\t{0:012d}\t{h}\t{body}\n"
+
+
+def build_snapshot(csv_path, key_cols, out_path, chunk_bytes=CHUNK_BYTES, keep=None, base=None):
+    """
+    Write the key-sorted, key-unique snapshot of a CSV (rows passing `keep`),
+    on top of the rows of the snapshot `base` if given; returns its row count.
+    """
+    tmp_dir = os.path.dirname(os.path.abspath(out_path))
+    runs, buf, size = [], [], 0
+    try:
+        if os.path.exists(csv_path):
+            for line in _keyed_lines(csv_path, key_cols, keep):
+                buf.append(line)
+                size += len(line)
+                if size >= chunk_bytes:
+                    runs.append(_write_run(buf, tmp_dir))
+                    buf, size = [], 0
+        if buf:
+            runs.append(_write_run(buf, tmp_dir))
+
+        files = [open(p, 'r', encoding='utf-8') for p in runs]
+        sources = files + ([_base_lines(base)] if base else [])
+        count = 0
+        try:
+            with open(out_path + '.tmp', 'w', encoding='utf-8') as out:
+                prev = None
+                for line in heapq.merge(*sources):
+                    k, _seq, rest = line.split('\t', 2)
+                    if prev is not None and prev[0] != k:
+                        out.write(f"{prev[0]}\t{prev[1]}")
+                        count += 1
+                    prev = (k, rest)
+                if prev is not None:
+                    out.write(f"{prev[0]}\t{prev[1]}")
+                    count += 1
+        finally:
+            for f in files:
+                f.close()
+        os.replace(out_path + '.tmp', out_path)
+        return count
+    finally:
+        for p in runs:
+            os.remove(p)
+
+
+def _read_snapshot(path):
+    if not os.path.exists(path):
+        return
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            k, h, body = line.rstrip('\n').split('\t', 2)
+            yield k, h, body
+
+
+def diff_snapshots(old_path, new_path, table, key_cols, out):
+    """Merge-join two snapshots and write delta records to the open file `out`."""
+    counts = {'added': 0, 'removed': 0, 'changed': 0}
+
+    def emit(op, body, old_body=None):
+        row = json.loads(body)
+        rec = {'op': op, 'table': table, 'key': {c: row.get(c, '') for c in key_cols}, 'row': row}
+        if old_body is not None:
+            old = json.loads(old_body)
+            rec['changed_fields'] = [c for c in row if row.get(c) != old.get(c)]
+        out.write(json.dumps(rec, ensure_ascii=False, separators=(',', ':')) + "\n")
+        counts[op] += 1
+
+    old_it, new_it = _read_snapshot(old_path), _read_snapshot(new_path)
+    a, b = next(old_it, None), next(new_it, None)
+    while a is not None or b is not None:
+        if b is None or (a is not None and a[0] < b[0]):
+            emit('removed', a[2])
+            a = next(old_it, None)
+        elif a is None or b[0] < a[0]:
+            emit('added', b[2])
+            b = next(new_it, None)
+        else:
+            if a[1] != b[1]:
+                emit('changed', b[2], a[2])
+            a, b = next(old_it, None), next(new_it, None)
+    return counts
+
+
+def write_run_delta(tables, snapshot_dir=SNAPSHOT_DIR, delta_dir=DELTA_DIR, partial=False):
+    """
+    tables: [(name, csv path, key columns, keep filter or None), ...]
+    Snapshot every table, diff against the previous snapshot and write one
+    delta file for the run. With `partial` the new snapshots are the previous
+    ones updated with the kept rows. Returns (delta path, {table: counts}).
+    """
+    os.makedirs(snapshot_dir, exist_ok=True)
+    os.makedirs(delta_dir, exist_ok=True)
+    delta_path = os.path.join(delta_dir, time.strftime('%Y%m%d-%H%M%S') + '.jsonl')
+    summary = {}
+    snaps = []
+    with open(delta_path + '.tmp', 'w', encoding='utf-8') as out:
+        for name, csv_path, key_cols, keep in tables:
+            snap = os.path.join(snapshot_dir, name + '.snap')
+            build_snapshot(csv_path, key_cols, snap + '.new', keep=keep, base=snap if partial else None)
+            summary[name] = diff_snapshots(snap, snap + '.new', name, key_cols, out)
+            snaps.append(snap)
+    # only move the snapshots forward once the delta that leads to them exists
+    os.replace(delta_path + '.tmp', delta_path)
+    for snap in snaps:
+        os.replace(snap + '.new', snap)
+    return delta_path, summary
@@ -0,0 +1,133 @@
+import os
+import sys
+import csv
+
+from dedup_store import key_hash
+
+# ----------------------------------------------------------------
+# CARD CONTENT HASHES / PAGE FINGERPRINTS (incremental re-crawl)
+# ----------------------------------------------------------------
+#
+# card_hashes.v2.csv:       course key hash -> hash of the card's content fields
+# page_fingerprints.v2.csv: (year, category, page) -> hash of the page's card hashes
+# Both files are append-only (the last row for a key wins) and are compacted
+# on load when they hold superseded rows.
+#
+# In --incremental mode a listing page is "unchanged" when its fingerprint
+# matches the previous visit, or (first visit) when it has no new and no
+# changed cards. A category stops after INCREMENTAL_STOP_AFTER unchanged pages
+# in a row.
+#
+# Only the course's own fields are hashed: is_featured is a promotion flag
+# that flips without the course changing. (The .v2 files hold these hashes;
+# the older files hashed every card field and are not read.) A changed
+# course's row is rewritten in place in courses.csv (replace_csv_rows), so
+# the file keeps one row per course key. The crawl buffers changed rows and
+# rewrites the file once per checkpoint, not once per page.
+
+CARD_HASH_FILE = 'card_hashes.v2.csv'
+PAGE_FP_FILE = 'page_fingerprints.v2.csv'
+INCREMENTAL_STOP_AFTER = 3
+CARD_CONTENT_FIELDS = ('course_id', 'title', 'university_name', 'location', 'intake', 'degree', 'course_meta')
+
+
+def card_content_hash(cdata):
+    """Hash of the course fields parse_course_box read from the card (not is_featured)."""
+    return key_hash(tuple(f"{k}={cdata.get(k, '')}" for k in CARD_CONTENT_FIELDS))
+
+
+def page_fingerprint(content_hashes):
+    """Order-insensitive hash of the cards on a page."""
+    return key_hash(tuple(str(h) for h in sorted(content_hashes)))
+
+
+def _load_compacted(path, header, nkey):
+    """{key tuple: value str} from an append-only CSV whose last column is the value."""
+    out = {}
+    if not os.path.exists(path):
+        with open(path, 'w', encoding='utf-8', newline='') as f:
+            csv.writer(f).writerow(header)
+        return out
+    total = 0
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        rd = csv.reader(f)
+        next(rd, None)
+        for row in rd:
+            if len(row) != nkey + 1:
+                continue
+            total += 1
+            out[tuple(row[:nkey])] = row[nkey]
+    if len(out) != total:
+        tmp = path + '.tmp'
+        with open(tmp, 'w', encoding='utf-8', newline='') as f:
+            w = csv.writer(f)
+            w.writerow(header)
+            for k, v in out.items():
+                w.writerow(list(k) + [v])
+        os.replace(tmp, path)
+    return out
+
+
+def load_card_hashes(path=CARD_HASH_FILE):
+    """{course key hash: content hash}"""
+    return {int(k[0]): int(v) for k, v in _load_compacted(path, ['key_hash', 'content_hash'], 1).items()}
+
+
+def save_card_hashes(card_hashes, updates, path=CARD_HASH_FILE):
+    """Apply {course key hash: content hash} updates and append them to the file."""
+    if not updates:
+        return
+    card_hashes.update(updates)
+    with open(path, 'a', encoding='utf-8', newline='') as f:
+        csv.writer(f).writerows([k, v] for k, v in updates.items())
+
+
+def load_page_fingerprints(path=PAGE_FP_FILE):
+    """{(year, category, page): fingerprint}"""
+    return {k: int(v) for k, v in _load_compacted(path, ['year', 'category', 'page', 'fingerprint'], 3).items()}
+
+
+def record_page_fingerprint(fingerprints, key, fingerprint, path=PAGE_FP_FILE):
+    """Store a page's fingerprint; returns the previous one (None if never seen)."""
+    prev = fingerprints.get(key)
+    if prev != fingerprint:
+        fingerprints[key] = fingerprint
+        with open(path, 'a', encoding='utf-8', newline='') as f:
+            csv.writer(f).writerow(list(key) + [fingerprint])
+    return prev
+
+
+def replace_csv_rows(path, key_cols, rows):
+    """
+    Rewrite a CSV with each of `rows` (dicts) in place of the row(s) with its
+    key: the first such row is replaced, later duplicates are dropped, rows
+    whose key is not in the file are appended. tmp file + os.replace.
+    Returns the number of rows replaced.
+    """
+    key = lambda r: tuple(str(r.get(c, '')).strip() for c in key_cols)
+    todo = {key(r): r for r in rows}
+    if not todo:
+        return 0
+    csv.field_size_limit(min(sys.maxsize, 2**31 - 1))
+    tmp = path + '.tmp'
+    written = set()
+    with open(path, 'r', encoding='utf-8', newline='') as fi, \
+            open(tmp, 'w', encoding='utf-8', newline='') as fo:
+        rd = csv.reader(fi)
+        w = csv.writer(fo)
+        header = next(rd)
+        w.writerow(header)
+        idx = [header.index(c) for c in key_cols]
+        for row in rd:
+            k = tuple(row[i].strip() for i in idx) if len(row) == len(header) else None
+            if k in todo:
+                if k not in written:
+                    w.writerow([todo[k].get(c, '') for c in header])
+                    written.add(k)
+                continue
+            w.writerow(row)
+        for k, r in todo.items():
+            if k not in written:
+                w.writerow([r.get(c, '') for c in header])
+    os.replace(tmp, path)
+    return len(written)
@@ -0,0 +1,64 @@
+import os
+import json
+
+# ----------------------------------------------------------------
+# WRITE-AHEAD JOURNAL OF PER-CARD PROGRESS
+# ----------------------------------------------------------------
+#
+# One JSON object per line, appended and fsync'ed as each card finishes:
+#   {"t": "univ", "id": ..., "name": ..., "rank": ..., "logo": ...}
+#   {"t": "card", "k": <course key hash>, "o": <outcome>}
+# The journal only covers the listing page in flight: it is reset once the
+# page is recorded in pages_db.csv. After a crash it is replayed so finished
+# cards are skipped without any network call. Only final outcomes are
+# skipped: a card that failed for a transient reason (link error, 429/404
+# after the retry, university page error) is tried again, as it would have
+# been without the journal.
+
+JOURNAL_FILE = 'crawl_journal.jsonl'
+FINAL_CARD_OUTCOMES = ('saved', 'no_link')
+
+
+def append_journal(path, record):
+    line = json.dumps(record, separators=(',', ':')) + "\n"
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write(line)
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def journal_card(path, key_hash, outcome):
+    append_journal(path, {'t': 'card', 'k': key_hash, 'o': outcome})
+
+
+def journal_university(path, university_id, university_name, rank, logo):
+    append_journal(path, {'t': 'univ', 'id': university_id, 'name': university_name,
+                          'rank': rank, 'logo': logo})
+
+
+def reset_journal(path):
+    """Drop the journal once its page is safely recorded as done."""
+    if os.path.exists(path):
+        os.remove(path)
+
+
+def replay_journal(path):
+    """
+    Return ({course key hash: outcome}, [(id, name, rank, logo), ...]).
+    A torn last line (crash mid-write) is ignored.
+    """
+    cards = {}
+    universities = []
+    if not os.path.exists(path):
+        return cards, universities
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                rec = json.loads(line)
+            except ValueError:
+                continue
+            if rec.get('t') == 'card':
+                cards[rec['k']] = rec['o']
+            elif rec.get('t') == 'univ':
+                universities.append((rec['id'], rec['name'], rec['rank'], rec['logo']))
+    return cards, universities
@@ -0,0 +1,93 @@
+import os
+import csv
+import time
+
+import requests
+
+# ----------------------------------------------------------------
+# NEGATIVE CACHE OF DEAD UNIVERSITY LINKS
+# ----------------------------------------------------------------
+
+DEAD_LINKS_FILE = 'dead_links.csv'
+
+# How long (seconds) a failing href stays cached, per status class.
+# A 404 is very likely permanent; 5xx and timeouts are usually transient.
+DEAD_LINK_TTLS = {
+    '404': 14 * 24 * 3600,
+    '5xx': 30 * 60,
+    'error': 15 * 60,
+}
+
+
+def failure_class(status_code=None, exc=None):
+    """
+    Map a failed fetch to a cache class ('404', '5xx', 'error'),
+    or None if the failure should not be cached (e.g. 429, 403).
+    """
+    if exc is not None:
+        resp = getattr(exc, 'response', None)
+        if resp is not None:
+            status_code = resp.status_code
+        elif isinstance(exc, (requests.Timeout, requests.ConnectionError)):
+            return 'error'
+        else:
+            return None
+    if status_code in (404, 410):
+        return '404'
+    if status_code is not None and status_code >= 500:
+        return '5xx'
+    return None
+
+
+def load_dead_links(path=DEAD_LINKS_FILE, now=None):
+    """
+    Return {href: (status_class, expires_at)} of entries that have not expired.
+    The file is append-only; if expired or superseded rows are found it is compacted.
+    """
+    now = now or time.time()
+    cache = {}
+    if not os.path.exists(path):
+        with open(path, 'w', encoding='utf-8', newline='') as f:
+            csv.writer(f).writerow(['href', 'status', 'expires_at'])
+        return cache
+
+    total = 0
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        for row in csv.DictReader(f):
+            total += 1
+            try:
+                expires = float(row['expires_at'])
+            except (TypeError, ValueError):
+                continue
+            cache[row['href']] = (row['status'], expires)
+
+    live = {h: v for h, v in cache.items() if v[1] > now}
+    if len(live) != total:
+        tmp = path + '.tmp'
+        with open(tmp, 'w', encoding='utf-8', newline='') as f:
+            w = csv.writer(f)
+            w.writerow(['href', 'status', 'expires_at'])
+            for href, (status, expires) in live.items():
+                w.writerow([href, status, f"{expires:.0f}"])
+        os.replace(tmp, path)
+    return live
+
+
+def is_dead_link(cache, href, now=None):
+    """Return the cached status class for href, or None if unknown/expired."""
+    hit = cache.get(href)
+    if not hit:
+        return None
+    status, expires = hit
+    if expires <= (now or time.time()):
+        del cache[href]
+        return None
+    return status
+
+
+def record_dead_link(cache, href, status, path=DEAD_LINKS_FILE, now=None):
+    """Remember href as failing with the given class and append it to the cache file."""
+    expires = (now or time.time()) + DEAD_LINK_TTLS[status]
+    cache[href] = (status, expires)
+    with open(path, 'a', encoding='utf-8', newline='') as f:
+        csv.writer(f).writerow([href, status, f"{expires:.0f}"])
@@ -0,0 +1,233 @@
+"""
+Mirror the university logos locally, deduplicated by content and re-validated on later runs.
+
+    python logo_mirror.py                          # every university_logo in universities.csv
+    python logo_mirror.py --workers 32 --dir logos
+    python logo_mirror.py --lookup <logo url>      # print the local file of one logo URL
+
+Every distinct logo URL is downloaded into <dir>/<aa>/<bb>/<sha256>.<ext>,
+so identical images behind different URLs are stored once. logos.csv maps
+each URL to its local file (plus hash, validators and last status), which is
+what a frontend should serve instead of hot-linking the site.
+"""
+import os
+import csv
+import sys
+import time
+import hashlib
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from urllib.parse import urlsplit
+
+# ----------------------------------------------------------------
+# LOGO MIRROR
+# ----------------------------------------------------------------
+#
+# A thread pool fetches the logos, one requests.Session per worker thread
+# (keep-alive connections are reused for the whole run). A logo already in
+# logos.csv whose file still exists is re-validated: the stored ETag /
+# Last-Modified go out as If-None-Match / If-Modified-Since and a 304 costs
+# no download. A 200 is hashed; the file is only written if no logo with
+# that sha256 is stored yet (tmp file + replace, so readers never see a
+# partial image). A failed fetch keeps the URL's previous file and row.
+# With a stop() callable (the crawl passes its RunControl.stopping) logos
+# not started yet are skipped once it turns True, and 429s get no back-off.
+#
+# Files are never deleted here: a logo that changed leaves its old file
+# behind, which a frontend may still reference until it reloads logos.csv.
+#
+# The local paths stay in logos.csv rather than in a column of
+# universities.csv. The crawl appends to universities.csv, one positional
+# row per university, and the mirror runs after the crawl (or on its own).
+# A logo_path column would mean rewriting the whole file, HTML sections
+# included, on every mirror run. It would also need a header migration for
+# every writer of that file. Readers join on the logo URL instead:
+# local_logo_paths(), and query_service.py's /universities rows have
+# logo_path.
+
+LOGO_DIR = 'logos'
+MANIFEST_FILE = 'logos.csv'
+UNIVERSITY_CSV_FILE = 'universities.csv'
+MANIFEST_FIELDS = ['url', 'local_path', 'sha256', 'bytes', 'content_type', 'etag', 'last_modified',
+                   'status', 'checked_at']
+LOGO_WORKERS = 16
+FETCH_TIMEOUT = 30
+FETCH_ATTEMPTS = 3
+RATE_LIMIT_SLEEP = 120
+
+EXTENSIONS = {'image/png': '.png', 'image/jpeg': '.jpg', 'image/jpg': '.jpg', 'image/gif': '.gif',
+              'image/webp': '.webp', 'image/avif': '.avif', 'image/svg+xml': '.svg', 'image/x-icon': '.ico',
+              'image/vnd.microsoft.icon': '.ico'}
+
+csv.field_size_limit(min(sys.maxsize, 2**31 - 1))
+
+
+def logo_urls(path=UNIVERSITY_CSV_FILE):
+    """Distinct non-empty university_logo URLs of universities.csv, in file order."""
+    if not os.path.exists(path):
+        return []
+    urls = {}
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        for row in csv.DictReader(f):
+            url = (row.get('university_logo') or '').strip()
+            if url.startswith(('http://', 'https://')):
+                urls.setdefault(url, None)
+    return list(urls)
+
+
+def load_manifest(path=MANIFEST_FILE):
+    """{url: manifest row}."""
+    if not os.path.exists(path):
+        return {}
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        return {row['url']: row for row in csv.DictReader(f)}
+
+
+def save_manifest(rows, path=MANIFEST_FILE):
+    tmp = path + '.tmp'
+    with open(tmp, 'w', encoding='utf-8', newline='') as f:
+        w = csv.DictWriter(f, fieldnames=MANIFEST_FIELDS, extrasaction='ignore')
+        w.writeheader()
+        w.writerows(rows[u] for u in sorted(rows))
+    os.replace(tmp, path)
+
+
+def local_logo_paths(path=MANIFEST_FILE):
+    """{logo url: local file} of every mirrored logo."""
+    return {u: row['local_path'] for u, row in load_manifest(path).items() if row.get('local_path')}
+
+
+def extension(content_type, url):
+    ext = EXTENSIONS.get(content_type)
+    if ext:
+        return ext
+    ext = os.path.splitext(urlsplit(url).path)[1].lower()
+    return ext if ext in EXTENSIONS.values() or ext == '.jpeg' else '.img'
+
+
+def logo_path(directory, digest, ext):
+    return os.path.join(directory, digest[:2], digest[2:4], digest + ext)
+
+
+def store_logo(directory, content, ext):
+    """(path, sha256, newly written) of the content-addressed file for `content`."""
+    digest = hashlib.sha256(content).hexdigest()
+    path = logo_path(directory, digest, ext)
+    if os.path.exists(path):
+        return path, digest, False
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{threading.get_ident()}.tmp"
+    with open(tmp, 'wb') as f:
+        f.write(content)
+    os.replace(tmp, path)
+    return path, digest, True
+
+
+class LogoClient:
+    """requests.Session per worker thread; 429s are retried after a sleep."""
+
+    def __init__(self, timeout=FETCH_TIMEOUT, rate_limit_sleep=RATE_LIMIT_SLEEP, stop=None):
+        import requests
+        self.requests = requests
+        self.timeout = timeout
+        self.rate_limit_sleep = rate_limit_sleep
+        self.stop = stop or (lambda: False)
+        self.local = threading.local()
+
+    def session(self):
+        s = getattr(self.local, 'session', None)
+        if s is None:
+            s = self.local.session = self.requests.Session()
+        return s
+
+    def get(self, url, headers=None):
+        for attempt in range(1, FETCH_ATTEMPTS + 1):
+            r = self.session().get(url, headers=headers, timeout=self.timeout)
+            if r.status_code == 429 and attempt < FETCH_ATTEMPTS and not self.stop():
+                time.sleep(self.rate_limit_sleep)
+                continue
+            return r
+
+
+def mirror_one(client, directory, url, old):
+    """(url, manifest row, outcome) for one logo URL; outcome is one of the stats keys."""
+    if client.stop():
+        return url, old, 'skipped'
+    row = dict(old or {}, url=url, checked_at=time.strftime("%Y-%m-%d %H:%M:%S"))
+    headers = {}
+    have_file = bool(old and old.get('local_path') and os.path.exists(old['local_path']))
+    if have_file:
+        if old.get('etag'):
+            headers['If-None-Match'] = old['etag']
+        if old.get('last_modified'):
+            headers['If-Modified-Since'] = old['last_modified']
+    try:
+        r = client.get(url, headers)
+    except Exception as e:
+        row['status'] = f"error: {type(e).__name__}"
+        return url, row, 'failed'
+    if r.status_code == 304 and have_file:
+        row['status'] = '304'
+        return url, row, 'not_modified'
+    content_type = r.headers.get('Content-Type', '').split(';')[0].strip().lower()
+    if r.status_code != 200 or not r.content or content_type.startswith('text/'):
+        row['status'] = f"{r.status_code} {content_type or 'empty'}" if r.status_code == 200 else str(r.status_code)
+        return url, row, 'failed'
+
+    path, digest, new = store_logo(directory, r.content, extension(content_type, url))
+    row.update(local_path=path, sha256=digest, bytes=len(r.content), content_type=content_type,
+               etag=r.headers.get('ETag', ''), last_modified=r.headers.get('Last-Modified', ''), status='200')
+    if old and old.get('sha256') == digest:
+        return url, row, 'unchanged'
+    return url, row, 'stored' if new else 'deduped'
+
+
+def mirror_logos(urls, directory=LOGO_DIR, manifest_path=MANIFEST_FILE, workers=LOGO_WORKERS,
+                 rate_limit_sleep=RATE_LIMIT_SLEEP, log=print, stop=None):
+    """Download / re-validate `urls` into `directory` and update the manifest; returns a stats dict."""
+    manifest = load_manifest(manifest_path)
+    client = LogoClient(rate_limit_sleep=rate_limit_sleep, stop=stop)
+    stats = {'urls': len(urls), 'stored': 0, 'deduped': 0, 'unchanged': 0, 'not_modified': 0, 'failed': 0,
+             'skipped': 0, 'bytes_downloaded': 0}
+    t0 = time.time()
+    log(f"[LOGOS] {len(urls)} logo URLs ({sum(u in manifest for u in urls)} known), {workers} workers => {directory}/")
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(mirror_one, client, directory, u, manifest.get(u)) for u in urls]
+        for fut in as_completed(futures):
+            url, row, outcome = fut.result()
+            stats[outcome] += 1
+            if outcome in ('stored', 'deduped', 'unchanged'):
+                stats['bytes_downloaded'] += int(row['bytes'])
+            elif outcome == 'failed':
+                log(f"[WARN] logo {url} => {row['status']}")
+            if outcome != 'skipped':
+                manifest[url] = row
+    save_manifest(manifest, manifest_path)
+    stats['files'] = len({r['local_path'] for r in manifest.values() if r.get('local_path')})
+    stats['seconds'] = round(time.time() - t0, 1)
+    log(f"[LOGOS] done => {stats}")
+    return stats
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument('--csv', default=UNIVERSITY_CSV_FILE)
+    ap.add_argument('--dir', default=LOGO_DIR)
+    ap.add_argument('--manifest', default=MANIFEST_FILE)
+    ap.add_argument('--workers', type=int, default=LOGO_WORKERS)
+    ap.add_argument('--rate-limit-sleep', type=float, default=RATE_LIMIT_SLEEP)
+    ap.add_argument('--lookup', help="print the local file of this logo URL and exit")
+    args = ap.parse_args(argv)
+
+    if args.lookup:
+        path = local_logo_paths(args.manifest).get(args.lookup)
+        if not path:
+            sys.exit(f"not mirrored: {args.lookup}")
+        print(path)
+        return
+    mirror_logos(logo_urls(args.csv), args.dir, args.manifest, args.workers, args.rate_limit_sleep)
+
+
+if __name__ == '__main__':
+    main()
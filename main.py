@@ -4,8 +4,33 @@ import time
 import re
 import requests
 import random
-
-from bs4 import BeautifulSoup, Tag
+import argparse
+from collections import Counter, deque
+
+from blobstore import BlobStore, pack_sections
+from browser import BrowserSupervisor
+from checkpoint import load_checkpoint, save_checkpoint
+from columnar import ParquetSink, have_pyarrow
+from crawl_plan import PLAN_FILE, Progress, load_plan, new_plan, plan_pages, remaining_pages, save_plan, set_max_page, total_pages
+from delta import write_run_delta
+from dedup_store import KeySet, key_hash, load_key_set
+from incremental import (
+    INCREMENTAL_STOP_AFTER, card_content_hash, load_card_hashes, load_page_fingerprints,
+    page_fingerprint, record_page_fingerprint, replace_csv_rows, save_card_hashes
+)
+from journal import FINAL_CARD_OUTCOMES, JOURNAL_FILE, journal_card, journal_university, reset_journal, replay_journal
+from link_cache import load_dead_links, is_dead_link, record_dead_link, failure_class
+from logo_mirror import LOGO_DIR, LOGO_WORKERS, logo_urls, mirror_logos
+from metrics import timed, incr, serve_metrics, summary, write_prometheus, write_summary
+from page_stats import load_page_stats, rank_pages, record_visit, save_page_stats
+from profiling import PHASES, DEFAULT_PHASES, profile_phase, start_rss_sampler, configure as configure_profiling, finish as finish_profiling
+from records import CrawlState, to_record
+from refresh_universities import Fetcher
+from run_control import SHUTDOWN_RESERVE, RunControl, deadline_from
+from sitemap import PREFETCH_WORKERS, UniversityPrefetcher, discover_university_urls, known_university_ids
+from tabs import BACKGROUND_TAB_FLAGS, Tab, next_ready, open_tab_handles, start_loading, take_lane
+from tracing import annotate, page_trace, span, configure as configure_tracing, stats as tracing_stats
+from university_page import DEFAULT_PARSER, LOG_FILE, PARSER_BACKENDS, have_parser, log, parse_university_page, set_parser
 
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
@@ -33,23 +58,49 @@ MONTH_MAP = {
 UNIVERSITY_CSV_FILE = 'universities.csv'
 COURSE_CSV_FILE     = 'courses.csv'
 PAGES_DB_FILE       = 'pages_db.csv'
-LOG_FILE            = 'scraper.log'
+START_URL           = "https://india.studyin-uk.com/find-courses/"
+RATE_LIMIT_SLEEP = 120   # seconds to back off after a 429
+
+# Put a Bloom filter in front of the course/university dedup stores
+DEDUP_BLOOM         = False
+
+# Binary snapshot of the dedup keys / university index, re-written every N pages
+CHECKPOINT_FILE     = 'crawl_state.ckpt'
+CHECKPOINT_EVERY_PAGES = 5
+CHECKPOINT_CSVS = (UNIVERSITY_CSV_FILE, COURSE_CSV_FILE, PAGES_DB_FILE)
+
+# Browser supervision: watchdog for hung driver steps, periodic recycling
+WATCHDOG_TIMEOUT = 180
+WATCHDOG_NAV_TIMEOUT = 900
+RECYCLE_EVERY_PAGES = 200
+RECYCLE_RSS_MB = 2500
+CATEGORY_ATTEMPTS = 3
+
+# --tabs: seconds a tab's listing page may take to arrive before it is read anyway
+TAB_PAGE_WAIT = 30
+
+# Stage timings: Prometheus text file (refreshed with each checkpoint), JSON summary
+# at the end of the run, and an optional local HTTP endpoint (0 = off)
+METRICS_PROM_FILE = 'metrics.prom'
+METRICS_JSON_FILE = 'metrics_summary.json'
+METRICS_PORT = 0
+
+# Per-page span traces in Chrome trace format ('' = off). Pages are sampled,
+# but any page with a span slower than TRACE_KEEP_OVER_S is always kept.
+TRACE_FILE = ''
+TRACE_SAMPLE_RATE = 0.05
+TRACE_KEEP_OVER_S = 20
+
+# crawl plan (crawl_plan.json) => progress / ETA log line every N pages
+PROGRESS_EVERY_PAGES = 10
+
+# --profile: per-phase cProfile/tracemalloc reports and RSS samples land here
+PROFILE_DIR = 'profiles'
+RSS_SAMPLE_INTERVAL = 10
 
 # The categories we want to scrape:
 CATEGORIES = ["Postgraduate","Undergraduate","Pre-sessional","Foundation","Pre-masters","Research"]
 
-# ----------------------------------------------------------------
-# LOGGING
-# ----------------------------------------------------------------
-
-def log(msg):
-    stamp = time.strftime("%Y-%m-%d %H:%M:%S")
-    line = f"[{stamp}] {msg}"
-    print(line)
-    # Also append to a local logfile
-    with open(LOG_FILE, 'a', encoding='utf-8') as f:
-        f.write(line + "\n")
-
 # ----------------------------------------------------------------
 # CSV PREPARATION / LOADING
 # ----------------------------------------------------------------
@@ -103,47 +154,151 @@ def prepare_csv_files():
             w.writerow(['year','category','page'])
 
 def load_scraped_universities():
-    """Return set of (university_identifier, university_name) we've already stored."""
-    s = set()
+    """
+    Return (KeySet of (university_identifier, university_name),
+            {key hash: (rank, logo)}) from universities.csv, in one pass.
+    """
+    index = {}
     if os.path.exists(UNIVERSITY_CSV_FILE):
         with open(UNIVERSITY_CSV_FILE, 'r', encoding='utf-8', newline='') as f:
             rd = csv.DictReader(f)
             for row in rd:
-                uid = row['university_identifier'].strip()
-                unm = row['university_name'].strip()
-                s.add((uid, unm))
-    return s
+                h = key_hash((row['university_identifier'], row['university_name']))
+                index.setdefault(h, (row.get('rank', ''), row.get('university_logo', '')))
+    return KeySet(index.keys(), bloom=DEDUP_BLOOM), index
 
 def load_scraped_courses():
     """
-    Return set of (course_id, title, course_meta, course_year).
+    Return KeySet of (course_id, title, course_meta, course_year).
     We treat duplicates if all 4 match => already scraped.
     """
-    s = set()
-    if os.path.exists(COURSE_CSV_FILE):
-        with open(COURSE_CSV_FILE, 'r', encoding='utf-8', newline='') as f:
-            rd = csv.DictReader(f)
-            for row in rd:
-                cid  = row['course_id'].strip()
-                cttl = row['title'].strip()
-                cmet = row['course_meta'].strip()
-                cyer = row['course_year'].strip()
-                s.add((cid, cttl, cmet, cyer))
-    return s
+    return load_key_set(COURSE_CSV_FILE, ('course_id', 'title', 'course_meta', 'course_year'), bloom=DEDUP_BLOOM)
 
 def load_scraped_pages():
-    """Return set of (year, category, page) already done."""
-    s = set()
-    if os.path.exists(PAGES_DB_FILE):
-        with open(PAGES_DB_FILE, 'r', encoding='utf-8', newline='') as f:
-            rd = csv.DictReader(f)
-            for row in rd:
-                y = row['year'].strip()
-                c = row['category'].strip()
-                p = row['page'].strip()
-                s.add((y, c, p))
-    return s
+    """Return KeySet of (year, category, page) already done."""
+    return load_key_set(PAGES_DB_FILE, ('year', 'category', 'page'))
+
+def load_crawl_state():
+    """
+    Return the dedup sets, university index and counters, from the checkpoint
+    if it still matches the CSVs, otherwise by re-reading the CSVs.
+    """
+    t0 = time.time()
+    ckpt, why = load_checkpoint(CHECKPOINT_FILE, CHECKPOINT_CSVS, bloom=DEDUP_BLOOM)
+    if ckpt:
+        counters = ckpt.pop('counters')
+        ckpt.update(counters)
+        log(f"[INFO] resumed from checkpoint in {time.time() - t0:.2f}s")
+        return ckpt
+
+    log(f"[INFO] checkpoint not used => {why}, reading CSVs..")
+    unis, uni_index = load_scraped_universities()
+    crses = load_scraped_courses()
+    pages = load_scraped_pages()
+    log(f"[INFO] loaded CSV state in {time.time() - t0:.2f}s")
+    return {
+        'universities_scraped_set': unis,
+        'courses_scraped_set': crses,
+        'pages_done_set': pages,
+        'university_index': uni_index,
+        'uni_scraped_count': len(unis),
+        'course_scraped_count': len(crses)
+    }
 
+def replay_card_journal(console_state):
+    """Re-apply the journal of the page that was in flight when the last run stopped."""
+    cards, universities = replay_journal(JOURNAL_FILE)
+    for uid, unm, rank, logo in universities:
+        console_state['universities_scraped_set'].add((uid, unm))
+        console_state['university_index'][key_hash((uid, unm))] = (rank, logo)
+    for h, outcome in cards.items():
+        if outcome == 'saved':
+            console_state['courses_scraped_set'].add_hash(h)
+    console_state['journal_cards'] = cards
+    if cards or universities:
+        log(f"[INFO] replayed journal => {len(cards)} cards, {len(universities)} universities")
+
+def write_checkpoint(console_state):
+    try:
+        flush_changed_courses(console_state)
+    except OSError as e:
+        log(f"[WARN] changed courses write failed => {e}")
+    try:
+        save_checkpoint(CHECKPOINT_FILE, console_state, CHECKPOINT_CSVS)
+    except OSError as e:
+        log(f"[WARN] checkpoint write failed => {e}")
+    try:
+        save_page_stats(console_state['page_stats'])
+    except OSError as e:
+        log(f"[WARN] page stats write failed => {e}")
+
+def export_row(console_state, table, row):
+    """Hand a saved row to the Parquet writer of its table (--parquet) and, as a slotted record, to the sinks."""
+    sinks = console_state['parquet']
+    if sinks:
+        sinks[table].append(row)
+    if console_state['sinks']:
+        record = to_record(table, row)
+        for sink in console_state['sinks']:
+            sink.write(table, record)
+
+def close_sinks(console_state):
+    sinks, console_state['sinks'] = console_state['sinks'], []
+    for sink in sinks:
+        sink.close()
+
+def close_parquet(console_state):
+    parquet, console_state['parquet'] = console_state['parquet'], None
+    for table, sink in (parquet or {}).items():
+        log(f"[INFO] parquet => {sink.close()} {table} rows in {len(sink.files)} files in {sink.directory}/")
+
+def close_prefetch(console_state):
+    prefetcher, console_state['prefetch'] = console_state['prefetch'], None
+    if prefetcher:
+        prefetcher.close()
+        log(f"[INFO] university prefetch => {prefetcher.stats}")
+
+def close_blob_store(console_state):
+    store, console_state['blob_store'] = console_state['blob_store'], None
+    if store:
+        store.close()
+        log(f"[INFO] section blobs => {store.stats}")
+
+def close_outputs(console_state):
+    """Write buffered changed courses, close the Parquet files, sinks, prefetcher and blob store. main() runs this on every exit; a second call does nothing."""
+    for close in (flush_changed_courses, close_parquet, close_sinks, close_prefetch, close_blob_store):
+        try:
+            close(console_state)
+        except Exception as e:
+            log(f"[WARN] {close.__name__} failed => {e}")
+
+def write_delta(console_state):
+    """
+    Diff the rows this run saw against the previous snapshots into deltas/<time>.jsonl.
+    Only a run that parsed every planned page knows what is gone: a partial
+    run lays the rows it saw over the previous snapshots, so it reports no
+    removals (and does not bring back rows an earlier run removed).
+    """
+    t0 = time.time()
+    course_key = ('course_id', 'title', 'course_meta', 'course_year')
+    progress = console_state['progress']
+    seen_courses, seen_universities = console_state['seen_courses'], console_state['seen_universities']
+    partial = progress.done_this_run < progress.total
+    if partial:
+        log(f"[INFO] delta => {progress.done_this_run} of {progress.total} pages parsed this run, removals not detected")
+    try:
+        path, counts = write_run_delta([
+            ('courses', COURSE_CSV_FILE, course_key,
+             lambda row: tuple(row.get(c, '') for c in course_key) in seen_courses),
+            ('universities', UNIVERSITY_CSV_FILE, ('university_identifier', 'university_name'),
+             lambda row: row.get('university_name', '').strip() in seen_universities),
+        ], partial=partial)
+    except OSError as e:
+        log(f"[WARN] delta write failed => {e}")
+        return
+    log(f"[INFO] delta => {path} {counts} in {time.time() - t0:.1f}s")
+
+@timed('csv_write', file='universities')
 def save_university_data(data):
     with open(UNIVERSITY_CSV_FILE, 'a', encoding='utf-8', newline='') as f:
         w = csv.writer(f)
@@ -166,6 +321,7 @@ def save_university_data(data):
             data.get('faqs_html','')
         ])
 
+@timed('csv_write', file='courses')
 def save_course_data(data):
     with open(COURSE_CSV_FILE, 'a', encoding='utf-8', newline='') as f:
         w = csv.writer(f)
@@ -185,15 +341,48 @@ def save_course_data(data):
             data.get('university_logo','')
         ])
 
+@timed('csv_write', file='pages')
 def save_page_done(year, category, page):
     with open(PAGES_DB_FILE, 'a', encoding='utf-8', newline='') as f:
         w = csv.writer(f)
         w.writerow([year, category, page])
 
+def mark_page_done(console_state, year, category, page, new_courses=0):
+    """Record a finished listing page, checkpointing every CHECKPOINT_EVERY_PAGES pages."""
+    if (year, category, page) not in console_state['pages_done_set']:
+        save_page_done(year, category, page)
+        console_state['pages_done_set'].add((year, category, page))
+    record_visit(console_state['page_stats'], (year, category, page), new_courses)
+    reset_journal(JOURNAL_FILE)
+    console_state['journal_cards'] = {}
+    incr('pages_done')
+    progress = console_state.get('progress')
+    if progress:
+        progress.page_done()
+        if progress.done_this_run % PROGRESS_EVERY_PAGES == 0:
+            log(f"[PROGRESS] {progress.format()}")
+    console_state['pages_since_checkpoint'] = console_state.get('pages_since_checkpoint', 0) + 1
+    if console_state['pages_since_checkpoint'] >= CHECKPOINT_EVERY_PAGES:
+        write_checkpoint(console_state)
+        write_prometheus(METRICS_PROM_FILE)
+        console_state['pages_since_checkpoint'] = 0
+
+def page_wanted(console_state, year, category, page):
+    """Parse this page? Always in incremental mode, otherwise only if not done yet."""
+    return console_state['incremental'] or (year, category, page) not in console_state['pages_done_set']
+
+def note_page_fingerprint(console_state, key, fingerprint, new_courses, changed_courses):
+    """Store the page fingerprint; True if the page is unchanged since the last visit."""
+    prev = record_page_fingerprint(console_state['page_fingerprints'], key, fingerprint)
+    if prev is not None:
+        return prev == fingerprint
+    return not new_courses and not changed_courses
+
 # ----------------------------------------------------------------
 # WAITING / LOADING
 # ----------------------------------------------------------------
 
+@timed('wait_page_loaded')
 def wait_for_page_loaded(driver, max_wait=30):
     """
     Wait for:
@@ -215,6 +404,7 @@ def wait_for_page_loaded(driver, max_wait=30):
     except TimeoutException:
         log("[WARN] Timed out waiting for .siuk-prelaoder vanish")
 
+@timed('wait_courses_load')
 def wait_for_courses_load(driver, max_wait=30):
     """
     After pagination or category click, wait for page load + presence of .single-events-card
@@ -228,72 +418,10 @@ def wait_for_courses_load(driver, max_wait=30):
     except TimeoutException:
         log("[WARN] Timed out waiting for .single-events-card. Possibly empty page or slow site.")
 
-# ----------------------------------------------------------------
-# SANITIZE HTML UTILS
-# ----------------------------------------------------------------
-
-def sanitize_html(html_content):
-    """
-    Removes or unwraps <a> tags:
-      - If anchor text or href contains 'enquire'/'enquiry', remove entire anchor
-      - Otherwise unwrap the anchor (keep text)
-    Also remove <div class="uni_course_enquire_now"> blocks.
-    """
-    if not html_content.strip():
-        return html_content
-
-    soup = BeautifulSoup(html_content, 'html.parser')
-
-    # 1) remove .uni_course_enquire_now
-    for div in soup.select('.uni_course_enquire_now'):
-        div.decompose()
-
-    # 2) Remove div.et_pb_text_inner if the first child is an <h3>
-    for div in soup.select('.et_pb_text_inner'):
-        if div.contents:
-            first_child = div.contents[0]
-            if isinstance(first_child, Tag) and first_child.name == 'h3':
-                div.decompose()
-
-    # 3) Remove all <img> tags
-    for img_tag in soup.find_all('img'):
-        img_tag.decompose()
-
-    # 2) handle <a> links
-    anchors = soup.find_all('a')
-    for a_tag in anchors:
-        txt_lower = a_tag.get_text(strip=True).lower()
-        href_lower= a_tag.get('href','').lower()
-        if 'enquire' in txt_lower or 'enquiry' in txt_lower or 'enquire' in href_lower:
-            a_tag.decompose()
-        else:
-            # unwrap the anchor => keep text
-            a_tag.unwrap()
-
-    return str(soup)
-
-def modify_section_html(raw_html):
-    """Helper to sanitize the final HTML of a single section."""
-    return sanitize_html(raw_html)
-
 # ----------------------------------------------------------------
 # UNIVERSITY PAGE SCRAPE
 # ----------------------------------------------------------------
 
-def get_section_inner_html(soup, section_id):
-    """
-    Returns the *inner HTML* of <div id="section_id">, not including
-    that parent <div> itself. Then sanitizes it.
-    
-    If you want exactly the content *inside* the #overview block:
-      raw_inner = ''.join(str(child) for child in that_div.contents)
-    """
-    section_div = soup.find('div', id=section_id)
-    if not section_div:
-        return ''
-    raw_inner = ''.join(str(child) for child in section_div.contents)
-    return modify_section_html(raw_inner)
-
 def scrape_university_page(url, university_id, university_name, console_state):
     """
     Downloads the university page and extracts needed info:
@@ -304,70 +432,25 @@ def scrape_university_page(url, university_id, university_name, console_state):
 
     # request
     try:
-        r = requests.get(url, timeout=30)
+        with timed('univ_fetch'):
+            r = requests.get(url, timeout=30)
         if r.status_code == 404:
             log("[WARN] Univ page 404 => skip")
+            note_dead_link(console_state, url, status_code=404)
             return None
         if r.status_code == 429:
-            log("[WARN] 429 => wait 120 & retry")
-            time.sleep(120)
+            log(f"[WARN] 429 => wait {RATE_LIMIT_SLEEP} & retry")
+            if not backoff_429(console_state):
+                return None
             return scrape_university_page(url, university_id, university_name, console_state)
         r.raise_for_status()
     except Exception as e:
         log(f"[ERROR] fetch univ => {e}")
+        note_dead_link(console_state, url, exc=e)
         return None
 
-    soup = BeautifulSoup(r.text, 'html.parser')
-
-    data={}
-    data['university_identifier'] = university_id.strip()
-    data['university_name']       = university_name.strip()
-
-    # Logo
-    logo_el = soup.select_one('.uni_logo img.single-event-image')
-    if logo_el and logo_el.has_attr('src'):
-        data['university_logo'] = logo_el['src']
-    else:
-        data['university_logo'] = ''
-
-    # If name was empty, fallback from page:
-    if not data['university_name']:
-        name_el = soup.select_one('.s_event_section.uni_section_wrapper h1')
-        if name_el:
-            data['university_name'] = name_el.get_text(strip=True)
-
-    # rank / established / famous_for / fees
-    data['rank']        = ''
-    data['established'] = ''
-    data['famous_for']  = ''
-    data['fees']        = ''
-
-    rank_divs = soup.select('.head_desc .uni_rank')
-    for rdv in rank_divs:
-        txt = rdv.get_text(" ", strip=True)
-        if txt.startswith("Rank "):
-            data['rank'] = txt.replace("Rank ","").strip()
-        elif txt.startswith("Established "):
-            data['established'] = txt.replace("Established ","").strip()
-        elif txt.startswith("Famous for "):
-            data['famous_for'] = txt.replace("Famous for ","").strip()
-        elif txt.startswith("Fees "):
-            data['fees'] = txt.replace("Fees ","").strip()
-
-    loc_el = soup.select_one('.uni_website a[href*="google.com/local"] span')
-    data['location'] = loc_el.get_text(strip=True) if loc_el else ''
-
-    web_el = soup.select_one('.uni_website.s_uni_web a')
-    data['website_url'] = web_el['href'] if (web_el and web_el.has_attr('href')) else ''
-
-    # sections => we do "inner" instead of entire parent column
-    data['overview_html']      = get_section_inner_html(soup, 'overview')
-    data['services_html']      = get_section_inner_html(soup, 'services')
-    data['rankings_html']      = get_section_inner_html(soup, 'rankings')
-    data['fees_html']          = get_section_inner_html(soup, 'fees')
-    data['scholarships_html']  = get_section_inner_html(soup, 'scholarships')
-    data['accommodation_html'] = get_section_inner_html(soup, 'accommodation')
-    data['faqs_html']          = get_section_inner_html(soup, 'faqs')
+    with profile_phase('university'):
+        data = parse_university_page(r.text, university_id, university_name)
 
     console_state['uni_scraped_count'] += 1
     log(f"[INFO] Univ ok => {data['university_name']} (count={console_state['uni_scraped_count']})")
@@ -447,81 +530,251 @@ def parse_and_scrape_courses(driver, category, console_state):
     """
     Called after we click a page or category. We'll parse all .single-events-card,
     skip duplicates, and if needed fetch the univ page.
+    Returns (new courses saved, changed courses re-saved, page fingerprint);
+    the fingerprint is None when the deadline cut the page short (do not record it).
     """
-    wait_for_courses_load(driver)
-    cards = driver.find_elements(By.CSS_SELECTOR, '.single-events-card')
-    log(f"[{category}] Found {len(cards)} courses on this page.")
-
-    for card in cards:
-        cdata = parse_course_box(card)
-        c_key = (
-            cdata['course_id'].strip(),
-            cdata['title'].strip(),
-            cdata['course_meta'].strip(),
-            cdata['course_year'].strip()
-        )
-        if c_key in console_state['courses_scraped_set']:
-            log(f"   -> Already have {c_key}")
-            continue
+    with console_state['browser'].watch('parse cards'), timed('read_cards'), profile_phase('cards'):
+        wait_for_courses_load(driver)
+        cards = driver.find_elements(By.CSS_SELECTOR, '.single-events-card')
+        log(f"[{category}] Found {len(cards)} courses on this page.")
+
+        # read everything we need from the DOM first, then do the slow network part
+        todo = []
+        new_courses = 0
+        content = {}    # course key hash => content hash, for the page fingerprint
+        changed = []
+        for card in cards:
+            cdata = parse_course_box(card)
+            c_key = (
+                cdata['course_id'].strip(),
+                cdata['title'].strip(),
+                cdata['course_meta'].strip(),
+                cdata['course_year'].strip()
+            )
+            h, ch = key_hash(c_key), card_content_hash(cdata)
+            content[h] = ch
+            console_state['seen_courses'].add_hash(h)
+            console_state['seen_universities'].add(cdata['university_name'].strip())
+            if c_key in console_state['courses_scraped_set']:
+                if console_state['incremental'] and console_state['card_hashes'].get(h, ch) != ch:
+                    log(f"   -> Changed {c_key}")
+                    changed.append((cdata, h, ch, card_learn_more_href(card)))
+                    continue
+                log(f"   -> Already have {c_key}")
+                incr('card_outcome', outcome='duplicate')
+                continue
 
-        # 'Learn more' link
-        try:
-            learn_more= card.find_element(By.CSS_SELECTOR,'a.siuk-view-more-red')
-        except:
-            log("   -> no learn_more => skip course.")
-            continue
-        href= learn_more.get_attribute('href') or ''
-        if not href:
-            log("   -> no href => skip course.")
-            continue
+            done = console_state['journal_cards'].get(h)
+            if done in FINAL_CARD_OUTCOMES:
+                log(f"   -> journaled as '{done}' before restart => skip")
+                new_courses += done == 'saved'
+                continue
+            todo.append((cdata, c_key, card_learn_more_href(card)))
+
+    cut = False
+    for i, (cdata, c_key, href) in enumerate(todo):
+        if console_state['run'].out_of_time():
+            log(f"[STOP] deadline => {len(todo) - i} cards of this page left for the next run, page not recorded")
+            cut = True
+            break
+        with span('card', course_id=cdata['course_id']):
+            outcome = scrape_course_card(href, cdata, c_key, console_state)
+            annotate(outcome=outcome)
+        journal_card(JOURNAL_FILE, key_hash(c_key), outcome)
+        incr('card_outcome', outcome=outcome)
+        console_state['journal_cards'][key_hash(c_key)] = outcome
+        new_courses += outcome == 'saved'
+
+    for cdata, h, ch, href in changed:
+        save_changed_course(href, cdata, console_state)
+        incr('card_outcome', outcome='changed')
+        # the row and its card hash are written at the next checkpoint (flush_changed_courses)
+        console_state['changed_courses'][h] = (cdata, ch)
+        console_state['card_hashes'][h] = ch
+    save_card_hashes(console_state['card_hashes'],
+                     {h: ch for h, ch in content.items() if console_state['card_hashes'].get(h) != ch})
+    return new_courses, len(changed), None if cut else page_fingerprint(content.values())
+
+def card_learn_more_href(card):
+    """'Learn more' href of a card: None if the link is missing, '' if it has no href."""
+    try:
+        learn_more = card.find_element(By.CSS_SELECTOR, 'a.siuk-view-more-red')
+    except Exception:
+        return None
+    return learn_more.get_attribute('href') or ''
 
-        # quick test => 404/429
+def scrape_course_card(href, cdata, c_key, console_state):
+    """
+    Link-test a new card, fetch its university if needed and save the course.
+    Returns the card's outcome ('saved', 'no_link', 'dead', ...) for the journal.
+    """
+    if href is None:
+        log("   -> no learn_more => skip course.")
+        return 'no_link'
+    if not href:
+        log("   -> no href => skip course.")
+        return 'no_link'
+
+    dead = is_dead_link(console_state['dead_links'], href)
+    if dead:
+        log(f"   -> cached dead link ({dead}) => skip course.")
+        console_state['dead_link_hits'][dead] += 1
+        return 'dead_cached'
+
+    # a prefetched university page doubles as the link test
+    uni_id = university_id_from_href(href)
+    prefetched = take_prefetched(console_state, uni_id)
+    if prefetched is None:
+        failed = link_test(href, console_state)
+        if failed:
+            return failed
+
+    uni_name= cdata['university_name'].strip()
+
+    # if new univ => scrape
+    u_key= (uni_id, uni_name)
+    if u_key not in console_state['universities_scraped_set']:
+        if prefetched:
+            univ_data= prefetched_university(prefetched, uni_id, uni_name, console_state)
+        else:
+            univ_data= scrape_university_page(href, uni_id, uni_name, console_state)
+        if not univ_data:
+            log("   -> univ error => skip course.")
+            return 'univ_error'
+        if console_state['blob_store']:
+            pack_sections(console_state['blob_store'], univ_data)
+        save_university_data(univ_data)
+        export_row(console_state, 'universities', univ_data)
+        console_state['universities_scraped_set'].add(u_key)
+        console_state['university_index'][key_hash(u_key)] = (
+            univ_data.get('rank', ''), univ_data.get('university_logo', ''))
+        journal_university(JOURNAL_FILE, uni_id, uni_name,
+                           univ_data.get('rank', ''), univ_data.get('university_logo', ''))
+        cdata['university_rank']= univ_data.get('rank','')
+        cdata['university_logo']= univ_data.get('university_logo','')
+    else:
+        # fetch rank/logo from the index (CSV as fallback)
+        info = get_university_info(console_state, uni_id, uni_name)
+        cdata['university_rank']= info.get('rank','')
+        cdata['university_logo']= info.get('logo','')
+
+    # save course
+    save_course_data(cdata)
+    export_row(console_state, 'courses', cdata)
+    console_state['course_scraped_count'] += 1
+    console_state['courses_scraped_set'].add(c_key)
+    log(f"   -> Saved course ID={cdata['course_id']} => {cdata['title']} (total={console_state['course_scraped_count']})")
+    return 'saved'
+
+def link_test(href, console_state):
+    """GET a card's link before using it; returns the failure outcome, or None if it is fine."""
+    with timed('link_test'):
         try:
             r= requests.get(href, timeout=10)
             if r.status_code == 404:
                 log("   -> 404 => skip.")
-                continue
+                note_dead_link(console_state, href, status_code=404)
+                return 'dead'
             if r.status_code == 429:
-                log("   -> 429 => wait 120 & retry.")
-                time.sleep(120)
+                log(f"   -> 429 => wait {RATE_LIMIT_SLEEP} & retry.")
+                if not backoff_429(console_state):
+                    return 'link_error'
                 r= requests.get(href, timeout=10)
                 if r.status_code in [404,429]:
                     log("   -> still 404/429 => skip.")
-                    continue
+                    note_dead_link(console_state, href, status_code=r.status_code)
+                    return 'dead'
             r.raise_for_status()
         except Exception as e:
             log(f"   -> link test fail => {e}, skip course.")
-            continue
+            note_dead_link(console_state, href, exc=e)
+            return 'link_error'
+    return None
+
+def backoff_429(console_state):
+    """Sleep RATE_LIMIT_SLEEP after a 429 unless the run would have to stop meanwhile; True if it slept."""
+    if not console_state['run'].can_wait(RATE_LIMIT_SLEEP):
+        log("   -> no time left for the 429 back-off => skip, retried next run")
+        incr('backoff_skipped')
+        return False
+    with timed('sleep_429'):
+        time.sleep(RATE_LIMIT_SLEEP)
+    return True
 
-        # parse univ ID from URL
-        if '/university/' in href:
-            uni_id= href.split('/university/')[-1].strip()
-        else:
-            uni_id= href.strip()
-        uni_name= cdata['university_name'].strip()
+def take_prefetched(console_state, uni_id):
+    """Parsed page of a university the prefetcher already downloaded, else None."""
+    prefetcher = console_state['prefetch']
+    if prefetcher is None:
+        return None
+    data = prefetcher.take(uni_id)
+    incr('univ_prefetch', outcome='hit' if data else 'miss')
+    return data
 
-        # if new univ => scrape
-        u_key= (uni_id, uni_name)
-        if u_key not in console_state['universities_scraped_set']:
-            univ_data= scrape_university_page(href, uni_id, uni_name, console_state)
-            if not univ_data:
-                log("   -> univ error => skip course.")
-                continue
-            save_university_data(univ_data)
-            console_state['universities_scraped_set'].add(u_key)
-            cdata['university_rank']= univ_data.get('rank','')
-            cdata['university_logo']= univ_data.get('university_logo','')
-        else:
-            # fetch rank/logo from CSV
-            info= get_university_info_from_csv(uni_id, uni_name)
-            cdata['university_rank']= info.get('rank','')
-            cdata['university_logo']= info.get('logo','')
+def prefetched_university(data, university_id, university_name, console_state):
+    data['university_identifier'] = university_id.strip()
+    if university_name.strip():
+        data['university_name'] = university_name.strip()
+    console_state['uni_scraped_count'] += 1
+    log(f"[INFO] Univ prefetched => {data['university_name']} (count={console_state['uni_scraped_count']})")
+    return data
 
-        # save course
-        save_course_data(cdata)
-        console_state['course_scraped_count'] += 1
-        console_state['courses_scraped_set'].add(c_key)
-        log(f"   -> Saved course ID={cdata['course_id']} => {cdata['title']} (total={console_state['course_scraped_count']})")
+def start_prefetch(workers):
+    """Discover the university pages from the sitemaps and start downloading the unknown ones."""
+    fetcher = Fetcher(rate_limit_sleep=RATE_LIMIT_SLEEP)
+    urls = discover_university_urls(START_URL, fetcher.get, log)
+    known = known_university_ids(UNIVERSITY_CSV_FILE)
+    todo = [u for u in urls if university_id_from_href(u).strip('/') not in known]
+    prefetcher = UniversityPrefetcher(fetcher.get, parse_university_page, workers)
+    prefetcher.submit(todo)
+    log(f"[PREFETCH] {len(todo)} of {len(urls)} universities are new => prefetching with {workers} workers")
+    return prefetcher
+
+def university_id_from_href(href):
+    if '/university/' in href:
+        return href.split('/university/')[-1].strip()
+    return href.strip()
+
+def save_changed_course(href, cdata, console_state):
+    """Re-save a known course whose card content changed (incremental mode)."""
+    info = get_university_info(console_state, university_id_from_href(href or ''),
+                               cdata['university_name'].strip())
+    cdata['university_rank'] = info.get('rank', '')
+    cdata['university_logo'] = info.get('logo', '')
+    export_row(console_state, 'courses', cdata)
+    log(f"   -> Updated course ID={cdata['course_id']} => {cdata['title']}")
+
+@timed('csv_write', file='courses')
+def replace_changed_courses(rows):
+    """Write changed courses over their old rows in courses.csv (one rewrite of the file)."""
+    replace_csv_rows(COURSE_CSV_FILE, ('course_id', 'title', 'course_meta', 'course_year'), rows)
+
+def flush_changed_courses(console_state):
+    """
+    Write the changed courses buffered since the last checkpoint, then their
+    card hashes. The hashes go to disk only after the rows, so after a crash
+    the next --incremental run sees those courses as changed again.
+    """
+    pending = console_state['changed_courses']
+    if not pending:
+        return
+    replace_changed_courses([cdata for cdata, _ in pending.values()])
+    save_card_hashes(console_state['card_hashes'], {h: ch for h, (_, ch) in pending.items()})
+    log(f"[INFO] changed courses => {len(pending)} rows rewritten in {COURSE_CSV_FILE}")
+    pending.clear()
+
+def note_dead_link(console_state, href, status_code=None, exc=None):
+    """Remember a failing href in the negative cache, if its failure class is cacheable."""
+    status = failure_class(status_code, exc)
+    if status:
+        record_dead_link(console_state['dead_links'], href, status)
+        console_state['dead_link_new'][status] += 1
+
+def get_university_info(console_state, university_id, university_name):
+    """Rank/logo of a known university from the in-memory index, falling back to the CSV."""
+    hit = console_state['university_index'].get(key_hash((university_id, university_name)))
+    if hit:
+        return {'rank': hit[0], 'logo': hit[1]}
+    return get_university_info_from_csv(university_id, university_name)
 
 def get_university_info_from_csv(university_id, university_name):
     """
@@ -573,6 +826,24 @@ def click_page(driver, page_str):
         log(f"[ERROR] click page {page_str} => {ex}")
         return False
 
+def direct_click_page(driver, page_str):
+    """
+    Directly select a page number using the dropdown input.
+    This function locates the <select> element with class "siuk-pagination-dropdown",
+    clicks it to open, then finds and clicks the option with value equal to page_str.
+    """
+    try:
+        select_el = driver.find_element(By.CSS_SELECTOR, 'select.siuk-pagination-dropdown')
+        driver.execute_script("arguments[0].click();", select_el)
+        time.sleep(1)  # wait for the dropdown to open
+        option_el = select_el.find_element(By.CSS_SELECTOR, f'option[value="{page_str}"]')
+        option_el.click()
+        log(f"[PAGE] Direct dropdown click => {page_str}")
+        return True
+    except Exception as ex:
+        log(f"[ERROR] direct click page {page_str} => {ex}")
+        return False
+
 def reload_and_click_category(driver, category):
     """
     Reload the entire page, wait, then click the category ID=category
@@ -624,44 +895,54 @@ def try_go_to_page(driver, category, year, page_idx):
     sp= str(page_idx)
     for attempt in range(1,5):
         log(f"[ATTEMPT] page={sp}, attempt={attempt}")
-        if attempt==1:
-            ok= click_page(driver, sp)
-            if ok:
-                wait_for_courses_load(driver)
-                return True
-        elif attempt==2:
-            r1= reload_and_click_category(driver, category)
-            if r1:
-                ok2= click_page(driver, sp)
-                if ok2:
+        with timed('goto_page_attempt', attempt=attempt):
+            if attempt==1:
+                ok= click_page(driver, sp)
+                if ok:
                     wait_for_courses_load(driver)
                     return True
-        elif attempt==3:
-            st= go_to_page_by_stepping(driver, category, year, page_idx)
-            if st:
-                return True
-        else:
-            st2= go_to_page_by_stepping(driver, category, year, page_idx)
-            if st2:
-                return True
+            elif attempt==2:
+                r1= reload_and_click_category(driver, category)
+                if r1:
+                    ok2= click_page(driver, sp)
+                    if ok2:
+                        wait_for_courses_load(driver)
+                        return True
+            elif attempt==3:
+                st= go_to_page_by_stepping(driver, category, year, page_idx)
+                if st:
+                    return True
+            else:
+                st2= go_to_page_by_stepping(driver, category, year, page_idx)
+                if st2:
+                    return True
 
+    incr('goto_page_failed')
     log(f"[FAIL] page={sp} => after 4 attempts, skip it.")
     return False
 
-def scrape_category_pages(driver, category, console_state, year):
+def scrape_category_pages(browser, category, console_state, year):
     """
     For the given category & year, find max pages,
     do page=1 => parse => mark done => then pages 2..max => parse => etc.
     """
+    driver = browser.driver
     wait_for_page_loaded(driver)
     max_page= get_max_page_number(driver)
     log(f"[{category}][{year}] max_page => {max_page}")
+    note_max_page(console_state, year, category, max_page)
 
     # first page
-    if (year, category, '1') not in console_state['pages_done_set']:
-        parse_and_scrape_courses(driver, category, console_state)
-        save_page_done(year, category, '1')
-        console_state['pages_done_set'].add((year, category, '1'))
+    unchanged_run = 0
+    if page_wanted(console_state, year, category, '1'):
+        with page_trace('page', year=year, category=category, page=1):
+            new, changed, fp = parse_and_scrape_courses(driver, category, console_state)
+            if fp is None:
+                return
+            mark_page_done(console_state, year, category, '1', new)
+            unchanged = note_page_fingerprint(console_state, (year, category, '1'), fp, new, changed)
+            unchanged_run = unchanged_run + 1 if unchanged else 0
+        browser.page_done()
     else:
         log(f"[{category}][{year}] page=1 => in DB => skip parse")
 
@@ -670,19 +951,34 @@ def scrape_category_pages(driver, category, console_state, year):
 
     for p_idx in range(2, max_page+1):
         sp= str(p_idx)
-        if (year, category, sp) in console_state['pages_done_set']:
+        if console_state['run'].stopping():
+            log(f"[STOP] {category}/{year} => stop before page {sp}")
+            return
+        if console_state['incremental'] and unchanged_run >= console_state['incremental_stop_after']:
+            log(f"[INCREMENTAL] {category}/{year} => {unchanged_run} unchanged pages in a row, stop before page {sp}")
+            incr('incremental_early_stop')
+            return
+        if not page_wanted(console_state, year, category, sp):
             log(f"[{category}][{year}] page={sp} => in DB => skip parse")
             continue
 
-        got_page= try_go_to_page(driver, category, year, p_idx)
-        if not got_page:
-            log(f"[SKIP] page={sp} after repeated fails.")
-            continue
+        with page_trace('page', year=year, category=category, page=p_idx):
+            driver = browser.driver
+            with browser.watch(f'go to page {sp}', timeout=WATCHDOG_NAV_TIMEOUT):
+                got_page = try_go_to_page(driver, category, year, p_idx)
+            if not got_page:
+                log(f"[SKIP] page={sp} after repeated fails.")
+                continue
+            browser.mark_position(year, category, p_idx)
 
-        if (year, category, sp) not in console_state['pages_done_set']:
-            parse_and_scrape_courses(driver, category, console_state)
-            save_page_done(year, category, sp)
-            console_state['pages_done_set'].add((year, category, sp))
+            if page_wanted(console_state, year, category, sp):
+                new, changed, fp = parse_and_scrape_courses(driver, category, console_state)
+                if fp is None:
+                    return
+                mark_page_done(console_state, year, category, sp, new)
+                unchanged = note_page_fingerprint(console_state, (year, category, sp), fp, new, changed)
+                unchanged_run = unchanged_run + 1 if unchanged else 0
+                browser.page_done()
 
 # ----------------------------------------------------------------
 # YEAR SELECTION
@@ -732,81 +1028,563 @@ def select_year(driver, year_val):
             log(f"[ERROR] still can't => {e2}")
             return False
 
-# ----------------------------------------------------------------
-# MAIN
-# ----------------------------------------------------------------
-
-def main():
-    start_time= time.strftime("%Y-%m-%d %H:%M:%S")
-    with open(LOG_FILE,'a', encoding='utf-8') as f:
-        f.write(f"\n\n=== Scraping started at {start_time} ===\n")
-
-    prepare_csv_files()
-
-    unis  = load_scraped_universities()
-    crses = load_scraped_courses()
-    pages = load_scraped_pages()
-
-    console_state= {
-        'universities_scraped_set': unis,
-        'courses_scraped_set': crses,
-        'pages_done_set': pages,
-        'uni_scraped_count': len(unis),
-        'course_scraped_count': len(crses)
-    }
-
-    opts= Options()
-    opts.headless= False
+def new_driver(tabs=1):
+    opts = Options()
+    opts.headless = False
     opts.add_argument("--start-maximized")
-
-    driver= webdriver.Chrome(options=opts)
-    driver.get("https://india.studyin-uk.com/find-courses/")
+    if tabs > 1:
+        # the tabs we are not looking at must keep loading at full speed
+        for flag in BACKGROUND_TAB_FLAGS:
+            opts.add_argument(flag)
+    return webdriver.Chrome(options=opts)
+
+def open_start_page(driver):
+    driver.get(START_URL)
     wait_for_page_loaded(driver, max_wait=60)
 
-    # Gather year options from the site e.g. ['2025','2026']
-    all_years = get_available_years(driver)
-    log(f"[INFO] Found year options => {all_years}")
+def click_category(driver, category):
+    cat_el = driver.find_element(By.ID, category)
+    driver.execute_script("arguments[0].click();", cat_el)
+    wait_for_courses_load(driver)
 
+def restore_position(driver, year, category, page):
+    """Bring a freshly started browser back to the year / category / page we were on."""
+    open_start_page(driver)
+    if year and not select_year(driver, year):
+        return
+    if category:
+        click_category(driver, category)
+        if page and int(page) > 1:
+            try_go_to_page(driver, category, year, int(page))
+
+def recover_browser(browser, year, error):
+    """After a failed category: reload if the browser still answers, else restart it."""
+    browser.mark_position(year, None, None)
+    if not isinstance(error, TimeoutError) and browser.healthy():
+        log("[INFO] browser alive => reload & retry..")
+        try:
+            with browser.watch('reload', timeout=WATCHDOG_NAV_TIMEOUT):
+                browser.driver.refresh()
+                wait_for_page_loaded(browser.driver)
+            return
+        except Exception as e:
+            error = e
+    kind = 'watchdog' if isinstance(error, TimeoutError) else 'crash'
+    browser.restart(f"{kind}: {error}")
+
+def scrape_category(browser, category, console_state, year):
+    """Click the category, then walk its pages (page 1 is the one the click shows)."""
+    browser.mark_position(year, category, 1)
+    with browser.watch(f'click category {category}', timeout=WATCHDOG_NAV_TIMEOUT):
+        click_category(browser.driver, category)
+    log(f"[INFO] clicked category => {category}, year={year}")
+    scrape_category_pages(browser, category, console_state, year)
+
+def scrape_all_years(browser, console_state, years):
+    """The full crawl: every year, every category, every page in order."""
     # We will do each year in order, each category in order
-    for year_val in all_years:
-        # attempt to set that year in the drop-down
-        ok= select_year(driver, year_val)
+    for year_val in years:
+        if console_state['run'].stopping():
+            return
+        browser.mark_position(year_val, None, None)
+        try:
+            with browser.watch(f'select year {year_val}', timeout=WATCHDOG_NAV_TIMEOUT):
+                ok = select_year(browser.driver, year_val)
+        except Exception as e:
+            # restart() restores the marked position, i.e. selects this year again
+            browser.restart(f"watchdog: select year => {e}")
+            ok = True
         if not ok:
             log(f"[WARN] cannot set year => {year_val}, skipping it.")
             continue
 
-        # Now for each category
         for cat in CATEGORIES:
+            if console_state['run'].stopping():
+                return
             log(f"=== Category={cat}, Year={year_val} ===")
+            for attempt in range(1, CATEGORY_ATTEMPTS + 1):
+                try:
+                    with profile_phase('category'):
+                        scrape_category(browser, cat, console_state, year_val)
+                    break
+                except Exception as e:
+                    log(f"[ERROR] cat={cat}, year={year_val}, attempt={attempt}, e={e}")
+                    if attempt == CATEGORY_ATTEMPTS:
+                        log(f"[ERROR] skip cat={cat}, year={year_val}")
+                        break
+                    recover_browser(browser, year_val, e)
+
+# ----------------------------------------------------------------
+# NOVELTY SCHEDULER
+# ----------------------------------------------------------------
+
+def goto_scheduled_page(driver, shown, year, category, page):
+    """Navigate from the (year, category) currently shown to a page; returns the new (year, category)."""
+    if shown[0] != year:
+        if not select_year(driver, year):
+            raise RuntimeError(f"cannot set year {year}")
+        shown = (year, None)
+    if shown[1] != category or page == 1:
+        click_category(driver, category)
+    if page > 1 and not try_go_to_page(driver, category, year, page):
+        raise RuntimeError(f"cannot reach page {page}")
+    return (year, category)
+
+def scrape_scheduled(browser, console_state, budget_s=0):
+    """
+    Re-crawl the planned pages, highest expected novelty first (page_stats.csv),
+    until every page was visited or the time budget is used up.
+    """
+    plan_keys = plan_pages(console_state['plan'], CATEGORIES)
+    order = rank_pages(console_state['page_stats'], plan_keys)
+    deadline = time.time() + budget_s if budget_s else None
+    console_state['progress'] = Progress(len(order), 0)
+    log(f"[SCHEDULE] {len(order)} pages ranked, budget={'%ds' % budget_s if budget_s else 'none'}")
+
+    shown = (None, None)
+    found = 0
+    for year, category, page in order:
+        if deadline and time.time() >= deadline:
+            log(f"[SCHEDULE] time budget used => stop with {console_state['progress'].format()}")
+            break
+        if console_state['run'].stopping():
+            break
+        with page_trace('page', year=year, category=category, page=int(page)):
+            browser.mark_position(year, None, None)
             try:
-                cat_el= driver.find_element(By.ID, cat)
-                driver.execute_script("arguments[0].click();", cat_el)
-                log(f"[INFO] clicked category => {cat}, year={year_val}")
-                wait_for_courses_load(driver)
-
-                # parse first page, do pagination
-                parse_and_scrape_courses(driver, cat, console_state)
-                scrape_category_pages(driver, cat, console_state, year_val)
+                with browser.watch(f'go to {year}/{category}/{page}', timeout=WATCHDOG_NAV_TIMEOUT):
+                    shown = goto_scheduled_page(browser.driver, shown, year, category, int(page))
             except Exception as e:
-                log(f"[ERROR] cat={cat}, year={year_val}, e={e}, reload & retry..")
-                driver.refresh()
-                wait_for_page_loaded(driver)
+                log(f"[SCHEDULE] {year}/{category}/{page} => {e}, skip")
+                recover_browser(browser, year, e)
+                shown = (year, None)
+                continue
+            browser.mark_position(year, category, int(page))
+            new, changed, fp = parse_and_scrape_courses(browser.driver, category, console_state)
+            if fp is None:
+                break
+            mark_page_done(console_state, year, category, page, new)
+            note_page_fingerprint(console_state, (year, category, page), fp, new, changed)
+            found += new
+        browser.page_done()
+    log(f"[SCHEDULE] done => {found} new courses, {console_state['progress'].format()}")
+
+# ----------------------------------------------------------------
+# MULTI-TAB CRAWL (--tabs N, see tabs.py)
+# ----------------------------------------------------------------
+
+def start_tab_page(driver, tab, page):
+    """Start loading a page of the tab's lane; only page 1 (category click) may need a year switch first."""
+    year, category = tab.lane
+    if page == 1:
+        if tab.year != year:
+            if not select_year(driver, year):
+                raise RuntimeError(f"cannot set year {year}")
+            tab.year = year
+        start_loading(driver, tab, 1)
+        cat_el = driver.find_element(By.ID, category)
+        driver.execute_script("arguments[0].click();", cat_el)
+        return
+    start_loading(driver, tab, page)
+    sp = str(page)
+    if click_page(driver, sp) or direct_click_page(driver, sp):
+        return
+    # page not reachable with a click: step there, waiting (rare)
+    if not go_to_page_by_stepping(driver, category, year, page):
+        raise RuntimeError(f"cannot reach page {page}")
+
+def lane_has_work(console_state, year, category):
+    """False if the plan knows the lane and none of its pages is wanted."""
+    plan = console_state.get('plan')
+    known = plan['max_pages'].get(year, {}).get(category) if plan else None
+    return not known or any(page_wanted(console_state, year, category, str(p)) for p in range(1, known + 1))
+
+def advance_tab(driver, console_state, tab, lanes):
+    """Start the tab's next page: the next wanted page of its lane, else the first page of a new lane."""
+    driver.switch_to.window(tab.handle)
+    while True:
+        if tab.lane is None:
+            tab.lane = take_lane(lanes, tab.year)
+            if tab.lane is None:
+                tab.done = True
+                return
+            tab.pages, tab.page, tab.unchanged_run, tab.failures = None, None, 0, 0
+            if not lane_has_work(console_state, *tab.lane):
+                log(f"[TABS] {tab.lane[1]}/{tab.lane[0]} => every page done, skip")
+                tab.lane = None
+                continue
+            log(f"=== Category={tab.lane[1]}, Year={tab.lane[0]} (tab {tab.handle[-6:]}) ===")
+        if tab.page is None or tab.pages is None:
+            start_tab_page(driver, tab, 1)
+            return
+        if console_state['incremental'] and tab.unchanged_run >= console_state['incremental_stop_after']:
+            log(f"[INCREMENTAL] {tab.lane[1]}/{tab.lane[0]} => {tab.unchanged_run} unchanged pages in a row, stop")
+            incr('incremental_early_stop')
+            tab.pages.clear()
+        if tab.pages:
+            start_tab_page(driver, tab, int(tab.pages[0]))
+            return
+        tab.lane = None
+
+def parse_tab_page(driver, console_state, tab):
+    """The tab's page has arrived: read the lane's page count on its first load, parse the page if wanted."""
+    year, category = tab.lane
+    if tab.pages is None:
+        max_page = get_max_page_number(driver)
+        log(f"[{category}][{year}] max_page => {max_page}")
+        note_max_page(console_state, year, category, max_page)
+        tab.pages = deque(str(p) for p in range(1, max_page + 1) if page_wanted(console_state, year, category, str(p)))
+    sp = str(tab.page)
+    if not tab.pages or tab.pages[0] != sp:
+        return False
+    with page_trace('page', year=year, category=category, page=tab.page):
+        new, changed, fp = parse_and_scrape_courses(driver, category, console_state)
+        if fp is None:
+            return False
+        mark_page_done(console_state, year, category, sp, new)
+        unchanged = note_page_fingerprint(console_state, (year, category, sp), fp, new, changed)
+    tab.unchanged_run = tab.unchanged_run + 1 if unchanged else 0
+    tab.pages.popleft()
+    tab.parsed += 1
+    return True
+
+def reopen_tabs(browser, tabs):
+    """After a browser restart: new windows for all tabs, each reopens its lane."""
+    with browser.watch('reopen tabs', timeout=WATCHDOG_NAV_TIMEOUT):
+        handles = open_tab_handles(browser.driver, len(tabs), open_start_page)
+    for tab, handle in zip(tabs, handles):
+        tab.reset(handle)
+    return browser.driver
+
+def fail_tab(tab, error):
+    """The tab's current step failed: it reopens its lane, which is skipped after CATEGORY_ATTEMPTS failures."""
+    log(f"[ERROR] tab {tab.lane} page={tab.page} => {error}")
+    tab.loading_since = None
+    tab.page = tab.year = None
+    if tab.lane is not None:
+        tab.failures += 1
+        if tab.failures >= CATEGORY_ATTEMPTS:
+            log(f"[ERROR] skip cat={tab.lane[1]}, year={tab.lane[0]}")
+            tab.lane = None
+
+def recover_tabs_browser(browser, tabs, error):
+    """Driver to go on with: the same one if the browser still answers, else a restarted one with the tabs reopened."""
+    if not isinstance(error, TimeoutError) and browser.healthy():
+        return browser.driver
+    kind = 'watchdog' if isinstance(error, TimeoutError) else 'crash'
+    browser.restart(f"{kind}: {error}")
+    return reopen_tabs(browser, tabs)
+
+def recover_tab(browser, tabs, tab, error):
+    """A tab step failed: reopen its lane (or skip it after CATEGORY_ATTEMPTS), restart the browser if it is gone."""
+    fail_tab(tab, error)
+    return recover_tabs_browser(browser, tabs, error)
+
+def recover_wait(browser, tabs, error):
+    """Polling the tabs failed; which tab broke is unknown, so every loading tab counts a failure and reopens its lane."""
+    for tab in tabs:
+        if tab.loading_since is not None:
+            fail_tab(tab, error)
+    return recover_tabs_browser(browser, tabs, error)
+
+def scrape_tabs(browser, console_state, years, count):
+    """The full crawl with `count` tabs, each walking its own (year, category) lane."""
+    lanes = deque((year, cat) for year in years for cat in CATEGORIES)
+    # a restart reopens the tabs itself; the supervisor only needs to bring back the start page
+    browser.mark_position(None, None, None)
+    with browser.watch('open tabs', timeout=WATCHDOG_NAV_TIMEOUT):
+        tabs = [Tab(h) for h in open_tab_handles(browser.driver, count, open_start_page)]
+    log(f"[TABS] {count} tabs, {len(lanes)} lanes")
+    driver = browser.driver
+    start = 0
+    while not console_state['run'].stopping():
+        for tab in tabs:
+            if tab.loading_since is None and not tab.done:
                 try:
-                    cat_el2= driver.find_element(By.ID, cat)
-                    driver.execute_script("arguments[0].click();", cat_el2)
-                    wait_for_courses_load(driver)
-                    parse_and_scrape_courses(driver, cat, console_state)
-                    scrape_category_pages(driver, cat, console_state, year_val)
-                except Exception as e2:
-                    log(f"[ERROR] skip cat={cat}, year={year_val} => {e2}")
+                    with browser.watch('tab next page', timeout=WATCHDOG_NAV_TIMEOUT):
+                        advance_tab(driver, console_state, tab, lanes)
+                except Exception as e:
+                    driver = recover_tab(browser, tabs, tab, e)
+        try:
+            with timed('tabs_wait'), browser.watch('tabs wait', timeout=WATCHDOG_NAV_TIMEOUT):
+                tab, timed_out = next_ready(driver, tabs, TAB_PAGE_WAIT, start)
+        except Exception as e:
+            driver = recover_wait(browser, tabs, e)
+            continue
+        if tab is None:
+            break
+        start = (tabs.index(tab) + 1) % len(tabs)
+        if timed_out:
+            # the DOM may still show the previous page: load this one again rather than record it
+            driver = recover_tab(browser, tabs, tab, RuntimeError(f"page still loading after {TAB_PAGE_WAIT}s"))
+            continue
+        try:
+            parsed = parse_tab_page(driver, console_state, tab)
+        except Exception as e:
+            driver = recover_tab(browser, tabs, tab, e)
+            continue
+        if parsed:
+            browser.page_done()
+            if browser.driver is not driver:
+                driver = reopen_tabs(browser, tabs)
+    log(f"[TABS] done => pages per tab {[t.parsed for t in tabs]}, {len(lanes)} lanes not started")
 
-    driver.quit()
+# ----------------------------------------------------------------
+# CRAWL PLAN
+# ----------------------------------------------------------------
+
+def plan_year(browser, plan, year):
+    """Click through the categories of one year and record each max page."""
+    with browser.watch(f'plan select year {year}', timeout=WATCHDOG_NAV_TIMEOUT):
+        if not select_year(browser.driver, year):
+            log(f"[WARN] plan => cannot set year {year}")
+            return
+    for cat in CATEGORIES:
+        try:
+            with browser.watch(f'plan {year}/{cat}', timeout=WATCHDOG_NAV_TIMEOUT):
+                click_category(browser.driver, cat)
+                set_max_page(plan, year, cat, get_max_page_number(browser.driver))
+        except Exception as e:
+            # left out of the plan => picked up when the crawl reaches it
+            log(f"[WARN] plan {year}/{cat} => {e}")
+            recover_browser(browser, year, e)
+    log(f"[PLAN] {year} => {plan['max_pages'].get(year, {})}")
+
+def load_or_build_plan(browser, years, replan=False, run=None):
+    """Cached crawl plan if it is fresh and has the same years, else discover it."""
+    plan = None if replan else load_plan(PLAN_FILE, START_URL)
+    if plan and plan['years'] == years:
+        log(f"[PLAN] using cached plan from {time.strftime('%Y-%m-%d %H:%M', time.localtime(plan['created']))}")
+        return plan
+    t0 = time.time()
+    plan = new_plan(START_URL, years)
+    for year in years:
+        if run and run.stopping():
+            log("[PLAN] stopped before the plan was complete => not cached")
+            return plan
+        browser.mark_position(year, None, None)
+        try:
+            plan_year(browser, plan, year)
+        except Exception as e:
+            log(f"[WARN] plan year={year} => {e}")
+            recover_browser(browser, year, e)
+    save_plan(PLAN_FILE, plan)
+    log(f"[PLAN] built in {time.time() - t0:.0f}s => {total_pages(plan)} pages")
+    return plan
+
+def note_max_page(console_state, year, category, max_page):
+    """Keep the plan and progress total in line with the max page seen while crawling."""
+    plan = console_state.get('plan')
+    if plan is None or plan['max_pages'].get(year, {}).get(category) == max_page:
+        return
+    delta = set_max_page(plan, year, category, max_page)
+    console_state['progress'].add_total(delta)
+    save_plan(PLAN_FILE, plan)
+    log(f"[PLAN] {year}/{category} max_page => {max_page} ({delta:+d} pages)")
+
+# ----------------------------------------------------------------
+# MAIN
+# ----------------------------------------------------------------
 
-    end_time= time.strftime("%Y-%m-%d %H:%M:%S")
-    log("[INFO] Done scraping.")
-    log(f"[INFO] final => unis={console_state['uni_scraped_count']}, courses={console_state['course_scraped_count']}")
+def parse_args(argv=None):
+    p = argparse.ArgumentParser(description="Scrape courses and universities from studyin-uk.com")
+    p.add_argument('--start-url', default=START_URL,
+                   help="find-courses page to start from (e.g. the benchmark stand-in site)")
+    p.add_argument('--rate-limit-sleep', type=float, default=RATE_LIMIT_SLEEP,
+                   help="seconds to wait after a 429 before retrying")
+    p.add_argument('--replan', action='store_true',
+                   help=f"rediscover the crawl plan instead of using a fresh {PLAN_FILE}")
+    p.add_argument('--plan-only', action='store_true',
+                   help="discover the crawl plan, report the remaining pages and exit")
+    p.add_argument('--schedule', action='store_true',
+                   help="re-crawl planned pages in order of expected new courses (page_stats.csv)")
+    p.add_argument('--schedule-budget', type=float, default=0,
+                   help="with --schedule: stop after this many minutes (0 = no limit)")
+    p.add_argument('--incremental', action='store_true',
+                   help="revisit done pages, re-save changed cards, stop a category after unchanged pages")
+    p.add_argument('--stop-after', type=int, default=INCREMENTAL_STOP_AFTER,
+                   help="with --incremental: unchanged pages in a row before a category stops")
+    p.add_argument('--blob-sections', action='store_true',
+                   help="store university section HTML once per content in blobs/, refs in the CSV")
+    p.add_argument('--parquet', action='store_true',
+                   help="also write saved rows to typed Parquet files in parquet/<table>/ (needs pyarrow)")
+    p.add_argument('--parser', choices=sorted(PARSER_BACKENDS), default=DEFAULT_PARSER,
+                   help="HTML parser for university pages (see university_page.py)")
+    p.add_argument('--tabs', type=int, default=1,
+                   help="crawl the listings in N tabs of the one Chrome, one (year, category) per tab")
+    p.add_argument('--prefetch-universities', action='store_true',
+                   help="find university pages in the sitemaps and download them in parallel with the crawl")
+    p.add_argument('--prefetch-workers', type=int, default=PREFETCH_WORKERS)
+    p.add_argument('--mirror-logos', action='store_true',
+                   help=f"after the crawl, download the university logos into {LOGO_DIR}/ (see logo_mirror.py)")
+    p.add_argument('--logo-workers', type=int, default=LOGO_WORKERS)
+    p.add_argument('--time-budget', type=float, default=0,
+                   help="minutes this run may take; new pages stop --shutdown-reserve seconds before the end")
+    p.add_argument('--deadline', default='',
+                   help="local HH:MM by which the run must have shut down (the next such time)")
+    p.add_argument('--shutdown-reserve', type=float, default=SHUTDOWN_RESERVE,
+                   help="seconds kept before the deadline for the last page, checkpoint and driver quit")
+    p.add_argument('--no-delta', action='store_true',
+                   help="skip the added/removed/changed delta file at the end of the run")
+    p.add_argument('--profile', default='',
+                   help="comma list of cpu,mem,rss: cProfile / tracemalloc per phase, RSS sampling")
+    p.add_argument('--profile-phases', default=','.join(DEFAULT_PHASES),
+                   help=f"phases to profile, of {','.join(PHASES)} (default: {','.join(DEFAULT_PHASES)}; "
+                        "with category on, cProfile only covers category)")
+    p.add_argument('--profile-dir', default=PROFILE_DIR)
+    p.add_argument('--rss-interval', type=float, default=RSS_SAMPLE_INTERVAL,
+                   help="seconds between RSS samples with --profile rss")
+    args = p.parse_args(argv)
+    args.profile = {m for m in args.profile.split(',') if m}
+    args.profile_phases = {ph for ph in args.profile_phases.split(',') if ph}
+    bad = (args.profile - {'cpu', 'mem', 'rss'}) | (args.profile_phases - set(PHASES))
+    if bad:
+        p.error(f"unknown profile mode/phase: {', '.join(sorted(bad))}")
+    if args.parquet and not have_pyarrow():
+        p.error("--parquet needs pyarrow (pip install pyarrow)")
+    if not have_parser(args.parser):
+        p.error(f"--parser {args.parser} needs {PARSER_BACKENDS[args.parser].needs}")
+    if args.deadline and not re.fullmatch(r'([01]?\d|2[0-3]):[0-5]\d', args.deadline):
+        p.error("--deadline must be HH:MM")
+    if args.tabs < 1:
+        p.error("--tabs must be at least 1")
+    if args.tabs > 1 and args.schedule:
+        p.error("--tabs works on the full crawl, not with --schedule")
+    return args
+
+def main(argv=None, sinks=(), run=None):
+    """
+    Run the crawl. `sinks` get every saved course / university row as
+    sink.write(table, row) (see sinks.py); `run` replaces the RunControl
+    built from the time budget options (scraper_api.Scraper passes both).
+    """
+    args = parse_args(argv)
+    set_parser(args.parser)
+    if run is None:
+        run = RunControl(deadline_from(args.time_budget, args.deadline), args.shutdown_reserve, log)
+        run.install_signals()
+    run.start_phase('startup')
+    global START_URL, RATE_LIMIT_SLEEP
+    START_URL, RATE_LIMIT_SLEEP = args.start_url, args.rate_limit_sleep
+    start_time= time.strftime("%Y-%m-%d %H:%M:%S")
     with open(LOG_FILE,'a', encoding='utf-8') as f:
-        f.write(f"=== Scraping ended at {end_time} ===\n")
+        f.write(f"\n\n=== Scraping started at {start_time} ===\n")
+
+    prepare_csv_files()
+
+    console_state = CrawlState(**load_crawl_state())
+    console_state.update({
+        'dead_links': load_dead_links(),
+        'dead_link_hits': Counter(),
+        'dead_link_new': Counter(),
+        'page_stats': load_page_stats(),
+        'card_hashes': load_card_hashes(),
+        'changed_courses': {},
+        'page_fingerprints': load_page_fingerprints(),
+        'seen_courses': KeySet(),
+        'seen_universities': set(),
+        'incremental': args.incremental,
+        'blob_store': BlobStore() if args.blob_sections else None,
+        'parquet': {t: ParquetSink(t) for t in ('courses', 'universities')} if args.parquet else None,
+        'incremental_stop_after': args.stop_after,
+        'prefetch': None,
+        'run': run,
+        'sinks': list(sinks)
+    })
+    replay_card_journal(console_state)
+
+    # sinks, Parquet files, prefetcher, blob store and browser are closed however the run ends
+    browser = None
+    try:
+        if args.prefetch_universities:
+            console_state['prefetch'] = start_prefetch(args.prefetch_workers)
+        if TRACE_FILE:
+            configure_tracing(TRACE_FILE, TRACE_SAMPLE_RATE, TRACE_KEEP_OVER_S)
+        if args.profile:
+            configure_profiling(args.profile, args.profile_phases, args.profile_dir)
+            log(f"[INFO] profiling {sorted(args.profile)} on {sorted(args.profile_phases)} => {args.profile_dir}/")
+        if METRICS_PORT:
+            serve_metrics(METRICS_PORT)
+            log(f"[INFO] metrics => http://127.0.0.1:{METRICS_PORT}/metrics")
+
+        browser = BrowserSupervisor(lambda: new_driver(args.tabs), restore_position, log,
+                                    watchdog_timeout=WATCHDOG_TIMEOUT,
+                                    recycle_pages=RECYCLE_EVERY_PAGES,
+                                    recycle_rss_mb=RECYCLE_RSS_MB,
+                                    restore_timeout=WATCHDOG_NAV_TIMEOUT)
+        console_state['browser'] = browser
+        browser.start()
+        start_rss_sampler(args.rss_interval, browser.rss_mb, lambda: {
+            'courses': len(console_state['courses_scraped_set']),
+            'universities': len(console_state['universities_scraped_set']),
+            'pages': len(console_state['pages_done_set']),
+        })
+        with browser.watch('start page', timeout=WATCHDOG_NAV_TIMEOUT):
+            open_start_page(browser.driver)
+
+        # Gather year options from the site e.g. ['2025','2026']
+        all_years = get_available_years(browser.driver)
+        log(f"[INFO] Found year options => {all_years}")
+
+        # Plan the whole crawl first so progress / ETA can be reported
+        run.start_phase('plan')
+        plan = load_or_build_plan(browser, all_years, args.replan, run)
+        todo = remaining_pages(plan, CATEGORIES, console_state['pages_done_set'])
+        total = total_pages(plan)
+        console_state['plan'] = plan
+        console_state['progress'] = Progress(total, 0 if args.incremental else total - len(todo))
+        log(f"[PLAN] {len(todo)} of {total} pages left => {console_state['progress'].format()}")
+        if args.plan_only:
+            browser.quit()
+            log(f"[TIME] {run.finish()}")
+            return
+
+        run.start_phase('crawl')
+        if args.schedule:
+            scrape_scheduled(browser, console_state, args.schedule_budget * 60)
+        elif args.tabs > 1:
+            scrape_tabs(browser, console_state, all_years, args.tabs)
+        else:
+            scrape_all_years(browser, console_state, all_years)
+
+        run.start_phase('shutdown')
+        log(f"[INFO] browser => {browser.stats()}")
+        browser.quit()
+
+        end_time= time.strftime("%Y-%m-%d %H:%M:%S")
+        log("[INFO] Done scraping.")
+        write_checkpoint(console_state)
+        close_outputs(console_state)
+        if run.reason:
+            log("[STOP] run stopped early => delta skipped, the next full run's delta covers these rows")
+        elif not args.no_delta:
+            write_delta(console_state)
+        if args.mirror_logos and not run.stopping():
+            try:
+                with timed('logo_mirror'):
+                    mirror_logos(logo_urls(UNIVERSITY_CSV_FILE), workers=args.logo_workers,
+                                 rate_limit_sleep=RATE_LIMIT_SLEEP, log=log, stop=run.stopping)
+            except Exception as e:
+                log(f"[WARN] logo mirror failed => {e}")
+        write_prometheus(METRICS_PROM_FILE)
+        write_summary(METRICS_JSON_FILE)
+        for st in summary()['stages'][:8]:
+            log(f"[METRICS] {st['stage']}: n={st['count']} total={st['total_s']}s p50={st['p50_s']}s p99={st['p99_s']}s")
+        if TRACE_FILE:
+            log(f"[INFO] traces => {tracing_stats()} in {TRACE_FILE}")
+        if args.profile:
+            log(f"[INFO] profiles => {', '.join(finish_profiling())}")
+        log(f"[TIME] {run.finish()}")
+        log(f"[PROGRESS] {console_state['progress'].format()}")
+        log(f"[INFO] final => unis={console_state['uni_scraped_count']}, courses={console_state['course_scraped_count']}")
+        log(f"[INFO] dead links => skipped={dict(console_state['dead_link_hits'])}, "
+            f"new={dict(console_state['dead_link_new'])}, cached={len(console_state['dead_links'])}")
+        with open(LOG_FILE,'a', encoding='utf-8') as f:
+            f.write(f"=== Scraping ended at {end_time} ===\n")
+    finally:
+        if browser is not None:
+            browser.quit()
+        close_outputs(console_state)
 
 if __name__=='__main__':
     main()
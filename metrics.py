@@ -0,0 +1,194 @@
+import os
+import json
+import time
+import threading
+from bisect import bisect_left
+from contextlib import ContextDecorator
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import tracing
+
+# ----------------------------------------------------------------
+# STAGE TIMINGS / COUNTERS
+# ----------------------------------------------------------------
+#
+# A tiny in-process registry: counters and latency histograms keyed by
+# (name, labels). Exposed as a Prometheus text file, an optional local
+# HTTP endpoint (/metrics and /metrics.json) and a JSON summary.
+#
+#     with timed('link_test'):             # or @timed('wait_page_loaded')
+#         ...
+#     incr('card_outcome', outcome='saved')
+
+BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+PREFIX = 'siuk_'
+
+_lock = threading.Lock()
+_counters = {}
+_histograms = {}
+_started = time.time()
+
+
+def _key(name, labels):
+    return name, tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+class _Histogram:
+    __slots__ = ('counts', 'count', 'sum', 'max')
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, v):
+        self.counts[bisect_left(BUCKETS, v)] += 1
+        self.count += 1
+        self.sum += v
+        if v > self.max:
+            self.max = v
+
+    def quantile(self, q):
+        """Bucket upper bound below which a fraction q of observations fall."""
+        if not self.count:
+            return 0.0
+        target = q * self.count
+        seen = 0
+        for i, c in enumerate(self.counts):
+            seen += c
+            if seen >= target:
+                return min(BUCKETS[i], self.max) if i < len(BUCKETS) else self.max
+        return self.max
+
+
+def incr(name, n=1, **labels):
+    k = _key(name, labels)
+    with _lock:
+        _counters[k] = _counters.get(k, 0) + n
+
+
+def observe(name, seconds, **labels):
+    k = _key(name, labels)
+    with _lock:
+        h = _histograms.get(k)
+        if h is None:
+            h = _histograms[k] = _Histogram()
+        h.observe(seconds)
+
+
+class timed(ContextDecorator):
+    """
+    Time a block or function into histogram `name`; failures also count in
+    `<name>_errors`. Inside a page trace it also records a span.
+    """
+
+    def __init__(self, name, **labels):
+        self.name = name
+        self.labels = labels
+
+    def __enter__(self):
+        self._span = tracing.begin_span(self.name, self.labels)
+        self._t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        observe(self.name, time.perf_counter() - self._t0, **self.labels)
+        tracing.end_span(self._span, error=exc)
+        if exc_type is not None:
+            incr(self.name + '_errors', **self.labels)
+        return False
+
+
+# ---------------- exporters ----------------
+
+def _fmt_labels(labels, extra=None):
+    items = list(labels) + (list(extra) if extra else [])
+    if not items:
+        return ''
+    return '{' + ','.join(f'{k}="{v}"' for k, v in items) + '}'
+
+
+def prometheus_text():
+    lines = []
+    with _lock:
+        counters = dict(_counters)
+        hists = {k: (list(h.counts), h.count, h.sum) for k, h in _histograms.items()}
+    for name in sorted({k[0] for k in counters}):
+        lines.append(f'# TYPE {PREFIX}{name}_total counter')
+        for (n, labels), v in sorted(counters.items()):
+            if n == name:
+                lines.append(f'{PREFIX}{name}_total{_fmt_labels(labels)} {v}')
+    for name in sorted({k[0] for k in hists}):
+        lines.append(f'# TYPE {PREFIX}{name}_seconds histogram')
+        for (n, labels), (counts, count, total) in sorted(hists.items()):
+            if n != name:
+                continue
+            cum = 0
+            for bound, c in zip(list(BUCKETS) + ['+Inf'], counts):
+                cum += c
+                lines.append(f'{PREFIX}{name}_seconds_bucket{_fmt_labels(labels, [("le", bound)])} {cum}')
+            lines.append(f'{PREFIX}{name}_seconds_sum{_fmt_labels(labels)} {total:.6f}')
+            lines.append(f'{PREFIX}{name}_seconds_count{_fmt_labels(labels)} {count}')
+    lines.append(f'{PREFIX}uptime_seconds {time.time() - _started:.0f}')
+    return "\n".join(lines) + "\n"
+
+
+def summary():
+    """Per-stage totals, sorted by where the time went."""
+    with _lock:
+        stages = []
+        for (name, labels), h in _histograms.items():
+            stages.append({
+                'stage': name + _fmt_labels(labels),
+                'count': h.count,
+                'total_s': round(h.sum, 3),
+                'mean_s': round(h.sum / h.count, 4) if h.count else 0,
+                'p50_s': h.quantile(0.5),
+                'p90_s': h.quantile(0.9),
+                'p99_s': h.quantile(0.99),
+                'max_s': round(h.max, 3),
+            })
+        counters = {name + _fmt_labels(labels): v for (name, labels), v in sorted(_counters.items())}
+    stages.sort(key=lambda s: -s['total_s'])
+    return {'wall_s': round(time.time() - _started, 1), 'stages': stages, 'counters': counters}
+
+
+def write_prometheus(path):
+    tmp = path + '.tmp'
+    with open(tmp, 'w', encoding='utf-8') as f:
+        f.write(prometheus_text())
+    os.replace(tmp, path)
+
+
+def write_summary(path):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(summary(), f, indent=2)
+
+
+class _Handler(BaseHTTPRequestHandler):
+
+    def do_GET(self):
+        if self.path.startswith('/metrics.json'):
+            body, ctype = json.dumps(summary(), indent=2), 'application/json'
+        elif self.path.startswith('/metrics'):
+            body, ctype = prometheus_text(), 'text/plain; version=0.0.4'
+        else:
+            self.send_error(404)
+            return
+        data = body.encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', ctype)
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+def serve_metrics(port, host='127.0.0.1'):
+    """Serve /metrics (Prometheus) and /metrics.json from a daemon thread."""
+    server = ThreadingHTTPServer((host, port), _Handler)
+    threading.Thread(target=server.serve_forever, name='metrics-http', daemon=True).start()
+    return server
@@ -0,0 +1,186 @@
+"""
+Typed columns from the scraped free text, computed column-wise over batches of rows.
+
+    python normalize.py courses courses.csv courses_typed.csv
+    python normalize.py universities universities.csv universities_typed.csv
+"""
+import os
+import re
+import csv
+import sys
+import argparse
+
+# ----------------------------------------------------------------
+# BATCH NORMALIZATION
+# ----------------------------------------------------------------
+#
+# normalize_batch(table, rows) returns new columns for a whole batch:
+#   courses:      study_mode, intake_month, intake_year, rank_num
+#   universities: rank_num, established_year, fee_min, fee_max, fee_currency
+# Work is done per column over the distinct values only: a crawl batch has
+# a handful of different intakes / metas / fee strings, so each regex runs
+# once per distinct value instead of once per row.
+
+BATCH_ROWS = 50000
+
+MONTHS = {m: i for i, m in enumerate(
+    ['jan', 'feb', 'mar', 'apr', 'may', 'jun', 'jul', 'aug', 'sep', 'oct', 'nov', 'dec'], 1)}
+CURRENCIES = {'£': 'GBP', '$': 'USD', '€': 'EUR', '₹': 'INR',
+              'gbp': 'GBP', 'usd': 'USD', 'eur': 'EUR', 'inr': 'INR', 'rs': 'INR'}
+STUDY_MODES = {'full time': 'full_time', 'full-time': 'full_time', 'fulltime': 'full_time',
+               'part time': 'part_time', 'part-time': 'part_time', 'parttime': 'part_time',
+               'online': 'online', 'distance learning': 'online', 'blended': 'blended'}
+
+_INT = re.compile(r'\d+')
+_THOUSANDS = re.compile(r'(?<=\d),(?=\d{3}\b)')
+_INTAKE = re.compile(r'([A-Za-z]{3,9})\.?\s*(\d{4})?')
+_YEAR = re.compile(r'\b(1[0-9]{3}|20[0-9]{2})\b')
+# an amount is a number with a currency in front of it ('£ 1,200', 'Rs. 5'), a
+# currency code after it ('14,500 GBP') or a unit ('15k', '5 lakh'); other
+# numbers ('for 2 years', '(Year 1)', '12 months') are not fees
+_FEE_NUM = re.compile(r'(£|\$|€|₹|\b(?:gbp|usd|eur|inr|rs)\b\.?)?\s*(\d[\d,]*(?:\.\d+)?)'
+                      r'(?:\s*(k\b|lakhs?\b|lacs?\b))?(\s*\b(?:gbp|usd|eur|inr)\b)?', re.I)
+# '£15,000 - 25,000', '£15k to 20k': the upper end of a range is an amount too
+_FEE_RANGE = re.compile(r'\s*(?:-|\u2013|to)\s*$', re.I)
+# academic years in fee strings ('2025/26', '2025-2026', '(2025)'), not amounts
+_FEE_YEAR = re.compile(r'\b(?:19|20)\d{2}\s*[/\u2013-]\s*(?:\d{4}|\d{2})\b|\(\s*(?:19|20)\d{2}\s*\)')
+_CURRENCY = re.compile(r'£|\$|€|₹|\b(?:gbp|usd|eur|inr|rs)\b', re.I)
+
+COURSE_TYPED = ['study_mode', 'intake_month', 'intake_year', 'rank_num']
+UNIVERSITY_TYPED = ['rank_num', 'established_year', 'fee_min', 'fee_max', 'fee_currency']
+
+_MISSING = object()
+
+
+def map_unique(values, fn):
+    """[fn(v) for v in values], evaluating fn once per distinct value."""
+    cache = {}
+    out = []
+    for v in values:
+        r = cache.get(v, _MISSING)
+        if r is _MISSING:
+            r = cache[v] = fn(v)
+        out.append(r)
+    return out
+
+
+def parse_int(v):
+    """First integer in a cell ('12', '#12', '12-15' => 12, '1,001-1,200' => 1001), None if there is none."""
+    m = _INT.search(_THOUSANDS.sub('', v or ''))
+    return int(m.group()) if m else None
+
+
+def parse_year(v):
+    m = _YEAR.search(_THOUSANDS.sub('', v or ''))
+    return int(m.group()) if m else None
+
+
+def parse_intake(v):
+    """'Sep 2025' => (9, 2025); unknown parts are None."""
+    m = _INTAKE.search(v or '')
+    if not m:
+        return None, None
+    return MONTHS.get(m.group(1)[:3].lower()), int(m.group(2)) if m.group(2) else None
+
+
+def parse_study_mode(meta):
+    """'Postgraduate | Full Time' => 'full_time' ('' if the meta has no mode part)."""
+    parts = (meta or '').split('|')[1:]
+    if not parts:
+        return ''
+    mode = parts[0].strip().lower()
+    return STUDY_MODES.get(mode, re.sub(r'\W+', '_', mode).strip('_'))
+
+
+def parse_fee(v):
+    """'£15,000 - £25,000 per year' => (15000.0, 25000.0, 'GBP'); '£9,250 (2025/26)' => 9250.0."""
+    v = v or ''
+    text = _FEE_YEAR.sub(' ', v)
+    nums = []
+    last_end = None
+    for m in _FEE_NUM.finditer(text):
+        symbol, num, unit, code = m.groups()
+        in_range = last_end is not None and _FEE_RANGE.match(text[last_end:m.start()])
+        if not (symbol or unit or code or in_range):
+            continue
+        x = float(num.replace(',', ''))
+        unit = (unit or '').lower()
+        if unit == 'k':
+            x *= 1000
+        elif unit.startswith('la'):
+            x *= 100000
+        nums.append(x)
+        last_end = m.end()
+    m = _CURRENCY.search(v)
+    currency = CURRENCIES.get(m.group().lower(), '') if m else ''
+    if not nums:
+        return None, None, currency
+    return min(nums), max(nums), currency
+
+
+def normalize_batch(table, rows):
+    """{typed column: [value per row]} for a batch of CSV row dicts."""
+    col = lambda name: [r.get(name, '') for r in rows]
+    if table == 'courses':
+        intakes = map_unique(col('intake'), parse_intake)
+        return {
+            'study_mode': map_unique(col('course_meta'), parse_study_mode),
+            'intake_month': [m for m, _ in intakes],
+            'intake_year': [y for _, y in intakes],
+            'rank_num': map_unique(col('university_rank'), parse_int),
+        }
+    if table == 'universities':
+        fees = map_unique(col('fees'), parse_fee)
+        return {
+            'rank_num': map_unique(col('rank'), parse_int),
+            'established_year': map_unique(col('established'), parse_year),
+            'fee_min': [f[0] for f in fees],
+            'fee_max': [f[1] for f in fees],
+            'fee_currency': [f[2] for f in fees],
+        }
+    raise ValueError(f"unknown table {table!r}")
+
+
+def normalize_rows(table, rows):
+    """Add the typed columns to each row dict of the batch, in place."""
+    for name, values in normalize_batch(table, rows).items():
+        for r, v in zip(rows, values):
+            r[name] = v
+    return rows
+
+
+def normalize_csv(table, src, dst, batch_rows=BATCH_ROWS):
+    """Copy a CSV adding the typed columns, one batch at a time; returns row count."""
+    csv.field_size_limit(min(sys.maxsize, 2**31 - 1))
+    extra = COURSE_TYPED if table == 'courses' else UNIVERSITY_TYPED
+    n = 0
+    with open(src, 'r', encoding='utf-8', newline='') as fi, \
+            open(dst + '.tmp', 'w', encoding='utf-8', newline='') as fo:
+        rd = csv.DictReader(fi)
+        w = csv.DictWriter(fo, fieldnames=list(rd.fieldnames) + [c for c in extra if c not in rd.fieldnames])
+        w.writeheader()
+        batch = []
+        for row in rd:
+            batch.append(row)
+            if len(batch) >= batch_rows:
+                w.writerows(normalize_rows(table, batch))
+                n += len(batch)
+                batch = []
+        if batch:
+            w.writerows(normalize_rows(table, batch))
+            n += len(batch)
+    os.replace(dst + '.tmp', dst)
+    return n
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument('table', choices=['courses', 'universities'])
+    ap.add_argument('src')
+    ap.add_argument('dst')
+    args = ap.parse_args()
+    print(f"{args.table}: {normalize_csv(args.table, args.src, args.dst)} rows => {args.dst}")
+
+
+if __name__ == '__main__':
+    main()
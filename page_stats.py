@@ -0,0 +1,79 @@
+import os
+import csv
+import time
+
+# ----------------------------------------------------------------
+# PER-PAGE YIELD STATISTICS / NOVELTY RANKING
+# ----------------------------------------------------------------
+#
+# page_stats.csv keeps, for every (year, category, page) ever parsed, how
+# many new courses its visits produced. The scheduler ranks pages by the
+# expected number of new courses on the next visit:
+#   - never-visited pages first,
+#   - then by an EWMA of new courses per visit (recent visits weigh most),
+#   - plus a small bonus per day since the last visit, so pages that have
+#     gone quiet are still re-checked eventually.
+
+PAGE_STATS_FILE = 'page_stats.csv'
+YIELD_ALPHA = 0.5
+EXPLORE_PER_DAY = 0.1
+
+_FIELDS = ['year', 'category', 'page', 'visits', 'new_total', 'last_new', 'ewma_new', 'last_visit']
+
+
+def load_page_stats(path=PAGE_STATS_FILE):
+    """{(year, category, page): {'visits', 'new_total', 'last_new', 'ewma_new', 'last_visit'}}"""
+    stats = {}
+    if not os.path.exists(path):
+        return stats
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        for row in csv.DictReader(f):
+            try:
+                stats[(row['year'], row['category'], row['page'])] = {
+                    'visits': int(row['visits']),
+                    'new_total': int(row['new_total']),
+                    'last_new': int(row['last_new']),
+                    'ewma_new': float(row['ewma_new']),
+                    'last_visit': float(row['last_visit']),
+                }
+            except (KeyError, ValueError):
+                continue
+    return stats
+
+
+def save_page_stats(stats, path=PAGE_STATS_FILE):
+    tmp = path + '.tmp'
+    with open(tmp, 'w', encoding='utf-8', newline='') as f:
+        w = csv.writer(f)
+        w.writerow(_FIELDS)
+        for (year, category, page), st in stats.items():
+            w.writerow([year, category, page, st['visits'], st['new_total'], st['last_new'],
+                        f"{st['ewma_new']:.3f}", f"{st['last_visit']:.0f}"])
+    os.replace(tmp, path)
+
+
+def record_visit(stats, key, new_courses, now=None):
+    st = stats.get(key)
+    if st is None:
+        st = stats[key] = {'visits': 0, 'new_total': 0, 'last_new': 0,
+                           'ewma_new': float(new_courses), 'last_visit': 0.0}
+    else:
+        st['ewma_new'] = YIELD_ALPHA * new_courses + (1 - YIELD_ALPHA) * st['ewma_new']
+    st['visits'] += 1
+    st['new_total'] += new_courses
+    st['last_new'] = new_courses
+    st['last_visit'] = now or time.time()
+
+
+def expected_new(stats, key, now=None):
+    st = stats.get(key)
+    if st is None:
+        return float('inf')
+    days = ((now or time.time()) - st['last_visit']) / 86400
+    return st['ewma_new'] + EXPLORE_PER_DAY * max(days, 0.0)
+
+
+def rank_pages(stats, keys, now=None):
+    """Keys sorted by expected novelty, highest first (ties keep their crawl order)."""
+    now = now or time.time()
+    return sorted(keys, key=lambda k: -expected_new(stats, k, now))
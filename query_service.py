@@ -0,0 +1,397 @@
+"""
+Read-only query service over the scraped CSVs.
+
+    python query_service.py --port 8787
+    curl 'http://127.0.0.1:8787/courses?category=Postgraduate&start_month=September&year=2026&rank_max=100'
+
+Endpoints (all GET, JSON):
+  /courses        university, category, year, start_month, degree (comma = any of),
+                  rank_min, rank_max, q (title substring), sort=rank, offset, limit
+  /universities   name (substring), rank_min, rank_max, offset, limit
+  limit=0 returns just the total.
+  /facets?field=category      row counts per value of an indexed course field
+  /stats
+"""
+import os
+import io
+import csv
+import sys
+import json
+import time
+import argparse
+import threading
+from array import array
+from bisect import bisect_left, bisect_right
+from urllib.parse import urlsplit, parse_qs
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from dedup_store import key_hash
+from logo_mirror import MANIFEST_FILE as LOGO_MANIFEST_FILE, local_logo_paths
+from normalize import normalize_rows, parse_int
+
+# ----------------------------------------------------------------
+# COLUMNAR TABLES + SECONDARY INDEXES
+# ----------------------------------------------------------------
+#
+# Courses are held column-wise: low-cardinality columns are dictionary
+# encoded (one array('I') of codes per column), ranks are an array('i').
+# Every indexed column keeps a posting list (array of row ids) per value,
+# and a rank-sorted row list answers rank ranges with bisect. A query walks
+# the smallest posting list and checks the other filters on the code arrays.
+#
+# Reload is incremental: the crawl appends to courses.csv, so each reload
+# parses the bytes after the last complete line it has seen. A changed
+# course (incremental mode) is written over its old row, which replaces the
+# file: a new inode means the table is rebuilt from the start. A later row
+# with the same course key still replaces the earlier one. universities.csv
+# is small next to it and is re-read whole when it changes, as is logos.csv
+# (logo_mirror.py): each university row gets the local file of its logo as
+# logo_path ('' when the logo is not mirrored).
+
+COURSE_CSV_FILE = 'courses.csv'
+UNIVERSITY_CSV_FILE = 'universities.csv'
+RELOAD_INTERVAL = 5
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 1000
+
+COURSE_KEY = ('course_id', 'title', 'course_meta', 'course_year')
+INTEGER_PARAMS = ('offset', 'limit', 'rank_min', 'rank_max')
+INDEXED = {'university': 'university_name', 'category': 'category', 'year': 'course_year',
+           'start_month': 'start_month', 'degree': 'degree'}
+UNIVERSITY_FIELDS = ['university_identifier', 'university_name', 'university_logo', 'rank', 'established',
+                     'famous_for', 'fees', 'location', 'website_url']
+NO_RANK = -1
+
+csv.field_size_limit(min(sys.maxsize, 2**31 - 1))
+
+
+class Column:
+    """Dictionary-encoded string column."""
+    __slots__ = ('values', 'lookup', 'codes')
+
+    def __init__(self):
+        self.values = []
+        self.lookup = {}
+        self.codes = array('I')
+
+    def append(self, v):
+        c = self.lookup.get(v)
+        if c is None:
+            c = self.lookup[v] = len(self.values)
+            self.values.append(v)
+        self.codes.append(c)
+        return c
+
+    def __getitem__(self, i):
+        return self.values[self.codes[i]]
+
+
+class CourseTable:
+
+    def __init__(self, path):
+        self.path = path
+        self.inode = None
+        self.offset = 0
+        self.header = None
+        self.plain = {}             # high-cardinality columns: plain lists
+        self.cols = {}              # dictionary-encoded columns
+        self.rank = array('i')
+        self.alive = bytearray()
+        self.key_rows = {}
+        self.postings = {f: [] for f in INDEXED.values()}
+        self._by_rank = None
+        self.n = 0
+
+    def _setup(self, header):
+        self.header = header
+        for c in header:
+            if c in ('course_id', 'title'):
+                self.plain[c] = []
+            else:
+                self.cols[c] = Column()
+
+    def _append(self, row):
+        i = self.n
+        for c, v in zip(self.header, row):
+            if c in self.plain:
+                self.plain[c].append(v)
+            else:
+                code = self.cols[c].append(v)
+                post = self.postings.get(c)
+                if post is not None:
+                    if code == len(post):
+                        post.append(array('I'))
+                    post[code].append(i)
+        rec = dict(zip(self.header, row))
+        r = parse_int(rec.get('university_rank', ''))
+        self.rank.append(NO_RANK if r is None else r)
+        self.alive.append(1)
+        h = key_hash(tuple(rec.get(c, '') for c in COURSE_KEY))
+        old = self.key_rows.get(h)
+        if old is not None:
+            self.alive[old] = 0
+        self.key_rows[h] = i
+        self.n += 1
+
+    def reload(self):
+        """Parse rows appended since the last reload; returns how many were added."""
+        if not os.path.exists(self.path):
+            return 0
+        st = os.stat(self.path)
+        if self.inode is not None and st.st_ino != self.inode:
+            self.__init__(self.path)
+        self.inode = st.st_ino
+        if st.st_size <= self.offset:
+            return 0
+        with open(self.path, 'rb') as f:
+            f.seek(self.offset)
+            data = f.read()
+        end = data.rfind(b'\n')
+        if end < 0:
+            return 0
+        chunk = data[:end + 1].decode('utf-8', errors='replace')
+        self.offset += end + 1
+        # newline='': only \r and \n end a row, not \u2028, \x1c or \x85 in a field
+        rd = csv.reader(io.StringIO(chunk, newline=''))
+        if self.header is None:
+            self._setup(next(rd))
+        before = self.n
+        for row in rd:
+            if len(row) == len(self.header):
+                self._append(row)
+        if self.n != before:
+            self._by_rank = None
+        return self.n - before
+
+    def row(self, i):
+        out = {c: self.plain[c][i] if c in self.plain else self.cols[c][i] for c in self.header}
+        out['rank_num'] = self.rank[i] if self.rank[i] != NO_RANK else None
+        return out
+
+    def _rank_index(self):
+        if self._by_rank is None:
+            order = sorted((r, i) for i, r in enumerate(self.rank) if r != NO_RANK)
+            self._by_rank = (array('i', [r for r, _ in order]), array('I', [i for _, i in order]))
+        return self._by_rank
+
+    def _posting(self, column, values):
+        col = self.cols[column]
+        post = self.postings[column]
+        lists = [post[col.lookup[v]] for v in values if v in col.lookup]
+        if len(lists) == 1:
+            return lists[0]
+        return sorted(i for lst in lists for i in lst)
+
+    def query(self, eq, rank_min=None, rank_max=None, q='', sort=None):
+        """Row ids matching all filters; eq is {column: [accepted values]}."""
+        if self.header is None:
+            return []
+        drivers = [(self._posting(c, vals), c) for c, vals in eq.items()]
+        if rank_min is not None or rank_max is not None:
+            ranks, ids = self._rank_index()
+            lo = bisect_left(ranks, rank_min) if rank_min is not None else 0
+            hi = bisect_right(ranks, rank_max) if rank_max is not None else len(ranks)
+            drivers.append((sorted(ids[lo:hi]), None))
+        if drivers:
+            driver, driver_col = min(drivers, key=lambda d: len(d[0]))
+        else:
+            driver, driver_col = range(self.n), None
+
+        checks = []
+        for c, vals in eq.items():
+            if c != driver_col:
+                col = self.cols[c]
+                checks.append((col.codes, {col.lookup[v] for v in vals if v in col.lookup}))
+        rmin = rank_min if rank_min is not None else -2**31
+        rmax = rank_max if rank_max is not None else 2**31 - 1
+        use_rank = rank_min is not None or rank_max is not None
+        q = q.lower()
+        titles = self.plain.get('title', [])
+
+        out = []
+        for i in driver:
+            if not self.alive[i]:
+                continue
+            if any(codes[i] not in ok for codes, ok in checks):
+                continue
+            if use_rank and not (self.rank[i] != NO_RANK and rmin <= self.rank[i] <= rmax):
+                continue
+            if q and q not in titles[i].lower():
+                continue
+            out.append(i)
+        if sort == 'rank':
+            out.sort(key=lambda i: (self.rank[i] == NO_RANK, self.rank[i]))
+        return out
+
+    def facets(self, column):
+        col = self.cols[column]
+        post = self.postings[column]
+        counts = {col.values[c]: sum(self.alive[i] for i in ids) for c, ids in enumerate(post)}
+        return dict(sorted(counts.items(), key=lambda kv: -kv[1]))
+
+
+def _file_stat(path):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_size, st.st_mtime_ns
+
+
+class UniversityTable:
+
+    def __init__(self, path, logos_path=LOGO_MANIFEST_FILE):
+        self.path = path
+        self.logos_path = logos_path
+        self.stat = None
+        self.rows = []
+
+    def reload(self):
+        if not os.path.exists(self.path):
+            return 0
+        stat = (_file_stat(self.path), _file_stat(self.logos_path))
+        if stat == self.stat:
+            return 0
+        logos = local_logo_paths(self.logos_path)
+        latest = {}
+        with open(self.path, 'r', encoding='utf-8', newline='') as f:
+            for row in csv.DictReader(f):
+                rec = {c: row.get(c, '') for c in UNIVERSITY_FIELDS}
+                rec['logo_path'] = logos.get(rec['university_logo'].strip(), '')
+                latest[(row['university_identifier'], row['university_name'])] = rec
+        self.rows = normalize_rows('universities', list(latest.values()))
+        self.stat = stat
+        return len(self.rows)
+
+    def query(self, name='', rank_min=None, rank_max=None):
+        name = name.lower()
+        out = []
+        for r in self.rows:
+            if name and name not in r['university_name'].lower():
+                continue
+            rank = r['rank_num']
+            if rank_min is not None and (rank is None or rank < rank_min):
+                continue
+            if rank_max is not None and (rank is None or rank > rank_max):
+                continue
+            out.append(r)
+        out.sort(key=lambda r: (r['rank_num'] is None, r['rank_num'] or 0))
+        return out
+
+
+# ----------------------------------------------------------------
+# SERVICE
+# ----------------------------------------------------------------
+
+class QueryService:
+
+    def __init__(self, courses_path=COURSE_CSV_FILE, universities_path=UNIVERSITY_CSV_FILE,
+                 logos_path=LOGO_MANIFEST_FILE):
+        self.courses = CourseTable(courses_path)
+        self.universities = UniversityTable(universities_path, logos_path)
+        self.lock = threading.RLock()
+        self.last_reload = None
+        self.reload()
+
+    def reload(self):
+        t0 = time.perf_counter()
+        with self.lock:
+            added = self.courses.reload()
+            unis = self.universities.reload()
+            self.last_reload = {'time': time.strftime("%Y-%m-%d %H:%M:%S"), 'courses_added': added,
+                                'universities_reloaded': unis, 'seconds': round(time.perf_counter() - t0, 3)}
+        return self.last_reload
+
+    def watch(self, interval=RELOAD_INTERVAL):
+        def loop():
+            while True:
+                time.sleep(interval)
+                self.reload()
+        threading.Thread(target=loop, name='query-reload', daemon=True).start()
+
+    def handle(self, path, params):
+        one = lambda k, d='': params.get(k, [d])[0]
+        nums = {}
+        for k in INTEGER_PARAMS:
+            if one(k).strip():
+                try:
+                    nums[k] = int(one(k))
+                except ValueError:
+                    return 400, {'error': f"{k} must be an integer"}
+        num = nums.get
+        offset = max(num('offset') or 0, 0)
+        limit = num('limit', DEFAULT_LIMIT)
+        if limit < 0:
+            return 400, {'error': "limit must be 0 or more"}
+        limit = min(limit, MAX_LIMIT)
+        t0 = time.perf_counter()
+        with self.lock:
+            if path == '/courses':
+                eq = {col: one(p).split(',') for p, col in INDEXED.items() if one(p)}
+                ids = self.courses.query(eq, num('rank_min'), num('rank_max'), one('q'), one('sort') or None)
+                results = [self.courses.row(i) for i in ids[offset:offset + limit]]
+                total = len(ids)
+            elif path == '/universities':
+                rows = self.universities.query(one('name'), num('rank_min'), num('rank_max'))
+                results, total = rows[offset:offset + limit], len(rows)
+            elif path == '/facets':
+                field = INDEXED.get(one('field'))
+                if field is None or self.courses.header is None:
+                    return 400, {'error': f"field must be one of {sorted(INDEXED)}"}
+                return 200, {'field': one('field'), 'counts': self.courses.facets(field)}
+            elif path == '/stats':
+                return 200, {'courses_rows': self.courses.n, 'courses_live': len(self.courses.key_rows),
+                             'universities': len(self.universities.rows), 'last_reload': self.last_reload}
+            else:
+                return 404, {'error': 'unknown endpoint'}
+        return 200, {'total': total, 'offset': offset, 'limit': limit,
+                     'took_ms': round((time.perf_counter() - t0) * 1000, 2), 'results': results}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    service = None
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        try:
+            status, body = self.service.handle(url.path.rstrip('/') or '/', parse_qs(url.query))
+        except Exception as e:
+            status, body = 500, {'error': repr(e)}
+        data = json.dumps(body, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+def serve(service, host='127.0.0.1', port=8787):
+    handler = type('Handler', (_Handler,), {'service': service})
+    return ThreadingHTTPServer((host, port), handler)
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument('--courses', default=COURSE_CSV_FILE)
+    ap.add_argument('--universities', default=UNIVERSITY_CSV_FILE)
+    ap.add_argument('--logos', default=LOGO_MANIFEST_FILE, help="logo_mirror.py manifest for logo_path")
+    ap.add_argument('--host', default='127.0.0.1')
+    ap.add_argument('--port', type=int, default=8787)
+    ap.add_argument('--reload-interval', type=float, default=RELOAD_INTERVAL)
+    args = ap.parse_args()
+    service = QueryService(args.courses, args.universities, args.logos)
+    print(f"loaded => {service.last_reload}", file=sys.stderr)
+    service.watch(args.reload_interval)
+    server = serve(service, args.host, args.port)
+    print(f"query service on http://{args.host}:{args.port}/courses", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
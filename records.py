@@ -0,0 +1,157 @@
+from operator import attrgetter
+
+# ----------------------------------------------------------------
+# SLOTTED RECORDS
+# ----------------------------------------------------------------
+#
+# CourseRecord / UniversityRecord hold one CSV row in __slots__ instead of a
+# per-row dict: about a third of the dict's size (benchmarks/bench_records.py), and the field set is
+# fixed (a misspelt column raises instead of adding a key). They keep the
+# mapping interface the crawl code uses on its row dicts (rec['title'],
+# rec.get(...), dict(rec)), so they can be passed wherever a row dict was.
+# row() is the CSV row: a tuple of the same str objects, in column order,
+# without building an intermediate dict or copying any value.
+#
+# CrawlState is console_state with slots: one attribute per key the crawl
+# uses, same ['key'] / get / update access.
+
+COURSE_FIELDS = ('course_id', 'title', 'university_name', 'intake', 'degree', 'course_meta', 'category',
+                 'course_year', 'start_month', 'is_featured', 'location', 'university_rank', 'university_logo')
+UNIVERSITY_FIELDS = ('university_identifier', 'university_name', 'university_logo', 'rank', 'established',
+                     'famous_for', 'fees', 'location', 'website_url', 'overview_html', 'services_html',
+                     'rankings_html', 'fees_html', 'scholarships_html', 'accommodation_html', 'faqs_html')
+
+
+class Record:
+    __slots__ = ()
+    FIELDS = ()
+
+    def __init_subclass__(cls, **kw):
+        super().__init_subclass__(**kw)
+        cls._row = attrgetter(*cls.FIELDS)
+
+    def __init__(self, *values, **fields):
+        for name, v in zip(self.FIELDS, values):
+            setattr(self, name, v)
+        for name in self.FIELDS[len(values):]:
+            setattr(self, name, fields.pop(name, ''))
+        if fields:
+            raise TypeError(f"unknown {type(self).__name__} fields: {', '.join(sorted(fields))}")
+
+    @classmethod
+    def from_mapping(cls, m):
+        """From a row dict (missing columns => '', extra keys ignored)."""
+        rec = cls.__new__(cls)
+        get = m.get
+        for name in cls.FIELDS:
+            setattr(rec, name, get(name, ''))
+        return rec
+
+    @classmethod
+    def from_row(cls, values):
+        """From a CSV row in column order (csv.reader output)."""
+        return cls(*values)
+
+    def row(self):
+        return self._row(self)
+
+    # mapping interface, as on the row dicts
+    def __getitem__(self, name):
+        try:
+            return getattr(self, name)
+        except AttributeError:
+            raise KeyError(name) from None
+
+    def __setitem__(self, name, value):
+        if name not in self.FIELDS:
+            raise KeyError(name)
+        setattr(self, name, value)
+
+    def get(self, name, default=None):
+        return getattr(self, name, default) if name in self.FIELDS else default
+
+    def keys(self):
+        return self.FIELDS
+
+    def items(self):
+        return zip(self.FIELDS, self.row())
+
+    def __iter__(self):
+        return iter(self.FIELDS)
+
+    def __len__(self):
+        return len(self.FIELDS)
+
+    def __contains__(self, name):
+        return name in self.FIELDS
+
+    def __eq__(self, other):
+        if isinstance(other, Record):
+            return type(self) is type(other) and self.row() == other.row()
+        return NotImplemented
+
+    def __repr__(self):
+        return f"{type(self).__name__}({', '.join(f'{k}={v!r:.40}' for k, v in self.items())})"
+
+
+class CourseRecord(Record):
+    __slots__ = COURSE_FIELDS
+    FIELDS = COURSE_FIELDS
+
+
+class UniversityRecord(Record):
+    __slots__ = UNIVERSITY_FIELDS
+    FIELDS = UNIVERSITY_FIELDS
+
+
+RECORD_TYPES = {'courses': CourseRecord, 'universities': UniversityRecord}
+
+
+def to_record(table, row):
+    return RECORD_TYPES[table].from_mapping(row)
+
+
+class CrawlState:
+    """console_state: the crawl's shared state, one slot per key."""
+
+    __slots__ = (
+        # dedup stores / indexes (checkpointed)
+        'universities_scraped_set', 'courses_scraped_set', 'pages_done_set', 'university_index',
+        'uni_scraped_count', 'course_scraped_count',
+        # negative link cache
+        'dead_links', 'dead_link_hits', 'dead_link_new',
+        # journal / checkpoint bookkeeping
+        'journal_cards', 'pages_since_checkpoint',
+        # plan, scheduler, incremental mode
+        'plan', 'progress', 'page_stats', 'card_hashes', 'page_fingerprints', 'incremental',
+        'incremental_stop_after', 'changed_courses',
+        # listing keys seen this run (run delta)
+        'seen_courses', 'seen_universities',
+        # outputs and helpers
+        'browser', 'blob_store', 'parquet', 'prefetch', 'run', 'sinks',
+    )
+
+    def __init__(self, **state):
+        self.update(state)
+
+    def __getitem__(self, name):
+        try:
+            return getattr(self, name)
+        except AttributeError:
+            raise KeyError(name) from None
+
+    def __setitem__(self, name, value):
+        setattr(self, name, value)
+
+    def __contains__(self, name):
+        return hasattr(self, name)
+
+    def get(self, name, default=None):
+        return getattr(self, name, default)
+
+    def update(self, state=(), **kw):
+        for name, value in dict(state, **kw).items():
+            setattr(self, name, value)
+
+    def keys(self):
+        return [k for k in self.__slots__ if hasattr(self, k)]
@@ -0,0 +1,225 @@
+"""
+Re-scrape the known universities over plain HTTP (no Selenium, no Chrome).
+
+    python refresh_universities.py                     # every university in universities.csv
+    python refresh_universities.py --workers 16 --only uni-a,uni-b
+    python refresh_universities.py --list              # just show what would be fetched
+    python refresh_universities.py --parser lxml --save-pages pages/
+
+Each university in universities.csv is fetched again from <site>/university/<id>,
+parsed with the same code as the crawl, and its row is replaced in place.
+Fetch failures keep the old row. --save-pages DIR also keeps every fetched
+page as DIR/university/<id>.html: a corpus for benchmarks/parser_diff.py,
+and the layout benchmarks/standin_site.py --recorded serves.
+"""
+import os
+import csv
+import sys
+import time
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from urllib.parse import urljoin, urlsplit
+
+from blobstore import BLOB_REF_PREFIX, SECTION_COLUMNS, BlobStore, pack_sections
+
+# ----------------------------------------------------------------
+# UNIVERSITY REFRESH
+# ----------------------------------------------------------------
+#
+# Only what a mode needs is imported: --list reads the CSV and nothing else,
+# a refresh pulls in requests + the HTML parser (via university_page) when it
+# starts, and Selenium is never imported. Pages are fetched by a thread pool
+# with one requests.Session per thread; parsing and the CSV rewrite stay as
+# in the crawl.
+#
+# universities.csv is rewritten through a .tmp file. Rows a running crawl
+# appended after the refresh started are copied over before the replace.
+
+UNIVERSITY_CSV_FILE = 'universities.csv'
+START_URL = "https://india.studyin-uk.com/find-courses/"
+RATE_LIMIT_SLEEP = 120
+FETCH_TIMEOUT = 30
+FETCH_ATTEMPTS = 3
+WORKERS = 8
+
+csv.field_size_limit(min(sys.maxsize, 2**31 - 1))
+
+
+def university_url(start_url, university_id):
+    """Page of a stored identifier (the crawl stores the part after /university/)."""
+    if university_id.startswith(('http://', 'https://')):
+        return university_id
+    return urljoin(start_url, '/university/' + university_id)
+
+
+def read_universities(path=UNIVERSITY_CSV_FILE):
+    """(header, rows, byte size read) of universities.csv."""
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        rd = csv.DictReader(f)
+        rows = list(rd)
+        return rd.fieldnames, rows, f.tell()
+
+
+def distinct_universities(rows, only=None):
+    """Unique (university_identifier, university_name) keys, in file order."""
+    keys = {}
+    for row in rows:
+        key = (row['university_identifier'], row['university_name'])
+        if only and key[0] not in only:
+            continue
+        keys.setdefault(key, None)
+    return list(keys)
+
+
+class Fetcher:
+    """requests.Session per worker thread, with the crawl's 429 back-off."""
+
+    def __init__(self, timeout=FETCH_TIMEOUT, rate_limit_sleep=RATE_LIMIT_SLEEP):
+        import requests
+        self.requests = requests
+        self.timeout = timeout
+        self.rate_limit_sleep = rate_limit_sleep
+        self.local = threading.local()
+
+    def session(self):
+        s = getattr(self.local, 'session', None)
+        if s is None:
+            s = self.local.session = self.requests.Session()
+        return s
+
+    def get(self, url):
+        """Response text; raises on 404 / errors, retries 429 after a sleep."""
+        for attempt in range(1, FETCH_ATTEMPTS + 1):
+            r = self.session().get(url, timeout=self.timeout)
+            if r.status_code == 429 and attempt < FETCH_ATTEMPTS:
+                time.sleep(self.rate_limit_sleep)
+                continue
+            r.raise_for_status()
+            return r.text
+
+
+def saved_page_path(directory, url):
+    return os.path.join(directory, urlsplit(url).path.strip('/') + '.html')
+
+
+def refresh_one(fetcher, parse, start_url, key, save_pages=None):
+    """(key, new row or None, error or None) for one university."""
+    url = university_url(start_url, key[0])
+    try:
+        html = fetcher.get(url)
+    except Exception as e:
+        return key, None, e
+    if save_pages:
+        path = saved_page_path(save_pages, url)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(html)
+    return key, parse(html, key[0], key[1]), None
+
+
+def merge_row(old, new, store):
+    """Old row with the re-scraped fields; sections stay blob refs if they were."""
+    if store is not None and any(old.get(c, '').startswith(BLOB_REF_PREFIX) for c in SECTION_COLUMNS):
+        pack_sections(store, new)
+    row = dict(old)
+    for c in old:
+        if c in new and c not in ('university_identifier', 'university_name'):
+            row[c] = new[c]
+    return row
+
+
+def write_universities(path, header, rows, read_size):
+    """Atomically rewrite the CSV, keeping rows appended since it was read."""
+    tmp = path + '.tmp'
+    with open(tmp, 'w', encoding='utf-8', newline='') as f:
+        w = csv.DictWriter(f, fieldnames=header)
+        w.writeheader()
+        w.writerows(rows)
+    with open(path, 'rb') as fi, open(tmp, 'ab') as fo:
+        fi.seek(read_size)
+        fo.write(fi.read())
+    os.replace(tmp, path)
+
+
+def refresh(path=UNIVERSITY_CSV_FILE, start_url=START_URL, workers=WORKERS, only=None,
+            rate_limit_sleep=RATE_LIMIT_SLEEP, log=print, save_pages=None):
+    """Re-scrape the universities of `path` and rewrite it; returns a stats dict."""
+    from link_cache import failure_class, load_dead_links, record_dead_link
+    from university_page import parse_university_page
+
+    header, rows, read_size = read_universities(path)
+    keys = distinct_universities(rows, only)
+    fetcher = Fetcher(rate_limit_sleep=rate_limit_sleep)
+    dead_links = load_dead_links()
+    store = None
+    if any(r.get(c, '').startswith(BLOB_REF_PREFIX) for r in rows for c in SECTION_COLUMNS):
+        store = BlobStore()
+
+    stats = {'universities': len(keys), 'refreshed': 0, 'changed': 0, 'failed': 0}
+    fresh = {}
+    t0 = time.time()
+    log(f"[REFRESH] {len(keys)} universities, {workers} workers")
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(refresh_one, fetcher, parse_university_page, start_url, k, save_pages) for k in keys]
+        for fut in as_completed(futures):
+            key, data, err = fut.result()
+            if err is not None:
+                stats['failed'] += 1
+                log(f"[WARN] refresh {key[0]} => {err}")
+                status = failure_class(exc=err)
+                if status:
+                    record_dead_link(dead_links, university_url(start_url, key[0]), status)
+                continue
+            fresh[key] = data
+            stats['refreshed'] += 1
+            if stats['refreshed'] % 50 == 0:
+                log(f"[REFRESH] {stats['refreshed']}/{len(keys)} in {time.time() - t0:.0f}s")
+
+    out = []
+    for row in rows:
+        key = (row['university_identifier'], row['university_name'])
+        if key in fresh:
+            new = merge_row(row, fresh[key], store)
+            stats['changed'] += new != row
+            row = new
+        out.append(row)
+    write_universities(path, header, out, read_size)
+    if store is not None:
+        store.close()
+    stats['seconds'] = round(time.time() - t0, 1)
+    log(f"[REFRESH] done => {stats}")
+    return stats
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument('--csv', default=UNIVERSITY_CSV_FILE)
+    ap.add_argument('--start-url', default=START_URL,
+                    help="any page of the site; university pages are <site>/university/<id>")
+    ap.add_argument('--workers', type=int, default=WORKERS)
+    ap.add_argument('--only', default='', help="comma list of university identifiers to refresh")
+    ap.add_argument('--rate-limit-sleep', type=float, default=RATE_LIMIT_SLEEP)
+    ap.add_argument('--list', action='store_true', help="print the university URLs and exit")
+    ap.add_argument('--parser', default='html.parser', help="html.parser, bs4-lxml or lxml (see university_page.py)")
+    ap.add_argument('--save-pages', help="also write every fetched page to DIR/university/<id>.html")
+    args = ap.parse_args(argv)
+    only = {u for u in args.only.split(',') if u}
+
+    if args.list:
+        _, rows, _ = read_universities(args.csv)
+        for uid, name in distinct_universities(rows, only):
+            print(f"{university_url(args.start_url, uid)}\t{name}")
+        return
+    from university_page import PARSER_BACKENDS, log, set_parser
+    if args.parser not in PARSER_BACKENDS:
+        ap.error(f"--parser must be one of {', '.join(sorted(PARSER_BACKENDS))}")
+    try:
+        set_parser(args.parser)
+    except ValueError as e:
+        ap.error(str(e))
+    refresh(args.csv, args.start_url, args.workers, only, args.rate_limit_sleep, log=log, save_pages=args.save_pages)
+
+
+if __name__ == '__main__':
+    main()
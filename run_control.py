@@ -0,0 +1,106 @@
+import time
+import signal
+import datetime
+
+# ----------------------------------------------------------------
+# RUN CONTROL: TIME BUDGET, SIGTERM, PHASE TIMES
+# ----------------------------------------------------------------
+#
+# The crawl asks stopping() at every page / category / year boundary. It
+# turns True once SIGTERM arrived or the deadline minus SHUTDOWN_RESERVE is
+# reached; the page in progress is finished (its university fetches and CSV
+# writes included), then the run goes through its normal end: checkpoint,
+# Parquet close, driver quit. A second SIGTERM kills the process as usual.
+#
+# Inside a page, back-off sleeps (429) only happen if can_wait() says they
+# end before the stop time, and once out_of_time() (less than half the
+# reserve left) the page is abandoned between cards: it is not recorded as
+# done, the journal keeps its finished cards for the next run.
+#
+# start_phase() splits the wall time of the run into named phases
+# (startup, plan, crawl, shutdown) for the report at the end.
+
+SHUTDOWN_RESERVE = 180
+
+
+def deadline_from(time_budget_min=0, deadline_hhmm='', now=None):
+    """Epoch deadline from a budget in minutes and/or a local HH:MM (the next one), or None."""
+    now = now or time.time()
+    ends = []
+    if time_budget_min:
+        ends.append(now + time_budget_min * 60)
+    if deadline_hhmm:
+        hh, mm = (int(x) for x in deadline_hhmm.split(':'))
+        today = datetime.datetime.fromtimestamp(now)
+        end = today.replace(hour=hh, minute=mm, second=0, microsecond=0)
+        if end <= today:
+            end += datetime.timedelta(days=1)
+        ends.append(end.timestamp())
+    return min(ends) if ends else None
+
+
+class RunControl:
+
+    def __init__(self, deadline=None, reserve=SHUTDOWN_RESERVE, log=print):
+        self.deadline = deadline
+        self.reserve = reserve
+        self.log = log
+        self.reason = None
+        self._announced = False
+        self.phases = {}
+        self._phase = None
+        self._phase_t0 = None
+
+    def install_signals(self, signums=(signal.SIGTERM,)):
+        for s in signums:
+            signal.signal(s, self._on_signal)
+
+    def _on_signal(self, signum, frame):
+        # only set the flag here: logging from a signal handler can re-enter a write
+        self.reason = self.reason or f"signal {signal.Signals(signum).name}"
+        signal.signal(signum, signal.SIG_DFL)
+
+    def request_stop(self, reason):
+        self.reason = self.reason or reason
+
+    def remaining(self):
+        return None if self.deadline is None else self.deadline - time.time()
+
+    def can_wait(self, seconds):
+        """True if a back-off sleep of `seconds` still ends before the run has to stop."""
+        if self.reason is not None:
+            return False
+        return self.deadline is None or self.remaining() - seconds > self.reserve
+
+    def out_of_time(self):
+        """True once less than half the reserve is left: no more cards, the rest is for the shutdown."""
+        left = self.remaining()
+        return left is not None and left < self.reserve / 2
+
+    def stopping(self):
+        """True once the run should stop taking new pages."""
+        if self.reason is None and self.deadline is not None and self.remaining() <= self.reserve:
+            self.reason = 'time budget'
+        if self.reason and not self._announced:
+            self._announced = True
+            left = self.remaining()
+            self.log(f"[STOP] {self.reason} => finishing the current page, then shutting down"
+                     + (f" ({left:.0f}s to the deadline)" if left is not None else ""))
+        return self.reason is not None
+
+    def start_phase(self, name):
+        now = time.perf_counter()
+        if self._phase is not None:
+            self.phases[self._phase] = self.phases.get(self._phase, 0) + now - self._phase_t0
+        self._phase, self._phase_t0 = name, now
+
+    def finish(self):
+        """End the current phase; returns the report line."""
+        self.start_phase(None)
+        parts = [f"{name}={secs:.1f}s" for name, secs in self.phases.items()]
+        line = ' '.join(parts + [f"total={sum(self.phases.values()):.1f}s"])
+        if self.reason:
+            line += f" stopped_by='{self.reason}'"
+        if self.deadline is not None:
+            line += f" deadline_slack={self.remaining():.0f}s"
+        return line
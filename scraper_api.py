@@ -0,0 +1,126 @@
+"""
+Library entry point: run the crawl from your own code and stream its records.
+
+    from scraper_api import Scraper
+    from sinks import SqliteSink
+
+    scraper = Scraper(sinks=[SqliteSink('courses.db')], incremental=True)
+    for course in scraper.iter_courses():
+        ingest(course)
+"""
+import threading
+
+from run_control import SHUTDOWN_RESERVE, RunControl, deadline_from
+from sinks import QueueSink
+
+# ----------------------------------------------------------------
+# SCRAPER API
+# ----------------------------------------------------------------
+#
+# Scraper runs the normal crawl (main2.main, or main.main) in a worker
+# thread with a QueueSink added to its record sinks, and the iter_*()
+# generators read that queue, so records arrive as soon as the crawl saves
+# them. The crawl keeps its CSVs / checkpoint in the working directory
+# (they are its dedup and resume state); the sinks get the same rows
+# without reading them back from disk.
+#
+# Leaving a generator early (break, exception, close()) stops the crawl at
+# the next page boundary, the same way SIGTERM does, and waits for its
+# normal shutdown. The entry script is imported on start, so Selenium is
+# only loaded once a crawl is actually run.
+
+ENTRY_SCRIPTS = ('main2', 'main')
+
+
+def _argv(options):
+    """{'start_url': 'x', 'incremental': True} => ['--start-url', 'x', '--incremental']."""
+    argv = []
+    for name, value in options.items():
+        flag = '--' + name.replace('_', '-')
+        if value is True:
+            argv.append(flag)
+        elif value not in (None, False):
+            argv += [flag, str(value)]
+    return argv
+
+
+class Scraper:
+    """
+    One crawl run. `sinks` receive every record (see sinks.py); keyword
+    options are the command line options of the entry script, e.g.
+    Scraper(start_url=..., incremental=True, time_budget=30, parquet=True).
+    """
+
+    def __init__(self, sinks=(), entry='main2', queue_size=1000, **options):
+        if entry not in ENTRY_SCRIPTS:
+            raise ValueError(f"entry must be one of {ENTRY_SCRIPTS}")
+        self.sinks = list(sinks)
+        self.entry = entry
+        self.queue_size = queue_size
+        self.options = options
+        self.run = None
+        self.error = None
+        self._thread = None
+        self._queue = None
+        self._done = False
+
+    def _crawl(self, module):
+        try:
+            module.main(_argv(self.options), sinks=self.sinks + [self._queue], run=self.run)
+        except BaseException as e:
+            self.error = e
+        finally:
+            self._queue.close()
+
+    def start(self):
+        if self._thread is not None:
+            raise RuntimeError("a Scraper runs once; create a new one for another crawl")
+        module = __import__(self.entry)
+        self.run = RunControl(deadline_from(self.options.get('time_budget') or 0, self.options.get('deadline') or ''),
+                              self.options.get('shutdown_reserve') or SHUTDOWN_RESERVE, module.log)
+        self._queue = QueueSink(self.queue_size)
+        self._thread = threading.Thread(target=self._crawl, args=(module,), name='scraper', daemon=True)
+        self._thread.start()
+        return self
+
+    def records(self):
+        """(table, row) of every saved course and university, as they are saved."""
+        if self._thread is None:
+            self.start()
+        try:
+            while not self._done:
+                item = self._queue.queue.get()
+                if item is QueueSink.END:
+                    self._done = True
+                    break
+                yield item
+        finally:
+            if self._thread.is_alive():
+                self.close()
+        self._thread.join()
+        if self.error is not None and not (isinstance(self.error, SystemExit) and not self.error.code):
+            raise self.error
+
+    def iter_courses(self):
+        for table, row in self.records():
+            if table == 'courses':
+                yield row
+
+    def iter_universities(self):
+        for table, row in self.records():
+            if table == 'universities':
+                yield row
+
+    def run_to_sinks(self):
+        """Run the whole crawl, only feeding the sinks; returns when it is done."""
+        for _ in self.records():
+            pass
+
+    def close(self):
+        """Stop the crawl at the next page boundary and wait for its shutdown."""
+        if self._thread is None:
+            return
+        self._done = True
+        self.run.request_stop('scraper closed')
+        self._queue.abandon()
+        self._thread.join()
@@ -0,0 +1,163 @@
+import os
+import csv
+import json
+import queue
+import sqlite3
+import threading
+
+from records import COURSE_FIELDS, UNIVERSITY_FIELDS, Record
+
+# ----------------------------------------------------------------
+# RECORD SINKS
+# ----------------------------------------------------------------
+#
+# Every course / university row the crawl saves is also handed to the sinks
+# in console_state['sinks'] as sink.write(table, row), table being
+# 'courses' or 'universities' and row a CourseRecord / UniversityRecord
+# (records.py: slotted, but readable like the row dict). The same record
+# goes to every sink. close() is called once at the end of the run. The
+# crawl's own CSVs (which also hold its dedup / resume state) are written
+# either way.
+
+FIELDS = {'courses': COURSE_FIELDS, 'universities': UNIVERSITY_FIELDS}
+KEYS = {'courses': ('course_id', 'title', 'course_meta', 'course_year'),
+        'universities': ('university_identifier', 'university_name')}
+
+
+def row_values(table, row):
+    """Values in CSV column order: a record's row() as is, else looked up in the dict."""
+    if isinstance(row, Record):
+        return row.row()
+    return [row.get(c, '') for c in FIELDS[table]]
+
+
+class Sink:
+    """Base class: override write(); close() is optional."""
+
+    def write(self, table, row):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class CallbackSink(Sink):
+    """Calls fn(table, row) for every record, in the crawl thread."""
+
+    def __init__(self, fn, tables=('courses', 'universities')):
+        self.fn = fn
+        self.tables = set(tables)
+
+    def write(self, table, row):
+        if table in self.tables:
+            self.fn(table, row)
+
+
+class CsvSink(Sink):
+    """<directory>/<table>.csv with the crawl's column order, header written on creation."""
+
+    def __init__(self, directory):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.files = {}
+
+    def _writer(self, table):
+        hit = self.files.get(table)
+        if hit is None:
+            path = os.path.join(self.directory, f'{table}.csv')
+            new = not os.path.exists(path) or os.path.getsize(path) == 0
+            f = open(path, 'a', encoding='utf-8', newline='')
+            w = csv.writer(f)
+            if new:
+                w.writerow(FIELDS[table])
+            hit = self.files[table] = (f, w)
+        return hit[1]
+
+    def write(self, table, row):
+        self._writer(table).writerow(row_values(table, row))
+
+    def close(self):
+        for f, _ in self.files.values():
+            f.close()
+        self.files = {}
+
+
+class JsonlSink(Sink):
+    """One JSON object per line, {"table": ..., <columns>}, in a single file."""
+
+    def __init__(self, path):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.f = open(path, 'a', encoding='utf-8')
+
+    def write(self, table, row):
+        self.f.write(json.dumps(dict(row, table=table), ensure_ascii=False) + '\n')
+
+    def close(self):
+        self.f.close()
+
+
+class SqliteSink(Sink):
+    """
+    courses / universities tables (TEXT columns, primary key = the crawl's
+    dedup key, so a re-saved changed course replaces its row). Commits every
+    `commit_every` rows and on close.
+    """
+
+    def __init__(self, path, commit_every=500):
+        # the crawl may run in a worker thread (scraper_api.Scraper)
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.commit_every = commit_every
+        self.pending = 0
+        for table, fields in FIELDS.items():
+            cols = ', '.join(f'"{c}" TEXT' for c in fields)
+            key = ', '.join(f'"{c}"' for c in KEYS[table])
+            self.db.execute(f'CREATE TABLE IF NOT EXISTS {table} ({cols}, PRIMARY KEY ({key}))')
+        self.sql = {table: f'INSERT OR REPLACE INTO {table} VALUES ({", ".join("?" * len(fields))})'
+                    for table, fields in FIELDS.items()}
+
+    def write(self, table, row):
+        self.db.execute(self.sql[table], row_values(table, row))
+        self.pending += 1
+        if self.pending >= self.commit_every:
+            self.db.commit()
+            self.pending = 0
+
+    def close(self):
+        self.db.commit()
+        self.db.close()
+
+
+class QueueSink(Sink):
+    """
+    Bounded queue of (table, row) for a consumer in another thread; a full
+    queue blocks the crawl. close() puts the END marker (once). After abandon()
+    (the consumer went away) records are dropped instead of blocking.
+    """
+
+    END = object()
+
+    def __init__(self, maxsize=1000):
+        self.queue = queue.Queue(maxsize)
+        self.abandoned = threading.Event()
+        self.closed = False
+
+    def write(self, table, row):
+        while not self.abandoned.is_set():
+            try:
+                self.queue.put((table, row), timeout=0.5)
+                return
+            except queue.Full:
+                continue
+
+    def close(self):
+        if not self.closed and not self.abandoned.is_set():
+            self.closed = True
+            self.queue.put(self.END)
+
+    def abandon(self):
+        self.abandoned.set()
+        while True:
+            try:
+                self.queue.get_nowait()
+            except queue.Empty:
+                return
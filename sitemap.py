@@ -0,0 +1,185 @@
+"""
+University discovery from the site's sitemaps, plus a parallel page prefetcher.
+
+    python sitemap.py                                   # count the /university/ pages in the sitemaps
+    python sitemap.py --start-url http://127.0.0.1:8765/find-courses/ --print
+"""
+import os
+import csv
+import sys
+import argparse
+import threading
+import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+from urllib.parse import urljoin, urlsplit
+
+# ----------------------------------------------------------------
+# SITEMAP DISCOVERY
+# ----------------------------------------------------------------
+#
+# The sitemap locations come from the Sitemap: lines of /robots.txt, or
+# the usual WordPress / Yoast paths. Sitemap indexes are followed
+# breadth-first (only child sitemaps whose URL mentions "university" once
+# any of those exist, so the post/page sitemaps are not all downloaded), and
+# every <loc> under /university/ is kept.
+#
+# UniversityPrefetcher then downloads and parses those pages on a thread
+# pool while the browser works through the listings. When a card links to
+# a university, take() hands over the parsed row: the crawl skips both its
+# link test and its page fetch. Queued but not started pages are cancelled
+# and fetched the usual way; pages in flight are waited for.
+
+SITEMAP_PATHS = ('/sitemap_index.xml', '/sitemap.xml', '/wp-sitemap.xml')
+UNIVERSITY_PATH = '/university/'
+MAX_SITEMAPS = 500
+PREFETCH_WORKERS = 4
+PREFETCH_WAIT = 30
+
+csv.field_size_limit(min(sys.maxsize, 2**31 - 1))
+
+
+def _local(tag):
+    return tag.rsplit('}', 1)[-1]
+
+
+def parse_sitemap(text):
+    """(child sitemap URLs, page URLs) of a sitemap or sitemap index document."""
+    try:
+        root = ET.fromstring(text.encode('utf-8') if isinstance(text, str) else text)
+    except ET.ParseError:
+        return [], []
+    locs = [el.text.strip() for el in root.iter() if _local(el.tag) == 'loc' and el.text]
+    if _local(root.tag) == 'sitemapindex':
+        return locs, []
+    return [], locs
+
+
+def robots_sitemaps(text):
+    return [line.split(':', 1)[1].strip() for line in text.splitlines()
+            if line.lower().startswith('sitemap:')]
+
+
+def university_id(url):
+    """Identifier the crawl stores for a university URL (see university_id_from_href)."""
+    if UNIVERSITY_PATH in url:
+        return url.split(UNIVERSITY_PATH)[-1].strip()
+    return url.strip()
+
+
+def prefetch_key(url_or_id):
+    return university_id(url_or_id).strip('/')
+
+
+def discover_university_urls(start_url, get, log=print, max_sitemaps=MAX_SITEMAPS):
+    """All /university/<id> page URLs listed in the site's sitemaps, in sitemap order."""
+    site = '{0.scheme}://{0.netloc}'.format(urlsplit(start_url))
+    todo = []
+    try:
+        todo = robots_sitemaps(get(site + '/robots.txt'))
+    except Exception as e:
+        log(f"[SITEMAP] robots.txt => {e}")
+    todo = todo or [urljoin(site, p) for p in SITEMAP_PATHS]
+
+    seen, urls = set(), {}
+    fetched = 0
+    while todo and fetched < max_sitemaps:
+        sm = todo.pop(0)
+        if sm in seen:
+            continue
+        seen.add(sm)
+        try:
+            children, pages = parse_sitemap(get(sm))
+        except Exception as e:
+            log(f"[SITEMAP] {sm} => {e}")
+            continue
+        fetched += 1
+        wanted = [c for c in children if 'universit' in c.lower()]
+        todo.extend(wanted or children)
+        for u in pages:
+            if UNIVERSITY_PATH in urlsplit(u).path and prefetch_key(u):
+                urls.setdefault(prefetch_key(u), u)
+    log(f"[SITEMAP] {len(urls)} university pages in {fetched} sitemaps")
+    return list(urls.values())
+
+
+def known_university_ids(path):
+    """university_identifier column of universities.csv, as prefetch keys."""
+    if not os.path.exists(path):
+        return set()
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        rd = csv.reader(f)
+        next(rd, None)
+        return {prefetch_key(row[0]) for row in rd if row}
+
+
+# ----------------------------------------------------------------
+# PREFETCH
+# ----------------------------------------------------------------
+
+class UniversityPrefetcher:
+
+    def __init__(self, get, parse, workers=PREFETCH_WORKERS, wait=PREFETCH_WAIT):
+        self.get = get
+        self.parse = parse
+        self.wait = wait
+        self.pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='prefetch')
+        self.futures = {}
+        self.lock = threading.Lock()
+        self.stats = {'queued': 0, 'hit': 0, 'error': 0, 'cancelled': 0, 'timeout': 0, 'miss': 0}
+
+    def _fetch(self, url):
+        return self.parse(self.get(url), university_id(url), '')
+
+    def submit(self, urls):
+        with self.lock:
+            for u in urls:
+                k = prefetch_key(u)
+                if k not in self.futures:
+                    self.futures[k] = self.pool.submit(self._fetch, u)
+                    self.stats['queued'] += 1
+
+    def take(self, uid):
+        """Parsed row of a prefetched university (popped), or None to fetch it inline."""
+        with self.lock:
+            fut = self.futures.pop(prefetch_key(uid), None)
+        if fut is None:
+            self.stats['miss'] += 1
+            return None
+        if fut.cancel():
+            self.stats['cancelled'] += 1
+            return None
+        try:
+            data = fut.result(timeout=self.wait)
+        except FutureTimeout:
+            self.stats['timeout'] += 1
+            return None
+        except Exception:
+            self.stats['error'] += 1
+            return None
+        self.stats['hit'] += 1
+        return data
+
+    def pending(self):
+        with self.lock:
+            return sum(1 for f in self.futures.values() if not f.done())
+
+    def close(self):
+        self.pool.shutdown(wait=False, cancel_futures=True)
+        with self.lock:
+            self.futures = {}
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument('--start-url', default="https://india.studyin-uk.com/find-courses/")
+    ap.add_argument('--print', action='store_true', help="print every discovered URL")
+    args = ap.parse_args()
+    from refresh_universities import Fetcher
+    urls = discover_university_urls(args.start_url, Fetcher(rate_limit_sleep=10).get,
+                                    log=lambda m: print(m, file=sys.stderr))
+    if args.print:
+        print('\n'.join(urls))
+
+
+if __name__ == '__main__':
+    main()
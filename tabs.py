@@ -0,0 +1,106 @@
+import time
+
+# ----------------------------------------------------------------
+# MULTI-TAB LISTING CRAWL (helpers)
+# ----------------------------------------------------------------
+#
+# --tabs N opens N tabs in the one Chrome. Each tab walks the pages of its
+# own lane (year, category), keeping that filter state. A listing page
+# change is an AJAX call, so a tab only *starts* it (click, no wait) and the
+# crawl moves on to a tab whose page has arrived: it parses that page (card
+# reads, university fetches, CSV writes) and starts the tab's next page.
+# One tab's network wait overlaps the work on the others, with one
+# browser's memory instead of N.
+#
+# WebDriver talks to one tab at a time (switch_to.window), so readiness is
+# polled: a page has arrived when the document is complete, the preloader
+# is hidden and the first card of the previous page is gone from the DOM
+# (or, on a first load, when there are cards). Chrome throttles background
+# tabs unless started with BACKGROUND_TAB_FLAGS.
+
+BACKGROUND_TAB_FLAGS = ('--disable-background-timer-throttling', '--disable-backgrounding-occluded-windows',
+                        '--disable-renderer-backgrounding')
+POLL_INTERVAL = 0.05
+
+# run right before a tab starts its next page
+MARK_JS = "window.__siukOld = document.querySelector('.single-events-card'); return 1;"
+READY_JS = """
+var pre = document.querySelector('.siuk-prelaoder');
+var busy = pre && getComputedStyle(pre).display !== 'none' && getComputedStyle(pre).visibility !== 'hidden';
+if (document.readyState !== 'complete' || busy) { return false; }
+var old = window.__siukOld;
+return old ? !old.isConnected : !!document.querySelector('.single-events-card');
+"""
+
+
+class Tab:
+    """One browser tab and the lane it is walking."""
+
+    def __init__(self, handle):
+        self.handle = handle
+        self.year = None            # year selected in this tab
+        self.lane = None            # (year, category)
+        self.pages = None           # page strings of the lane still to parse; None until its max page is read
+        self.page = None            # lane page shown / loading; None = lane not opened in this tab
+        self.loading_since = None   # set while a page load is in flight
+        self.unchanged_run = 0
+        self.failures = 0
+        self.done = False           # no lanes left
+        self.parsed = 0
+
+    def reset(self, handle):
+        """Same lane, new window (after a browser restart): the lane is opened again."""
+        self.handle = handle
+        self.year = self.page = self.loading_since = None
+
+
+def open_tab_handles(driver, count, open_page):
+    """Handles of the current window plus count-1 new tabs showing the start page."""
+    handles = [driver.current_window_handle]
+    for _ in range(count - 1):
+        driver.switch_to.new_window('tab')
+        open_page(driver)
+        handles.append(driver.current_window_handle)
+    return handles
+
+
+def start_loading(driver, tab, page):
+    """Mark the cards the tab shows now; the caller then starts the navigation to `page`."""
+    driver.execute_script(MARK_JS)
+    tab.page = page
+    tab.loading_since = time.time()
+
+
+def next_ready(driver, tabs, max_wait, start=0):
+    """
+    Poll the loading tabs round-robin from index `start` until one has its
+    page (or waited max_wait); returns (tab, timed_out) with that tab
+    selected, or (None, False) when no tab is loading.
+    """
+    while True:
+        loading = False
+        now = time.time()
+        for i in range(len(tabs)):
+            tab = tabs[(start + i) % len(tabs)]
+            if tab.loading_since is None:
+                continue
+            loading = True
+            driver.switch_to.window(tab.handle)
+            if driver.execute_script(READY_JS):
+                tab.loading_since = None
+                return tab, False
+            if now - tab.loading_since >= max_wait:
+                tab.loading_since = None
+                return tab, True
+        if not loading:
+            return None, False
+        time.sleep(POLL_INTERVAL)
+
+
+def take_lane(lanes, year):
+    """Next lane from the deque, preferring the year the tab already shows (no year switch)."""
+    for i, lane in enumerate(lanes):
+        if lane[0] == year:
+            del lanes[i]
+            return lane
+    return lanes.popleft() if lanes else None
@@ -0,0 +1,68 @@
+import os
+import csv
+import sys
+import json
+import shutil
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from delta import write_run_delta
+
+KEY = ('course_id',)
+FIELDS = ['course_id', 'title']
+
+
+class RunDeltaTest(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.csv = os.path.join(self.dir, 'courses.csv')
+        self.snapshots = os.path.join(self.dir, 'snapshots')
+        self.deltas = os.path.join(self.dir, 'deltas')
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def write_csv(self, rows):
+        with open(self.csv, 'w', encoding='utf-8', newline='') as f:
+            w = csv.writer(f)
+            w.writerow(FIELDS)
+            w.writerows(rows)
+
+    def run_delta(self, seen, partial):
+        path, counts = write_run_delta([('courses', self.csv, KEY, lambda row: row['course_id'] in seen)],
+                                       self.snapshots, self.deltas, partial=partial)
+        with open(path, encoding='utf-8') as f:
+            ops = sorted((r['op'], r['key']['course_id']) for r in map(json.loads, f))
+        os.remove(path)  # delta files are named by the second
+        return ops, counts['courses']
+
+    def test_partial_run_does_not_bring_back_removed_rows(self):
+        self.write_csv([('1', 'A'), ('2', 'B'), ('3', 'C')])
+        ops, _ = self.run_delta({'1', '2', '3'}, partial=False)
+        self.assertEqual(ops, [('added', '1'), ('added', '2'), ('added', '3')])
+
+        # full run: course 3 is gone from the listings (its CSV row stays)
+        ops, _ = self.run_delta({'1', '2'}, partial=False)
+        self.assertEqual(ops, [('removed', '3')])
+
+        # partial run that saw course 1 (changed) and a new course 4
+        self.write_csv([('1', 'A'), ('2', 'B'), ('3', 'C'), ('1', 'A2'), ('4', 'D')])
+        ops, _ = self.run_delta({'1', '4'}, partial=True)
+        self.assertEqual(ops, [('added', '4'), ('changed', '1')])
+
+        # the next partial run sees nothing new: no delta at all
+        ops, counts = self.run_delta(set(), partial=True)
+        self.assertEqual(ops, [])
+        self.assertEqual(counts, {'added': 0, 'removed': 0, 'changed': 0})
+
+    def test_partial_run_without_previous_snapshot(self):
+        self.write_csv([('1', 'A'), ('2', 'B')])
+        ops, _ = self.run_delta({'2'}, partial=True)
+        self.assertEqual(ops, [('added', '2')])
+
+
+if __name__ == '__main__':
+    unittest.main()
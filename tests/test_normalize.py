@@ -0,0 +1,45 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from normalize import parse_fee, parse_int, parse_year
+
+
+class ParseFeeTest(unittest.TestCase):
+
+    def test_ranges_and_units(self):
+        self.assertEqual(parse_fee('£15,000 - £25,000 per year'), (15000.0, 25000.0, 'GBP'))
+        self.assertEqual(parse_fee('£15,000 - 25,000'), (15000.0, 25000.0, 'GBP'))
+        self.assertEqual(parse_fee('£15k to 20k'), (15000.0, 20000.0, 'GBP'))
+        self.assertEqual(parse_fee('INR 4.5 lakhs - 6 lakhs'), (450000.0, 600000.0, 'INR'))
+        self.assertEqual(parse_fee('14,500 GBP per year'), (14500.0, 14500.0, 'GBP'))
+
+    def test_durations_and_years_are_not_amounts(self):
+        self.assertEqual(parse_fee('£20,000 per year for 2 years'), (20000.0, 20000.0, 'GBP'))
+        self.assertEqual(parse_fee('GBP 14,500 (Year 1)'), (14500.0, 14500.0, 'GBP'))
+        self.assertEqual(parse_fee('£ 1,200 per month 12 months'), (1200.0, 1200.0, 'GBP'))
+        self.assertEqual(parse_fee('£9,250 (2025/26)'), (9250.0, 9250.0, 'GBP'))
+        self.assertEqual(parse_fee('$30,000 (2025-2026) 3 years'), (30000.0, 30000.0, 'USD'))
+
+    def test_no_amount(self):
+        self.assertEqual(parse_fee(''), (None, None, ''))
+        self.assertEqual(parse_fee('2 years'), (None, None, ''))
+
+
+class ParseNumberTest(unittest.TestCase):
+
+    def test_parse_int(self):
+        self.assertEqual(parse_int('#12'), 12)
+        self.assertEqual(parse_int('1,001-1,200'), 1001)
+        self.assertIsNone(parse_int(''))
+
+    def test_parse_year(self):
+        self.assertEqual(parse_year('Established 1826'), 1826)
+        self.assertEqual(parse_year('Established 1,826'), 1826)
+        self.assertIsNone(parse_year('n/a'))
+
+
+if __name__ == '__main__':
+    unittest.main()
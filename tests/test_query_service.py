@@ -0,0 +1,74 @@
+import os
+import csv
+import sys
+import shutil
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from query_service import QueryService
+
+FIELDS = ['course_id', 'title', 'university_name', 'category', 'course_year', 'course_meta', 'university_rank']
+
+
+class QueryServiceTest(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.csv = os.path.join(self.dir, 'courses.csv')
+        self.write_rows([('1', 'Law LLB', 'Uni A', 'Undergraduate', '2026', 'x\x1cy\x85z', '5'),
+                         ('2', 'Physics', 'Uni B', 'Postgraduate', '2026', '', '12')], header=True)
+        self.service = QueryService(self.csv, os.path.join(self.dir, 'universities.csv'),
+                                    os.path.join(self.dir, 'logos.csv'))
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def write_rows(self, rows, header=False):
+        with open(self.csv, 'a', encoding='utf-8', newline='') as f:
+            w = csv.writer(f)
+            if header:
+                w.writerow(FIELDS)
+            w.writerows(rows)
+
+    def test_unicode_line_separators_stay_in_the_field(self):
+        status, body = self.service.handle('/courses', {'category': ['Undergraduate']})
+        self.assertEqual(status, 200)
+        self.assertEqual(body['total'], 1)
+        self.assertEqual(body['results'][0]['title'], 'Law LLB')
+        self.assertEqual(body['results'][0]['course_meta'], 'x\x1cy\x85z')
+
+        self.write_rows([('3', 'Maths ', 'Uni B', 'Postgraduate', '2026', '', '12')])
+        self.assertEqual(self.service.courses.reload(), 1)
+        self.assertEqual(self.service.handle('/courses', {})[1]['total'], 3)
+
+    def test_limit(self):
+        status, body = self.service.handle('/courses', {'limit': ['0']})
+        self.assertEqual(status, 200)
+        self.assertEqual((body['total'], body['limit'], body['results']), (2, 0, []))
+        self.assertEqual(len(self.service.handle('/courses', {'limit': ['1']})[1]['results']), 1)
+        self.assertEqual(self.service.handle('/courses', {})[1]['limit'], 50)
+        self.assertEqual(self.service.handle('/courses', {'limit': ['-1']})[0], 400)
+
+    def test_universities_get_the_mirrored_logo_path(self):
+        unis = os.path.join(self.dir, 'universities.csv')
+        with open(unis, 'w', encoding='utf-8', newline='') as f:
+            w = csv.writer(f)
+            w.writerow(['university_identifier', 'university_name', 'university_logo', 'rank'])
+            w.writerow(['a', 'Uni A', 'https://x/a.png', '5'])
+            w.writerow(['b', 'Uni B', 'https://x/b.png', '12'])
+        self.service.reload()
+        logo_path = lambda: [r['logo_path'] for r in self.service.handle('/universities', {})[1]['results']]
+        self.assertEqual(logo_path(), ['', ''])
+
+        with open(os.path.join(self.dir, 'logos.csv'), 'w', encoding='utf-8', newline='') as f:
+            w = csv.writer(f)
+            w.writerow(['url', 'local_path'])
+            w.writerow(['https://x/b.png', 'logos/ab/cd/abcd.png'])
+        self.service.reload()
+        self.assertEqual(logo_path(), ['', 'logos/ab/cd/abcd.png'])
+
+
+if __name__ == '__main__':
+    unittest.main()
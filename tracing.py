@@ -0,0 +1,135 @@
+import os
+import json
+import time
+import random
+import threading
+from contextlib import contextmanager
+
+# ----------------------------------------------------------------
+# PER-PAGE SPAN TRACES (Chrome trace format)
+# ----------------------------------------------------------------
+#
+# page_trace() opens one trace per listing page; span() / metrics.timed()
+# add child spans (navigation attempt, card, link test, university fetch,
+# CSV write, 429 sleeps). When the page finishes the whole tree is either
+# dropped or appended to the trace file:
+#   - kept with probability `sample_rate`, and
+#   - always kept if any child span took longer than `keep_over_s`.
+#
+# The file is a Chrome "JSON Array Format" trace that is only ever appended
+# to (no closing bracket needed), so it opens directly in chrome://tracing
+# or https://ui.perfetto.dev even while the crawl is running.
+
+_conf = {'path': '', 'sample_rate': 0.0, 'keep_over_s': 0.0}
+_stats = {'traces': 0, 'kept_sampled': 0, 'kept_slow': 0}
+_local = threading.local()
+_write_lock = threading.Lock()
+
+
+def configure(path, sample_rate=0.05, keep_over_s=20.0):
+    """Turn tracing on (an empty path turns it off)."""
+    _conf.update(path=path, sample_rate=sample_rate, keep_over_s=keep_over_s)
+    if path and not os.path.exists(path):
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write("[\n")
+
+
+def _now_us():
+    return time.time_ns() // 1000
+
+
+def _state():
+    return getattr(_local, 'trace', None)
+
+
+def begin_span(name, args=None):
+    """Open a child span of the active trace; returns None when no trace is active."""
+    st = _state()
+    if st is None:
+        return None
+    span = {'name': name, 'ts': _now_us(), 'args': dict(args or {})}
+    st['stack'].append(span)
+    return span
+
+
+def end_span(span, error=None):
+    if span is None:
+        return
+    st = _state()
+    span['dur'] = _now_us() - span['ts']
+    if error is not None:
+        span['args']['error'] = repr(error)[:200]
+    if st is not None:
+        if st['stack'] and st['stack'][-1] is span:
+            st['stack'].pop()
+        st['spans'].append(span)
+
+
+@contextmanager
+def span(name, **args):
+    sp = begin_span(name, args)
+    try:
+        yield sp
+    except BaseException as e:
+        end_span(sp, error=e)
+        raise
+    else:
+        end_span(sp)
+
+
+def annotate(**args):
+    """Attach args (e.g. outcome=...) to the innermost open span."""
+    st = _state()
+    if st is not None and st['stack']:
+        st['stack'][-1]['args'].update({k: str(v) for k, v in args.items()})
+
+
+@contextmanager
+def page_trace(name, **args):
+    """Root span of one listing page; nested calls just open a child span."""
+    if not _conf['path'] or _state() is not None:
+        with span(name, **args) as sp:
+            yield sp
+        return
+
+    _stats['traces'] += 1
+    _local.trace = {'stack': [], 'spans': [], 'tid': _stats['traces']}
+    root = begin_span(name, args)
+    _local.trace['root'] = root
+    try:
+        yield root
+    except BaseException as e:
+        end_span(root, error=e)
+        raise
+    else:
+        end_span(root)
+    finally:
+        st = _local.trace
+        _local.trace = None
+        _finish(st)
+
+
+def _finish(st):
+    # the root span always spans the whole page, so only child spans count as "slow"
+    children = [s for s in st['spans'] if s is not st['root']]
+    slow = max((s.get('dur', 0) for s in children), default=0) >= _conf['keep_over_s'] * 1e6
+    if slow:
+        _stats['kept_slow'] += 1
+    elif random.random() < _conf['sample_rate']:
+        _stats['kept_sampled'] += 1
+    else:
+        return
+    lines = []
+    for s in st['spans']:
+        lines.append(json.dumps({
+            'name': s['name'], 'cat': 'crawl', 'ph': 'X',
+            'ts': s['ts'], 'dur': s.get('dur', 0),
+            'pid': 1, 'tid': st['tid'], 'args': s['args'],
+        }, separators=(',', ':')) + ",\n")
+    with _write_lock:
+        with open(_conf['path'], 'a', encoding='utf-8') as f:
+            f.writelines(lines)
+
+
+def stats():
+    return dict(_stats)
@@ -0,0 +1,574 @@
+import re
+import copy
+import time
+import threading
+
+try:
+    from bs4 import BeautifulSoup, Tag
+    from bs4.element import CData, Comment, ProcessingInstruction
+except ImportError:
+    BeautifulSoup = Tag = CData = Comment = ProcessingInstruction = None
+try:
+    import lxml.html as lxml_html
+    from lxml import etree
+except ImportError:
+    lxml_html = etree = None
+
+from metrics import timed
+
+# ----------------------------------------------------------------
+# UNIVERSITY PAGE PARSING (no Selenium)
+# ----------------------------------------------------------------
+#
+# Everything needed to turn a downloaded university page into its
+# universities.csv row, plus the shared log(). Used by the browser crawl
+# (main.py / main2.py) and by refresh_universities.py, which must run
+# without Selenium or Chrome installed, so nothing here may import them.
+#
+# The HTML parser is a backend (PARSER_BACKENDS, picked with set_parser()):
+#   html.parser  BeautifulSoup + the stdlib parser (the original, default)
+#   bs4-lxml     the same BeautifulSoup code on lxml's tree builder
+#   lxml         lxml.html + XPath, sections sanitized in the tree and
+#                written out the way BeautifulSoup prints them
+# All three give the same row: the lxml backends parse a copy of the page
+# with its tags renamed, so libxml2 nests them as html.parser does (see
+# html_parser_nesting()).
+# benchmarks/parser_diff.py compares them on saved pages and
+# benchmarks/bench_parsers.py measures them.
+
+LOG_FILE = 'scraper.log'
+
+SECTION_IDS = ('overview', 'services', 'rankings', 'fees', 'scholarships', 'accommodation', 'faqs')
+DEFAULT_PARSER = 'html.parser'
+
+
+def log(msg):
+    stamp = time.strftime("%Y-%m-%d %H:%M:%S")
+    line = f"[{stamp}] {msg}"
+    print(line)
+    with open(LOG_FILE, 'a', encoding='utf-8') as f:
+        f.write(line + "\n")
+
+
+def rank_fields(data, texts):
+    """Fill rank / established / famous_for / fees from the .uni_rank texts."""
+    data['rank'] = ''
+    data['established'] = ''
+    data['famous_for'] = ''
+    data['fees'] = ''
+    for txt in texts:
+        if txt.startswith("Rank "):
+            data['rank'] = txt.replace("Rank ", "").strip()
+        elif txt.startswith("Established "):
+            data['established'] = txt.replace("Established ", "").strip()
+        elif txt.startswith("Famous for "):
+            data['famous_for'] = txt.replace("Famous for ", "").strip()
+        elif txt.startswith("Fees "):
+            data['fees'] = txt.replace("Fees ", "").strip()
+
+
+def is_enquiry_link(text, href):
+    txt_lower = text.lower()
+    return 'enquire' in txt_lower or 'enquiry' in txt_lower or 'enquire' in href.lower()
+
+
+# ----------------------------------------------------------------
+# BEAUTIFULSOUP BACKENDS
+# ----------------------------------------------------------------
+
+def sanitize_soup(soup):
+    """
+    Removes or unwraps <a> tags:
+      - If anchor text or href contains 'enquire'/'enquiry', remove entire anchor
+      - Otherwise unwrap the anchor (keep text)
+    Also remove <div class="uni_course_enquire_now"> blocks, headed
+    .et_pb_text_inner blocks and all <img> tags.
+    """
+    for div in soup.select('.uni_course_enquire_now'):
+        div.decompose()
+    for div in soup.select('.et_pb_text_inner'):
+        if div.contents:
+            first_child = div.contents[0]
+            if isinstance(first_child, Tag) and first_child.name == 'h3':
+                div.decompose()
+    for img_tag in soup.find_all('img'):
+        img_tag.decompose()
+    anchors = soup.find_all('a')
+    for a_tag in anchors:
+        if is_enquiry_link(a_tag.get_text(strip=True), a_tag.get('href', '')):
+            a_tag.decompose()
+        else:
+            a_tag.unwrap()
+
+
+class SoupBackend:
+    """BeautifulSoup with the given tree builder ('html.parser' or 'lxml')."""
+
+    def __init__(self, features):
+        self.features = features
+        self.needs = 'beautifulsoup4' + (' and lxml' if features == 'lxml' else '')
+
+    def available(self):
+        return BeautifulSoup is not None and (self.features != 'lxml' or lxml_html is not None)
+
+    def sanitize(self, html_content):
+        if not html_content.strip():
+            return html_content
+        if self.features == 'html.parser':
+            soup = BeautifulSoup(html_content, 'html.parser')
+            sanitize_soup(soup)
+            return str(soup)
+        # lxml puts a fragment into <html><body>; a wrapper div keeps leading
+        # <style>/<meta> out of <head>, and the body's content is the result
+        soup = self.soup(html_content, wrap=True)
+        sanitize_soup(soup)
+        soup.body.div.unwrap()
+        return soup.body.decode_contents()
+
+    def soup(self, html, wrap=False):
+        if self.features == 'html.parser':
+            return BeautifulSoup(html, 'html.parser')
+        markup = html_parser_nesting(html)
+        # the wrapper goes around the renamed markup so that no end tag in it can close the div;
+        # bs4 picks the attributes it splits and the tags it keeps whitespace in by the x- names
+        soup = BeautifulSoup(f'<div>{markup}</div>' if wrap else markup, self.features,
+                             multi_valued_attributes=NESTING_LIST_ATTRS,
+                             preserve_whitespace_tags={NESTING_PREFIX + 'pre', NESTING_PREFIX + 'textarea'})
+        splits, comments = [], []
+        for node in soup.descendants:
+            if isinstance(node, Tag):
+                if node.name.startswith(NESTING_PREFIX):
+                    node.name = node.name[len(NESTING_PREFIX):]
+            elif isinstance(node, ProcessingInstruction):
+                splits.append(node)
+            elif isinstance(node, Comment) and node.startswith(NESTING_PREFIX):
+                comments.append(node)
+        for node in splits:
+            node.extract()
+        for node in comments:
+            marker, content = comment_parts(node)
+            if not content.strip(ASCII_SPACES) and not any(p.name in ('pre', 'textarea') for p in node.parents):
+                content = _blank(content)
+            node.replace_with({NESTING_CDATA: CData, NESTING_PI: ProcessingInstruction}.get(marker, Comment)(content))
+        return soup
+
+    def section_html(self, soup, section_id):
+        """Sanitized inner HTML of <div id="section_id">, without the div itself."""
+        section_div = soup.find('div', id=section_id)
+        if not section_div:
+            return ''
+        raw_inner = ''.join(str(child) for child in section_div.contents)
+        return self.sanitize(raw_inner)
+
+    def parse(self, html, university_id, university_name):
+        with timed('univ_parse'):
+            soup = self.soup(html)
+        data = {}
+        data['university_identifier'] = university_id.strip()
+        data['university_name'] = university_name.strip()
+
+        logo_el = soup.select_one('.uni_logo img.single-event-image')
+        data['university_logo'] = logo_el['src'] if logo_el and logo_el.has_attr('src') else ''
+
+        # If name was empty, fallback from page
+        if not data['university_name']:
+            name_el = soup.select_one('.s_event_section.uni_section_wrapper h1')
+            if name_el:
+                data['university_name'] = name_el.get_text(strip=True)
+
+        rank_fields(data, (rdv.get_text(" ", strip=True) for rdv in soup.select('.head_desc .uni_rank')))
+
+        loc_el = soup.select_one('.uni_website a[href*="google.com/local"] span')
+        data['location'] = loc_el.get_text(strip=True) if loc_el else ''
+
+        web_el = soup.select_one('.uni_website.s_uni_web a')
+        data['website_url'] = web_el['href'] if (web_el and web_el.has_attr('href')) else ''
+
+        # sections => "inner" HTML of each div id, not the parent column
+        with timed('univ_sanitize'):
+            for section in SECTION_IDS:
+                data[f'{section}_html'] = self.section_html(soup, section)
+        return data
+
+
+# ----------------------------------------------------------------
+# RAW LXML BACKEND
+# ----------------------------------------------------------------
+#
+# The CSS selectors above as XPath, and bs4's "minimal" output format:
+# all-whitespace strings collapsed to one newline / space (outside <pre>),
+# & < > escaped in text and attribute values (not inside script/style),
+# attributes sorted by name, double quotes unless the value has one, void
+# tags as <br/>, and the whitespace-separated attributes (class, rel, ...)
+# re-joined with single spaces. libxml2 fills in a bare boolean attribute
+# (<input checked>) with its name; it is written as checked="" like bs4
+# does, so an explicit checked="checked" comes out that way too. Sections are sanitized on a copy of their div, without the
+# serialize + re-parse round trip of the BeautifulSoup backends, unless
+# section_source() finds strings at the top of the section that the round
+# trip would change.
+
+def _cls(name):
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+X_LOGO = f"//*[{_cls('uni_logo')}]//img[{_cls('single-event-image')}]"
+X_NAME = f"//*[{_cls('s_event_section')} and {_cls('uni_section_wrapper')}]//h1"
+X_RANKS = f"//*[{_cls('head_desc')}]//*[{_cls('uni_rank')}]"
+X_LOCATION = f"//*[{_cls('uni_website')}]//a[contains(@href, 'google.com/local')]//span"
+X_WEBSITE = f"//*[{_cls('uni_website')} and {_cls('s_uni_web')}]//a"
+X_SECTION = "//div[@id=$section_id]"
+X_ENQUIRE_BLOCKS = f".//*[{_cls('uni_course_enquire_now')}]"
+X_TEXT_INNER = f".//*[{_cls('et_pb_text_inner')}]"
+# get_text() leaves out comments and script / style content, but not CDATA sections
+X_TEXT = ".//text()[not(ancestor::script) and not(ancestor::style)] | .//comment()[starts-with(., 'x-cdata:')]"
+
+VOID_TAGS = frozenset(('area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'keygen', 'link', 'menuitem',
+                       'meta', 'param', 'source', 'track', 'wbr', 'basefont', 'bgsound', 'command', 'frame',
+                       'image', 'isindex', 'nextid', 'spacer'))
+RAW_TEXT_TAGS = frozenset(('script', 'style'))
+BOOLEAN_ATTRS = frozenset(('checked', 'compact', 'declare', 'defer', 'disabled', 'ismap', 'multiple', 'nohref',
+                           'noresize', 'noshade', 'nowrap', 'readonly', 'selected'))
+ASCII_SPACES = ' \n\t\x0c\r'
+LIST_ATTRS = {'*': {'class', 'accesskey', 'dropzone'}, 'a': {'rel', 'rev'}, 'link': {'rel', 'rev'},
+              'td': {'headers'}, 'th': {'headers'}, 'form': {'accept-charset'}, 'object': {'archive'},
+              'area': {'rel'}, 'icon': {'sizes'}, 'iframe': {'sandbox'}, 'output': {'for'}}
+
+# html.parser never implies an end tag: an unclosed <p> (WordPress leaves
+# plenty) holds everything up to its parent's end tag, the next <p> too.
+# libxml2 closes it at the next <p> or <div>, turns a stray </p> into an
+# empty <p>, closes <li> / <td> / <option> at the next one, and so on, all
+# from its table of known elements. So both lxml backends parse the page
+# with every tag except the void ones, script / style and html / head /
+# body renamed x-<name>: libxml2 has no rules for those and just pops its
+# stack to the matching end tag, as html.parser does. The names are put
+# back after parsing (an x-foo of the page went in as x-x-foo).
+# An end tag with nothing open to close is dropped by both parsers, but
+# BeautifulSoup still ends the current string there, and an all-whitespace
+# half is collapsed on its own. Such end tags are replaced by a <?x-split>
+# processing instruction, which splits the text the same way;
+# join_split_text() removes them again.
+# html.parser keeps <![CDATA[...]]> and <?...> as nodes of their own and
+# reads <!foo> as the comment 'foo'. libxml2 drops all three, and a page's
+# <?...> would look like a split marker. So they go in as comments: CDATA
+# and PIs with an x-cdata: / x-pi: marker, and a comment of the page that
+# starts with x- gets another x-. comment_parts() splits the marker off again.
+# Not handled (tests/test_parser_backends.py pins what the lxml backends do):
+#   - The lxml backend drops a DOCTYPE inside a section. html.parser keeps
+#     it, and bs4 prints a newline after it on every parse.
+#   - &#0; and NUL characters are dropped. html.parser writes NULs into the
+#     row, and an lxml tree cannot hold them.
+#   - Unterminated and abrupt comments (<!-- with no -->, <!-->) hide the
+#     rest of the page from libxml2. What html.parser does with them, and
+#     with a '&name' or '<tag' cut off at the end of its input, has changed
+#     between Python patch releases.
+#   - html.parser parses every section a second time (section_source()).
+#     Escaped text at the top of a section becomes markup in that parse, and
+#     can run into the next string as a tag name with '<' in it (&lt;<!--x-->).
+#     libxml2 ends such a name at the '<'.
+NESTING_PREFIX = 'x-'
+NESTING_SPLIT = '<?x-split>'
+NESTING_CDATA = NESTING_PREFIX + 'cdata:'
+NESTING_PI = NESTING_PREFIX + 'pi:'
+NESTING_KEEP = VOID_TAGS | RAW_TEXT_TAGS | {'html', 'head', 'body'}
+NESTING_LIST_ATTRS = {tag if tag in NESTING_KEEP or tag == '*' else NESTING_PREFIX + tag: names
+                      for tag, names in LIST_ATTRS.items()}
+# comments and script / style bodies are matched whole so the tags inside
+# them are left alone, and so are quoted attribute values (title="<b>");
+# then CDATA sections, bogus comments and PIs as html.parser ends them
+RE_TAG = re.compile(r'<!--(.*?)-->|<(script|style)\b.*?</\2\s*>'
+                    r'|<(/?)([a-zA-Z][^\t\n\r\f />\x00]*)((?:=\s*(?:"[^"]*"|\'[^\']*\')|=(?!\s*["\'])|[^>=])*>)'
+                    r'|<!\[CDATA\[(.*?)\]\s*\]\s*>|<!(?!--|\[|doctype)([^>]*)>|<\?([^>]*)>',
+                    re.S | re.I)
+
+
+def html_parser_nesting(html):
+    """`html` with its tags renamed so that libxml2 nests them like html.parser (see above)."""
+    open_tags = []  # html.parser's stack of the renamed tags
+
+    def rename(m):
+        name = m.group(4)
+        if name is None:
+            return nesting_comment(m)
+        if name.lower() in NESTING_KEEP:
+            return m.group(0)
+        key = name.lower()
+        if m.group(3):
+            if key not in open_tags:
+                return NESTING_SPLIT
+            del open_tags[len(open_tags) - 1 - open_tags[::-1].index(key):]
+        elif not m.group(5).endswith('/>'):
+            open_tags.append(key)
+        return f'<{m.group(3)}{NESTING_PREFIX}{name}{m.group(5)}'
+
+    return RE_TAG.sub(rename, html)
+
+
+def nesting_comment(m):
+    """A comment, CDATA section, bogus comment or PI matched by RE_TAG as the comment libxml2 gets."""
+    comment, cdata, bogus, pi = m.group(1, 6, 7, 8)
+    if cdata is not None:
+        text = NESTING_CDATA + cdata.replace('%', '%25').replace('>', '%3E')  # a '-->' would end the comment
+    elif pi is not None:
+        text = NESTING_PI + pi
+    elif comment is not None or bogus is not None:
+        text = comment if comment is not None else bogus
+        if text.startswith(NESTING_PREFIX):
+            text = NESTING_PREFIX + text
+    else:
+        return m.group(0)  # script / style
+    return f'<!--{text}-->'
+
+
+def comment_parts(text):
+    """(marker, content) of a comment made by nesting_comment(); the marker is '' for other comments."""
+    if text.startswith(NESTING_CDATA):
+        return NESTING_CDATA, text[len(NESTING_CDATA):].replace('%3E', '>').replace('%25', '%')
+    for marker in (NESTING_PI, NESTING_PREFIX):
+        if text.startswith(marker):
+            return marker, text[len(marker):]
+    return '', text
+
+
+def drop_nesting_prefix(root):
+    n = len(NESTING_PREFIX)
+    for el in root.iter():
+        if isinstance(el.tag, str) and el.tag.startswith(NESTING_PREFIX):
+            el.tag = el.tag[n:]
+
+
+def join_split_text(root):
+    """Remove the NESTING_SPLIT markers below `root`, joining the text around them."""
+    etree.strip_tags(root, etree.ProcessingInstruction)
+
+
+def _blank(s):
+    return '\n' if '\n' in s else ' '
+
+
+def collapse_blank_text(root):
+    """Every all-whitespace string (comments too) => '\n' or ' ', as BeautifulSoup stores them."""
+    keep = set()
+    for el in root.xpath('.//pre | .//textarea'):
+        keep.update(el.iter())
+    for el in root.iter():
+        if isinstance(el.tag, str):
+            if el.text and not el.text.strip(ASCII_SPACES) and el not in keep:
+                el.text = _blank(el.text)
+        elif el.tag is etree.Comment and el.getparent() not in keep:
+            marker, content = comment_parts(el.text or '')
+            if not content.strip(ASCII_SPACES):
+                el.text = marker + _blank(content)
+        if el is not root and el.tail and not el.tail.strip(ASCII_SPACES) and el.getparent() not in keep:
+            el.tail = _blank(el.tail)
+
+
+def _escape(s):
+    return s.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
+
+
+def _attribute(tag, name, value):
+    if name in LIST_ATTRS['*'] or name in LIST_ATTRS.get(tag, ()):
+        value = ' '.join(value.split())
+    elif value == name and name in BOOLEAN_ATTRS:
+        value = ''
+    value = _escape(value)
+    if '"' not in value:
+        return f' {name}="{value}"'
+    if "'" not in value:
+        return f" {name}='{value}'"
+    return ' {}="{}"'.format(name, value.replace('"', '&quot;'))
+
+
+def _markup(el, out, tail=True):
+    tag = el.tag
+    if isinstance(tag, str):
+        out.append('<' + tag)
+        for name, value in sorted(el.attrib.items()):
+            out.append(_attribute(tag, name, value))
+        if tag in VOID_TAGS and not el.text and not len(el):
+            out.append('/>')
+        else:
+            out.append('>')
+            if el.text:
+                out.append(el.text if tag in RAW_TEXT_TAGS else _escape(el.text))
+            for child in el:
+                _markup(child, out)
+            out.append(f'</{tag}>')
+    elif tag is etree.Comment:
+        marker, content = comment_parts(el.text or '')
+        if marker == NESTING_CDATA:
+            out.append(f'<![CDATA[{content}]]>')
+        elif marker == NESTING_PI:
+            out.append(f'<?{content}>')
+        else:
+            out.append(f'<!--{content}-->')
+    if el.tail and tail:
+        out.append(_escape(el.tail))
+
+
+def inner_markup(el):
+    """Content of `el` (not the element itself) as BeautifulSoup prints it."""
+    out = [_escape(el.text)] if el.text else []
+    for child in el:
+        _markup(child, out)
+    return ''.join(out)
+
+
+def section_source(el):
+    """
+    What SoupBackend.section_html() hands to sanitize() for the section `el`:
+    str() of each child, which gives the strings at the top (text, comments,
+    CDATA, PIs) bare and unescaped, so the second parse reads them as markup.
+    None when that gives the same as the tree itself.
+    """
+    strings = [el.text or ''] + [child.tail or '' for child in el]
+    if all(isinstance(child.tag, str) for child in el) and not any('<' in t or '&' in t for t in strings):
+        return None
+    out = [el.text or '']
+    for child in el:
+        if isinstance(child.tag, str):
+            _markup(child, out, tail=False)
+        else:
+            out.append(comment_parts(child.text or '')[1])
+        out.append(child.tail or '')
+    return ''.join(out)
+
+
+def text_of(el, sep=''):
+    """bs4 get_text(sep, strip=True)."""
+    texts = (t if isinstance(t, str) else comment_parts(t.text)[1] for t in el.xpath(X_TEXT))
+    return sep.join(s for s in (t.strip() for t in texts) if s)
+
+
+def sanitize_tree(root):
+    """sanitize_soup() on an lxml element, in place (root itself is kept)."""
+    for el in root.xpath(X_ENQUIRE_BLOCKS):
+        el.drop_tree()
+    for el in root.xpath(X_TEXT_INNER):
+        if not el.text and len(el) and el[0].tag == 'h3':
+            el.drop_tree()
+    for el in root.xpath('.//img'):
+        el.drop_tree()
+    for a in root.xpath('.//a'):
+        if is_enquiry_link(text_of(a), a.get('href', '')):
+            a.drop_tree()
+        else:
+            a.drop_tag()
+
+
+class LxmlBackend:
+    """lxml.html + XPath; one HTMLParser per thread (the prefetcher parses in a pool)."""
+
+    needs = 'lxml'
+
+    def __init__(self):
+        self.local = threading.local()
+
+    def available(self):
+        return lxml_html is not None
+
+    def _document(self, markup):
+        """The document of `markup`, already renamed by html_parser_nesting(), with the names put back."""
+        parser = getattr(self.local, 'parser', None)
+        if parser is None:
+            parser = self.local.parser = lxml_html.HTMLParser(encoding='utf-8')
+        doc = lxml_html.document_fromstring(markup.encode('utf-8'), parser=parser)
+        drop_nesting_prefix(doc)
+        return doc
+
+    def sanitize(self, html_content):
+        if not html_content.strip():
+            return html_content
+        # wrapper div as in SoupBackend, added after the renaming so that no end tag of the fragment closes it
+        body = self._document(f'<html><body><div>{html_parser_nesting(html_content)}</div></body></html>').body
+        collapse_blank_text(body)
+        join_split_text(body)
+        sanitize_tree(body)
+        body[0].drop_tag()
+        return inner_markup(body)
+
+    def parse(self, html, university_id, university_name):
+        with timed('univ_parse'):
+            doc = self._document(html_parser_nesting(html)) if html.strip() else None
+        data = {}
+        data['university_identifier'] = university_id.strip()
+        data['university_name'] = university_name.strip()
+
+        def first(xpath):
+            hits = doc.xpath(xpath) if doc is not None else ()
+            return hits[0] if hits else None
+
+        logo_el = first(X_LOGO)
+        data['university_logo'] = logo_el.get('src', '') if logo_el is not None else ''
+
+        # If name was empty, fallback from page
+        if not data['university_name']:
+            name_el = first(X_NAME)
+            if name_el is not None:
+                data['university_name'] = text_of(name_el)
+
+        rank_fields(data, (text_of(rdv, ' ') for rdv in (doc.xpath(X_RANKS) if doc is not None else ())))
+
+        loc_el = first(X_LOCATION)
+        data['location'] = text_of(loc_el) if loc_el is not None else ''
+
+        web_el = first(X_WEBSITE)
+        data['website_url'] = web_el.get('href', '') if web_el is not None else ''
+
+        with timed('univ_sanitize'):
+            for section in SECTION_IDS:
+                hits = doc.xpath(X_SECTION, section_id=section) if doc is not None else ()
+                if not hits:
+                    data[f'{section}_html'] = ''
+                    continue
+                # a copy: sections may nest, and each one is cut from the page as it was
+                section_div = copy.deepcopy(hits[0])
+                # inside an unclosed <pre> of an earlier section bs4 keeps the strings as they are
+                if not hits[0].xpath('boolean(ancestor::pre | ancestor::textarea)'):
+                    collapse_blank_text(section_div)
+                join_split_text(section_div)
+                source = section_source(section_div)
+                if source is not None:
+                    data[f'{section}_html'] = self.sanitize(source)
+                    continue
+                if len(section_div) or (section_div.text or '').strip():
+                    # SoupBackend writes the section out and parses it again, which collapses the joined text too
+                    collapse_blank_text(section_div)
+                    sanitize_tree(section_div)
+                data[f'{section}_html'] = inner_markup(section_div)
+        return data
+
+
+# ----------------------------------------------------------------
+# BACKEND SELECTION
+# ----------------------------------------------------------------
+
+PARSER_BACKENDS = {
+    'html.parser': SoupBackend('html.parser'),
+    'bs4-lxml': SoupBackend('lxml'),
+    'lxml': LxmlBackend(),
+}
+_backend = PARSER_BACKENDS[DEFAULT_PARSER]
+
+
+def have_parser(name):
+    return PARSER_BACKENDS[name].available()
+
+
+def set_parser(name):
+    """Use backend `name` for parse_university_page() / sanitize_html() from now on."""
+    global _backend
+    backend = PARSER_BACKENDS[name]
+    if not backend.available():
+        raise ValueError(f"parser {name!r} needs {backend.needs}")
+    _backend = backend
+
+
+def sanitize_html(html_content):
+    """Sanitize a section's HTML fragment (see sanitize_soup) with the selected backend."""
+    return _backend.sanitize(html_content)
+
+
+def parse_university_page(html, university_id, university_name):
+    """Parse a downloaded university page into the universities.csv row."""
+    return _backend.parse(html, university_id, university_name)